@@ -1297,6 +1297,7 @@ GITHUB_CONNECTION_ARN=
             "history_handler.py",
             "performance_handler.py",
             "prepare_reddit_populator.py",
+            "prepare_orjson_layer.py",
             "reddit_realtime_scraper.py",
         ]
 
@@ -207,8 +207,13 @@ class ResourceTracker:
     def save_manifest(self):
         """Save the resource manifest to file"""
         try:
-            with open(self.manifest_file, "w", encoding="utf-8") as f:
-                json.dump(self.resources, f, indent=2, ensure_ascii=False)
+            # Serialize once and hand the whole document to a single write
+            # instead of json.dump's many small chunk writes
+            manifest = json.dumps(self.resources, indent=2, ensure_ascii=False)
+            with open(
+                self.manifest_file, "w", encoding="utf-8", buffering=1 << 20
+            ) as f:
+                f.write(manifest)
             return True
         except Exception as e:
             print(f"Error saving resource manifest: {e}")
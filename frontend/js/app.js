@@ -969,7 +969,10 @@ class ImageProcessor {
       this.components.uploadQueue.updateItemStatus(item.id, "processing", 100);
 
       // Process the image
-      const processingResult = await this.processImage(s3Key);
+      const processingResult = await this.processImage(
+        s3Key,
+        uploadResult.ETag
+      );
 
       // Update item with results
       item.s3Key = s3Key;
@@ -996,7 +999,7 @@ class ImageProcessor {
     }
   }
 
-  async processImage(s3Key) {
+  async processImage(s3Key, eTag) {
     console.log(`🚀 ImageProcessor: Processing image ${s3Key}`);
 
     const targetLanguage =
@@ -1011,6 +1014,7 @@ class ImageProcessor {
       body: JSON.stringify({
         bucket: AWS_CONFIG.bucketName,
         key: s3Key,
+        eTag: eTag,
         targetLanguage: targetLanguage
       })
     });
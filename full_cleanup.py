@@ -2,14 +2,68 @@
 """
 Complete deployment cleanup script - removes all deployment artifacts for a fresh start
 """
+
 import glob
 import json
 import os
 import shutil
 import subprocess
+from collections import Counter
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from functools import lru_cache
 
 import boto3
-from botocore.exceptions import ClientError
+from botocore.config import Config
+from botocore.exceptions import ClientError, WaiterError
+
+# Adaptive retries rate-limit requests client side once AWS starts throttling,
+# which keeps parallel deletes from turning into retry storms. The connection
+# pool is sized above the busiest per-service parallelism (S3 batches in flight
+# plus listing) so workers never wait on the default pool of 10 connections.
+CLEANUP_CONFIG = Config(
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    max_pool_connections=50,
+    connect_timeout=5,
+    read_timeout=30,
+)
+
+# Maximum concurrent delete calls per service, sized to the documented API rates
+_PARALLELISM = {
+    "cloudfront": 4,
+    "cognito-idp": 8,
+    "cognito-identity": 8,
+    "logs": 16,
+    "ec2": 16,
+    "s3": 16,
+}
+_DEFAULT_PARALLELISM = 8
+
+# Error codes AWS uses for throttling, and how many throttled deletes in a row
+# stop a cleanup step early
+_THROTTLING_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "RequestLimitExceeded",
+}
+_MAX_CONSECUTIVE_THROTTLES = 5
+
+# Case-folded project marker searched for in resource names, tags and comments
+_NEEDLE = "lenslate"
+
+# Log group name prefixes created by the project. CloudWatch Logs filters on
+# these server side, so only project log groups are ever listed.
+_LOG_GROUP_PREFIXES = ("lenslate", "/aws/lambda/lenslate", "/aws/codebuild/lenslate")
+
+# Resource types looked up through the Resource Groups Tagging API. Terraform
+# tags everything it creates with Project=<project_name>, so for these types a
+# single tag query also finds resources whose names lack the project marker.
+_TAGGED_RESOURCE_TYPES = ("lambda:function", "dynamodb:table")
 
 
 def clean_terraform_files():
@@ -139,9 +193,244 @@ def clean_zip_files():
     return True
 
 
+@lru_cache(maxsize=None)
+def _client(service_name):
+    """Get the shared cleanup client for a service
+
+    Clients are thread-safe, so every cleanup step reuses one client (and its
+    connection pool) per service instead of opening new connections each time.
+    """
+    return boto3.client(service_name, config=CLEANUP_CONFIG)
+
+
+# Cheap read-only call per service used to open a connection before cleanup
+_PREWARM_CALLS = {
+    "s3": ("list_buckets", {}),
+    "dynamodb": ("list_tables", {"Limit": 1}),
+    "lambda": ("list_functions", {"MaxItems": 1}),
+    "cloudformation": ("list_stacks", {}),
+    "apigateway": ("get_rest_apis", {"limit": 1}),
+    "apigatewayv2": ("get_apis", {"MaxResults": "1"}),
+    "cognito-idp": ("list_user_pools", {"MaxResults": 1}),
+    "cognito-identity": ("list_identity_pools", {"MaxResults": 1}),
+    "ec2": ("describe_instances", {"MaxResults": 5}),
+    "logs": ("describe_log_groups", {"limit": 1}),
+    "codepipeline": ("list_pipelines", {"maxResults": 1}),
+    "codebuild": ("list_projects", {}),
+    "cloudfront": ("list_distributions", {"MaxItems": "1"}),
+    "resourcegroupstaggingapi": ("get_resources", {"ResourcesPerPage": 1}),
+}
+
+
+def prewarm_aws_clients():
+    """Open a connection to every AWS service used by the cleanup in parallel
+
+    The DNS lookup and TCP/TLS handshake for each endpoint then happen
+    concurrently up front instead of on the first request of each cleanup step.
+    Failures are ignored here and surface in the step that needs the service.
+    """
+
+    def _prewarm(service_name):
+        operation, kwargs = _PREWARM_CALLS[service_name]
+        try:
+            getattr(_client(service_name), operation)(**kwargs)
+        except Exception:
+            pass
+
+    with ThreadPoolExecutor(max_workers=len(_PREWARM_CALLS)) as executor:
+        list(executor.map(_prewarm, _PREWARM_CALLS))
+
+
+def _is_project(value):
+    """Check whether a resource name, tag or comment refers to the project"""
+    return value is not None and _NEEDLE in value.casefold()
+
+
+@lru_cache(maxsize=None)
+def discover_tagged_resources(project_tag=_NEEDLE):
+    """Find project resources by their Project tag in one paginated query
+
+    Returns:
+        Dict mapping resource type (e.g. "lambda:function") to resource names,
+        or None if the tagging API could not be queried
+    """
+    tagging_client = _client("resourcegroupstaggingapi")
+    resources = {resource_type: [] for resource_type in _TAGGED_RESOURCE_TYPES}
+
+    try:
+        paginator = tagging_client.get_paginator("get_resources")
+        for page in paginator.paginate(
+            TagFilters=[{"Key": "Project", "Values": [project_tag]}],
+            ResourceTypeFilters=list(_TAGGED_RESOURCE_TYPES),
+        ):
+            for mapping in page.get("ResourceTagMappingList", []):
+                # arn:aws:lambda:<region>:<account>:function:<name>
+                # arn:aws:dynamodb:<region>:<account>:table/<name>
+                _, _, service, _, _, resource = mapping["ResourceARN"].split(":", 5)
+                resource_type, _, name = resource.replace("/", ":", 1).partition(":")
+                resources.setdefault(f"{service}:{resource_type}", []).append(name)
+    except ClientError as e:
+        print(f"   ⚠️  Could not query tagged resources, listing instead: {e}")
+        return None
+
+    return resources
+
+
+def _tagged_resource_names(resource_type):
+    """Get the tagged project resource names of a type, empty if the query failed"""
+    return (discover_tagged_resources() or {}).get(resource_type, [])
+
+
+def _iter_project_resources(
+    client, operation, result_key, name_getter, is_project, paginate_kwargs=None
+):
+    """Yield project resources page by page from one or more paginated scans
+
+    Resources already returned by an earlier scan are skipped, so overlapping
+    scans (e.g. several name prefixes) yield each resource once.
+    """
+    if paginate_kwargs is None or isinstance(paginate_kwargs, dict):
+        paginate_kwargs = [paginate_kwargs or {}]
+
+    paginator = client.get_paginator(operation)
+    seen = set()
+    for scan_kwargs in paginate_kwargs:
+        for page in paginator.paginate(**scan_kwargs):
+            for item in page.get(result_key, []):
+                name = name_getter(item)
+                if name not in seen and is_project(item):
+                    seen.add(name)
+                    yield item
+
+
+def _bulk_clean(
+    label,
+    client,
+    operation,
+    result_key,
+    name_getter,
+    delete_fn,
+    not_found_codes=("ResourceNotFoundException",),
+    paginate_kwargs=None,
+    is_project=None,
+    describe=None,
+    parallel=None,
+    tagged_resources=None,
+):
+    """List, filter and delete all project resources of a single type
+
+    Args:
+        label: Human readable resource type used in messages (e.g. "log group")
+        client: boto3 client that owns the paginated list operation
+        operation: Name of the paginated list operation (e.g. "describe_log_groups")
+        result_key: Key holding the resource list in each page
+        name_getter: Callable returning the display name of a resource
+        delete_fn: Callable that deletes a single resource
+        not_found_codes: Error codes meaning the resource is already gone
+        paginate_kwargs: Extra keyword arguments passed to the paginator, or a
+            list of them to run several scans whose results are merged
+        is_project: Optional predicate deciding whether a resource belongs to the
+            project, defaults to _is_project on the resource name
+        describe: Optional callable producing the report line for a resource
+        parallel: Maximum number of concurrent delete calls, defaults to the
+            per-service limit in _PARALLELISM
+        tagged_resources: Optional project resources found by tag (e.g. from
+            discover_tagged_resources), merged with the listed resources so
+            untagged project resources are still cleaned
+
+    Returns:
+        Tuple of (success_count, total_count)
+    """
+    if is_project is None:
+
+        def is_project(item):
+            return _is_project(name_getter(item))
+
+    describe = describe or name_getter
+    if parallel is None:
+        parallel = _PARALLELISM.get(
+            client.meta.service_model.service_name, _DEFAULT_PARALLELISM
+        )
+
+    resources = list(
+        _iter_project_resources(
+            client, operation, result_key, name_getter, is_project, paginate_kwargs
+        )
+    )
+    listed = {name_getter(item) for item in resources}
+    resources.extend(
+        item for item in tagged_resources or () if name_getter(item) not in listed
+    )
+
+    if not resources:
+        return 0, 0
+
+    print(f"   📋 Found {len(resources)} project {label}s:")
+    for item in resources:
+        print(f"      - {describe(item)}")
+    print()
+
+    def _delete(item):
+        name = name_getter(item)
+        try:
+            print(f"   🗑️  Deleting {label}: {name}")
+            delete_fn(item)
+            print(f"   ✅ Successfully deleted {label}: {name}")
+            return "deleted"
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            if error_code in not_found_codes:
+                print(f"   ⚠️  {label[0].upper()}{label[1:]} {name} does not exist")
+                return "deleted"
+            print(f"   ❌ Error deleting {label} {name}: {e}")
+            if error_code in _THROTTLING_CODES:
+                return "throttled"
+        except Exception as e:
+            print(f"   ❌ Unexpected error deleting {label} {name}: {e}")
+        return "failed"
+
+    outcomes = Counter()
+    consecutive_throttles = 0
+
+    with ThreadPoolExecutor(max_workers=min(parallel, len(resources))) as executor:
+        futures = [executor.submit(_delete, item) for item in resources]
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            outcome = future.result()
+            outcomes[outcome] += 1
+
+            consecutive_throttles = (
+                consecutive_throttles + 1 if outcome == "throttled" else 0
+            )
+            if consecutive_throttles == _MAX_CONSECUTIVE_THROTTLES:
+                # Still throttled after adaptive retries, stop queueing more
+                # deletes and report the partial result
+                print(f"   ⚠️  Too many throttled {label} deletions, skipping the rest")
+                for pending in futures:
+                    pending.cancel()
+
+    success_count = outcomes["deleted"]
+    return success_count, len(resources)
+
+
+def _report_cleanup(description, success_count, total_count):
+    """Print the summary line for a cleanup step and return whether it fully succeeded"""
+    if total_count == 0:
+        print(f"   📂 No project {description} found")
+        return True
+
+    if success_count == total_count:
+        print(f"✅ Successfully cleaned {success_count} {description}")
+        return True
+
+    print(f"⚠️ Cleaned {success_count}/{total_count} {description} with some errors")
+    return False
+
+
 def get_all_s3_buckets():
     """Get all S3 buckets that belong to this project"""
-    s3_client = boto3.client("s3")
+    s3_client = _client("s3")
     project_buckets = []
 
     try:
@@ -149,7 +438,7 @@ def get_all_s3_buckets():
         for bucket in response["Buckets"]:
             bucket_name = bucket["Name"]
             # Check if this bucket belongs to lenslate project
-            if "lenslate" in bucket_name.lower():
+            if _is_project(bucket_name):
                 project_buckets.append(bucket_name)
     except ClientError as e:
         print(f"❌ Error listing buckets: {e}")
@@ -157,54 +446,78 @@ def get_all_s3_buckets():
     return project_buckets
 
 
+def _iter_object_version_batches(s3_client, bucket_name):
+    """Yield lists of up to 1000 object versions and delete markers to delete"""
+    paginator = s3_client.get_paginator("list_object_versions")
+    batch = []
+
+    for page in paginator.paginate(Bucket=bucket_name):
+        for obj in page.get("Versions", []) + page.get("DeleteMarkers", []):
+            batch.append({"Key": obj["Key"], "VersionId": obj["VersionId"]})
+            # delete_objects accepts at most 1000 keys per request
+            if len(batch) == 1000:
+                yield batch
+                batch = []
+
+    if batch:
+        yield batch
+
+
+def _delete_object_batch(s3_client, bucket_name, batch):
+    """Delete a batch of object versions
+
+    Returns:
+        Tuple of (deleted_count, errors) where errors lists the keys S3 could
+        not delete
+    """
+    # Quiet mode only reports failed keys, keeping the response small
+    response = s3_client.delete_objects(
+        Bucket=bucket_name, Delete={"Objects": batch, "Quiet": True}
+    )
+    errors = response.get("Errors", [])
+    return len(batch) - len(errors), errors
+
+
 def empty_and_delete_bucket(bucket_name):
     """Empty and delete a single S3 bucket"""
-    s3_client = boto3.client("s3")
+    s3_client = _client("s3")
+    workers = _PARALLELISM.get("s3", _DEFAULT_PARALLELISM)
 
     try:
         print(f"   🧹 Emptying bucket: {bucket_name}")
 
-        # Delete all objects (including versioned objects)
-        paginator = s3_client.get_paginator("list_object_versions")
-        pages = paginator.paginate(Bucket=bucket_name)
-
-        objects_to_delete = []
+        # Delete all objects (including versioned objects) in batches of 1000,
+        # keeping a bounded number of delete requests in flight while listing
         total_count = 0
-
-        for page in pages:
-            # Delete regular objects
-            if "Versions" in page:
-                for obj in page["Versions"]:
-                    objects_to_delete.append(
-                        {"Key": obj["Key"], "VersionId": obj["VersionId"]}
-                    )
-                    total_count += 1
-
-            # Delete delete markers
-            if "DeleteMarkers" in page:
-                for obj in page["DeleteMarkers"]:
-                    objects_to_delete.append(
-                        {"Key": obj["Key"], "VersionId": obj["VersionId"]}
-                    )
-                    total_count += 1
-
-            # Delete in batches of 1000 (AWS limit)
-            if len(objects_to_delete) >= 1000:
-                s3_client.delete_objects(
-                    Bucket=bucket_name, Delete={"Objects": objects_to_delete}
+        errors = []
+        pending = set()
+
+        def _collect(done):
+            nonlocal total_count
+            for future in done:
+                deleted_count, batch_errors = future.result()
+                total_count += deleted_count
+                errors.extend(batch_errors)
+                print(f"      Deleted {deleted_count} objects...")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for batch in _iter_object_version_batches(s3_client, bucket_name):
+                pending.add(
+                    executor.submit(_delete_object_batch, s3_client, bucket_name, batch)
                 )
-                print(f"      Deleted {len(objects_to_delete)} objects...")
-                objects_to_delete = []
-
-        # Delete remaining objects
-        if objects_to_delete:
-            s3_client.delete_objects(
-                Bucket=bucket_name, Delete={"Objects": objects_to_delete}
-            )
-            print(f"      Deleted {len(objects_to_delete)} objects...")
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(done)
+            _collect(wait(pending).done)
 
         print(f"   📊 Total objects deleted from {bucket_name}: {total_count}")
 
+        if errors:
+            print(f"   ❌ Failed to delete {len(errors)} objects from {bucket_name}:")
+            for error in errors[:5]:
+                print(f"      - {error.get('Key')}: {error.get('Message')}")
+            return False
+
         # Now delete the bucket itself
         print(f"   🗑️  Deleting bucket: {bucket_name}")
         s3_client.delete_bucket(Bucket=bucket_name)
@@ -254,190 +567,126 @@ def clean_all_s3_buckets():
         return False
 
 
-def clean_all_dynamodb_tables():
-    """Find and delete all project DynamoDB tables"""
-    print("🧹 Finding and cleaning all project DynamoDB tables...")
-
-    dynamodb = boto3.client("dynamodb")
-    project_tables = []
-
-    try:
-        # List all tables and filter for project tables
-        paginator = dynamodb.get_paginator("list_tables")
-        pages = paginator.paginate()
+def _wait_for_tables_deleted(dynamodb, table_names):
+    """Wait until deleted DynamoDB tables are gone, polling all of them concurrently
 
-        for page in pages:
-            for table_name in page["TableNames"]:
-                if "lenslate" in table_name.lower():
-                    project_tables.append(table_name)
+    Returns:
+        Number of tables that finished deleting in time
+    """
 
-        if not project_tables:
-            print("   📂 No project DynamoDB tables found")
+    def _wait(table_name):
+        try:
+            dynamodb.get_waiter("table_not_exists").wait(
+                TableName=table_name, WaiterConfig={"Delay": 5, "MaxAttempts": 60}
+            )
             return True
+        except WaiterError as e:
+            print(f"   ❌ Table {table_name} was not deleted in time: {e}")
+            return False
 
-        print(f"   📋 Found {len(project_tables)} project tables:")
-        for table in project_tables:
-            print(f"      - {table}")
+    print(f"   ⏳ Waiting for {len(table_names)} tables to finish deleting...")
+    workers = min(_PARALLELISM.get("dynamodb", _DEFAULT_PARALLELISM), len(table_names))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(_wait, table_names))
 
-        print()
-        success_count = 0
 
-        for table_name in project_tables:
-            try:
-                print(f"   🗑️  Deleting table: {table_name}")
-                dynamodb.delete_table(TableName=table_name)
-                print(f"   ✅ Successfully deleted table: {table_name}")
-                success_count += 1
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "Unknown")
-                if error_code == "ResourceNotFoundException":
-                    print(f"   ⚠️  Table {table_name} does not exist")
-                    success_count += 1
-                else:
-                    print(f"   ❌ Error deleting table {table_name}: {e}")
-            except Exception as e:
-                print(f"   ❌ Unexpected error deleting table {table_name}: {e}")
+def clean_all_dynamodb_tables():
+    """Find and delete all project DynamoDB tables"""
+    print("🧹 Finding and cleaning all project DynamoDB tables...")
 
-        if success_count == len(project_tables):
-            print(f"✅ Successfully cleaned {success_count} DynamoDB tables")
-            return True
-        else:
-            print(
-                f"⚠️ Cleaned {success_count}/{len(project_tables)} DynamoDB tables with some errors"
-            )
-            return False
+    dynamodb = _client("dynamodb")
+    deleting_tables = []
 
+    def _delete_table(table_name):
+        dynamodb.delete_table(TableName=table_name)
+        deleting_tables.append(table_name)
+
+    try:
+        success_count, total_count = _bulk_clean(
+            "table",
+            dynamodb,
+            "list_tables",
+            "TableNames",
+            name_getter=lambda table_name: table_name,
+            delete_fn=_delete_table,
+            tagged_resources=_tagged_resource_names("dynamodb:table"),
+        )
     except ClientError as e:
         print(f"❌ Error listing DynamoDB tables: {e}")
         return False
 
+    # delete_table only starts the deletion, wait for every table at once
+    # instead of one after another
+    if deleting_tables:
+        success_count -= len(deleting_tables) - _wait_for_tables_deleted(
+            dynamodb, deleting_tables
+        )
+
+    return _report_cleanup("DynamoDB tables", success_count, total_count)
+
 
 def clean_lambda_functions():
     """Clean Lambda functions associated with the project"""
     print("🧹 Finding and cleaning Lambda functions...")
 
-    lambda_client = boto3.client("lambda")
-    project_functions = []
+    lambda_client = _client("lambda")
 
     try:
-        # List all functions and filter for project functions
-        paginator = lambda_client.get_paginator("list_functions")
-        pages = paginator.paginate()
-
-        for page in pages:
-            for function in page["Functions"]:
-                function_name = function["FunctionName"]
-                if "lenslate" in function_name.lower():
-                    project_functions.append(function_name)
-
-        if not project_functions:
-            print("   📂 No project Lambda functions found")
-            return True
-
-        print(f"   📋 Found {len(project_functions)} project functions:")
-        for func in project_functions:
-            print(f"      - {func}")
-
-        print()
-        success_count = 0
-
-        for function_name in project_functions:
-            try:
-                print(f"   🗑️  Deleting function: {function_name}")
-                lambda_client.delete_function(FunctionName=function_name)
-                print(f"   ✅ Successfully deleted function: {function_name}")
-                success_count += 1
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "Unknown")
-                if error_code == "ResourceNotFoundException":
-                    print(f"   ⚠️  Function {function_name} does not exist")
-                    success_count += 1
-                else:
-                    print(f"   ❌ Error deleting function {function_name}: {e}")
-            except Exception as e:
-                print(f"   ❌ Unexpected error deleting function {function_name}: {e}")
-
-        if success_count == len(project_functions):
-            print(f"✅ Successfully cleaned {success_count} Lambda functions")
-            return True
-        else:
-            print(
-                f"⚠️ Cleaned {success_count}/{len(project_functions)} Lambda functions with some errors"
-            )
-            return False
-
+        success_count, total_count = _bulk_clean(
+            "function",
+            lambda_client,
+            "list_functions",
+            "Functions",
+            name_getter=lambda function: function["FunctionName"],
+            delete_fn=lambda function: lambda_client.delete_function(
+                FunctionName=function["FunctionName"]
+            ),
+            tagged_resources=[
+                {"FunctionName": name}
+                for name in _tagged_resource_names("lambda:function")
+            ],
+        )
     except ClientError as e:
         print(f"❌ Error listing Lambda functions: {e}")
         return False
 
+    return _report_cleanup("Lambda functions", success_count, total_count)
+
 
 def clean_cloudformation_stacks():
     """Clean CloudFormation stacks associated with the project"""
     print("🧹 Finding and cleaning CloudFormation stacks...")
 
-    cf_client = boto3.client("cloudformation")
-    project_stacks = []
+    cf_client = _client("cloudformation")
 
     try:
-        # List all stacks and filter for project stacks
-        paginator = cf_client.get_paginator("list_stacks")
-        pages = paginator.paginate(
-            StackStatusFilter=[
-                "CREATE_COMPLETE",
-                "UPDATE_COMPLETE",
-                "CREATE_FAILED",
-                "UPDATE_FAILED",
-                "ROLLBACK_COMPLETE",
-                "ROLLBACK_FAILED",
-            ]
+        success_count, total_count = _bulk_clean(
+            "stack",
+            cf_client,
+            "list_stacks",
+            "StackSummaries",
+            name_getter=lambda stack: stack["StackName"],
+            delete_fn=lambda stack: cf_client.delete_stack(
+                StackName=stack["StackName"]
+            ),
+            not_found_codes=("ValidationError", "ResourceNotFound"),
+            paginate_kwargs={
+                "StackStatusFilter": [
+                    "CREATE_COMPLETE",
+                    "UPDATE_COMPLETE",
+                    "CREATE_FAILED",
+                    "UPDATE_FAILED",
+                    "ROLLBACK_COMPLETE",
+                    "ROLLBACK_FAILED",
+                ]
+            },
         )
-
-        for page in pages:
-            for stack in page["StackSummaries"]:
-                stack_name = stack["StackName"]
-                if "lenslate" in stack_name.lower():
-                    project_stacks.append(stack_name)
-
-        if not project_stacks:
-            print("   📂 No project CloudFormation stacks found")
-            return True
-
-        print(f"   📋 Found {len(project_stacks)} project stacks:")
-        for stack in project_stacks:
-            print(f"      - {stack}")
-
-        print()
-        success_count = 0
-
-        for stack_name in project_stacks:
-            try:
-                print(f"   🗑️  Deleting stack: {stack_name}")
-                cf_client.delete_stack(StackName=stack_name)
-                print(f"   ✅ Successfully deleted stack: {stack_name}")
-                success_count += 1
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "Unknown")
-                if error_code in ["ValidationError", "ResourceNotFound"]:
-                    print(f"   ⚠️  Stack {stack_name} does not exist")
-                    success_count += 1
-                else:
-                    print(f"   ❌ Error deleting stack {stack_name}: {e}")
-            except Exception as e:
-                print(f"   ❌ Unexpected error deleting stack {stack_name}: {e}")
-
-        if success_count == len(project_stacks):
-            print(f"✅ Successfully cleaned {success_count} CloudFormation stacks")
-            return True
-        else:
-            print(
-                f"⚠️ Cleaned {success_count}/{len(project_stacks)} CloudFormation stacks with some errors"
-            )
-            return False
-
     except ClientError as e:
         print(f"❌ Error listing CloudFormation stacks: {e}")
         return False
 
+    return _report_cleanup("CloudFormation stacks", success_count, total_count)
+
 
 def execute_terraform_stack_destruction():
     """Destroy Terraform stacks using multiple strategies"""
@@ -593,7 +842,7 @@ def clean_tracked_resources():
         print(
             f"   📋 Cleaning {len(tracked['dynamodb_tables'])} tracked DynamoDB tables..."
         )
-        dynamodb = boto3.client("dynamodb")
+        dynamodb = _client("dynamodb")
         for table_name in tracked["dynamodb_tables"]:
             try:
                 dynamodb.delete_table(TableName=table_name)
@@ -613,7 +862,7 @@ def clean_tracked_resources():
         print(
             f"   📋 Cleaning {len(tracked['lambda_functions'])} tracked Lambda functions..."
         )
-        lambda_client = boto3.client("lambda")
+        lambda_client = _client("lambda")
         for function_name in tracked["lambda_functions"]:
             try:
                 lambda_client.delete_function(FunctionName=function_name)
@@ -635,106 +884,50 @@ def clean_api_gateway():
     """Clean API Gateway REST APIs and WebSocket APIs associated with the project"""
     print("🧹 Finding and cleaning API Gateway APIs...")
 
-    # Clean REST APIs
-    apigateway_client = boto3.client("apigateway")
-    project_rest_apis = []
+    apigateway_client = _client("apigateway")
+    apigatewayv2_client = _client("apigatewayv2")
 
     try:
-        # List all REST APIs and filter for project APIs
-        paginator = apigateway_client.get_paginator("get_rest_apis")
-        pages = paginator.paginate()
-
-        for page in pages:
-            for api in page["items"]:
-                api_name = api.get("name", "").lower()
-                api_description = api.get("description", "").lower()
-                if "lenslate" in api_name or "lenslate" in api_description:
-                    project_rest_apis.append(
-                        {"id": api["id"], "name": api.get("name", ""), "type": "REST"}
-                    )
-
-        # Clean WebSocket APIs (API Gateway v2)
-        apigatewayv2_client = boto3.client("apigatewayv2")
-        project_websocket_apis = []
-
-        paginator_v2 = apigatewayv2_client.get_paginator("get_apis")
-        pages_v2 = paginator_v2.paginate()
-
-        for page in pages_v2:
-            for api in page["Items"]:
-                api_name = api.get("Name", "").lower()
-                api_description = api.get("Description", "").lower()
-                if "lenslate" in api_name or "lenslate" in api_description:
-                    project_websocket_apis.append(
-                        {
-                            "id": api["ApiId"],
-                            "name": api.get("Name", ""),
-                            "type": api.get("ProtocolType", "WebSocket"),
-                        }
-                    )
-
-        all_apis = project_rest_apis + project_websocket_apis
-
-        if not all_apis:
-            print("   📂 No project API Gateway APIs found")
-            return True
-
-        print(f"   📋 Found {len(all_apis)} project APIs:")
-        for api in all_apis:
-            print(f"      - {api['name']} ({api['type']}) - {api['id']}")
-
-        print()
-        success_count = 0
-
-        # Delete REST APIs
-        for api in project_rest_apis:
-            try:
-                print(f"   🗑️  Deleting REST API: {api['name']} ({api['id']})")
-                apigateway_client.delete_rest_api(restApiId=api["id"])
-                print(f"   ✅ Successfully deleted REST API: {api['name']}")
-                success_count += 1
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "Unknown")
-                if error_code == "NotFoundException":
-                    print(f"   ⚠️  REST API {api['name']} does not exist")
-                    success_count += 1
-                else:
-                    print(f"   ❌ Error deleting REST API {api['name']}: {e}")
-            except Exception as e:
-                print(f"   ❌ Unexpected error deleting REST API {api['name']}: {e}")
-
-        # Delete WebSocket APIs
-        for api in project_websocket_apis:
-            try:
-                print(f"   🗑️  Deleting {api['type']} API: {api['name']} ({api['id']})")
-                apigatewayv2_client.delete_api(ApiId=api["id"])
-                print(f"   ✅ Successfully deleted {api['type']} API: {api['name']}")
-                success_count += 1
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "Unknown")
-                if error_code == "NotFoundException":
-                    print(f"   ⚠️  {api['type']} API {api['name']} does not exist")
-                    success_count += 1
-                else:
-                    print(f"   ❌ Error deleting {api['type']} API {api['name']}: {e}")
-            except Exception as e:
-                print(
-                    f"   ❌ Unexpected error deleting {api['type']} API {api['name']}: {e}"
-                )
-
-        if success_count == len(all_apis):
-            print(f"✅ Successfully cleaned {success_count} API Gateway APIs")
-            return True
-        else:
-            print(
-                f"⚠️ Cleaned {success_count}/{len(all_apis)} API Gateway APIs with some errors"
-            )
-            return False
+        # Clean REST APIs
+        rest_success, rest_total = _bulk_clean(
+            "REST API",
+            apigateway_client,
+            "get_rest_apis",
+            "items",
+            name_getter=lambda api: api.get("name", ""),
+            delete_fn=lambda api: apigateway_client.delete_rest_api(
+                restApiId=api["id"]
+            ),
+            not_found_codes=("NotFoundException",),
+            is_project=lambda api: _is_project(api.get("name"))
+            or _is_project(api.get("description")),
+            describe=lambda api: f"{api.get('name', '')} (REST) - {api['id']}",
+        )
 
+        # Clean WebSocket and HTTP APIs (API Gateway v2)
+        v2_success, v2_total = _bulk_clean(
+            "API Gateway v2 API",
+            apigatewayv2_client,
+            "get_apis",
+            "Items",
+            name_getter=lambda api: api.get("Name", ""),
+            delete_fn=lambda api: apigatewayv2_client.delete_api(ApiId=api["ApiId"]),
+            not_found_codes=("NotFoundException",),
+            is_project=lambda api: _is_project(api.get("Name"))
+            or _is_project(api.get("Description")),
+            describe=lambda api: (
+                f"{api.get('Name', '')} ({api.get('ProtocolType', 'WebSocket')})"
+                f" - {api['ApiId']}"
+            ),
+        )
     except ClientError as e:
         print(f"❌ Error listing API Gateway APIs: {e}")
         return False
 
+    return _report_cleanup(
+        "API Gateway APIs", rest_success + v2_success, rest_total + v2_total
+    )
+
 
 def clean_all_cognito_domains(cognito_idp_client):
     """Delete ALL Cognito domains to prevent domain-related deletion errors"""
@@ -747,8 +940,7 @@ def clean_all_cognito_domains(cognito_idp_client):
 
         for page in pages:
             for pool in page["UserPools"]:
-                pool_name = pool.get("Name", "").lower()
-                if "lenslate" in pool_name:
+                if _is_project(pool.get("Name")):
                     pool_id = pool["Id"]
 
                     # Method 1: Check the user pool directly for its domain
@@ -835,572 +1027,533 @@ def clean_cognito_resources():
     """Clean Cognito User Pools and Identity Pools associated with the project"""
     print("🧹 Finding and cleaning Cognito resources...")
 
-    cognito_idp_client = boto3.client("cognito-idp")
-    cognito_identity_client = boto3.client("cognito-identity")
-
-    project_user_pools = []
-    project_identity_pools = []
+    cognito_idp_client = _client("cognito-idp")
+    cognito_identity_client = _client("cognito-identity")
 
     try:
         # Delete ALL Cognito domains (to prevent the domain deletion error)
         clean_all_cognito_domains(cognito_idp_client)
 
-        # Clean User Pools
-        paginator = cognito_idp_client.get_paginator("list_user_pools")
-        pages = paginator.paginate(MaxResults=60)
-
-        for page in pages:
-            for pool in page["UserPools"]:
-                pool_name = pool.get("Name", "").lower()
-                if "lenslate" in pool_name:
-                    project_user_pools.append(
-                        {"id": pool["Id"], "name": pool.get("Name", "")}
-                    )
-
-        # Clean Identity Pools
-        paginator_identity = cognito_identity_client.get_paginator(
-            "list_identity_pools"
+        user_pool_success, user_pool_total = _bulk_clean(
+            "User Pool",
+            cognito_idp_client,
+            "list_user_pools",
+            "UserPools",
+            name_getter=lambda pool: pool.get("Name", ""),
+            delete_fn=lambda pool: cognito_idp_client.delete_user_pool(
+                UserPoolId=pool["Id"]
+            ),
+            paginate_kwargs={"MaxResults": 60},
+            describe=lambda pool: f"User Pool: {pool.get('Name', '')} ({pool['Id']})",
         )
-        pages_identity = paginator_identity.paginate(MaxResults=60)
-
-        for page in pages_identity:
-            for pool in page["IdentityPools"]:
-                pool_name = pool.get("IdentityPoolName", "").lower()
-                if "lenslate" in pool_name:
-                    project_identity_pools.append(
-                        {
-                            "id": pool["IdentityPoolId"],
-                            "name": pool.get("IdentityPoolName", ""),
-                        }
-                    )
 
-        all_pools = project_user_pools + project_identity_pools
-
-        if not all_pools:
-            print("   📂 No project Cognito pools found")
-            return True
-
-        print(
-            f"   📋 Found {len(project_user_pools)} user pools and {len(project_identity_pools)} identity pools:"
+        identity_pool_success, identity_pool_total = _bulk_clean(
+            "Identity Pool",
+            cognito_identity_client,
+            "list_identity_pools",
+            "IdentityPools",
+            name_getter=lambda pool: pool.get("IdentityPoolName", ""),
+            delete_fn=lambda pool: cognito_identity_client.delete_identity_pool(
+                IdentityPoolId=pool["IdentityPoolId"]
+            ),
+            paginate_kwargs={"MaxResults": 60},
+            describe=lambda pool: (
+                f"Identity Pool: {pool.get('IdentityPoolName', '')}"
+                f" ({pool['IdentityPoolId']})"
+            ),
         )
-        for pool in project_user_pools:
-            print(f"      - User Pool: {pool['name']} ({pool['id']})")
-        for pool in project_identity_pools:
-            print(f"      - Identity Pool: {pool['name']} ({pool['id']})")
+    except ClientError as e:
+        print(f"❌ Error listing Cognito resources: {e}")
+        return False
 
-        print()
-        success_count = 0
+    return _report_cleanup(
+        "Cognito pools",
+        user_pool_success + identity_pool_success,
+        user_pool_total + identity_pool_total,
+    )
+
+
+def _iter_project_instances(ec2_client):
+    """Yield non-terminated project EC2 instances as they are paginated"""
+    paginator = ec2_client.get_paginator("describe_instances")
+    pages = paginator.paginate(
+        Filters=[
+            {
+                "Name": "instance-state-name",
+                "Values": [
+                    "pending",
+                    "running",
+                    "shutting-down",
+                    "stopping",
+                    "stopped",
+                ],
+            }
+        ]
+    )
 
-        # Delete User Pools
-        for pool in project_user_pools:
-            try:
-                print(f"   🗑️  Deleting User Pool: {pool['name']} ({pool['id']})")
-                cognito_idp_client.delete_user_pool(UserPoolId=pool["id"])
-                print(f"   ✅ Successfully deleted User Pool: {pool['name']}")
-                success_count += 1
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "Unknown")
-                if error_code == "ResourceNotFoundException":
-                    print(f"   ⚠️  User Pool {pool['name']} does not exist")
-                    success_count += 1
-                else:
-                    print(f"   ❌ Error deleting User Pool {pool['name']}: {e}")
-            except Exception as e:
-                print(f"   ❌ Unexpected error deleting User Pool {pool['name']}: {e}")
+    for page in pages:
+        for reservation in page["Reservations"]:
+            for instance in reservation["Instances"]:
+                tags = instance.get("Tags", [])
+                if not any(_is_project(tag.get("Value")) for tag in tags):
+                    continue
 
-        # Delete Identity Pools
-        for pool in project_identity_pools:
-            try:
-                print(f"   🗑️  Deleting Identity Pool: {pool['name']} ({pool['id']})")
-                cognito_identity_client.delete_identity_pool(IdentityPoolId=pool["id"])
-                print(f"   ✅ Successfully deleted Identity Pool: {pool['name']}")
-                success_count += 1
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "Unknown")
-                if error_code == "ResourceNotFoundException":
-                    print(f"   ⚠️  Identity Pool {pool['name']} does not exist")
-                    success_count += 1
-                else:
-                    print(f"   ❌ Error deleting Identity Pool {pool['name']}: {e}")
-            except Exception as e:
-                print(
-                    f"   ❌ Unexpected error deleting Identity Pool {pool['name']}: {e}"
+                instance_name = next(
+                    (tag["Value"] for tag in tags if tag["Key"] == "Name"), ""
                 )
-
-        if success_count == len(all_pools):
-            print(f"✅ Successfully cleaned {success_count} Cognito pools")
-            return True
-        else:
-            print(
-                f"⚠️ Cleaned {success_count}/{len(all_pools)} Cognito pools with some errors"
-            )
-            return False
-
-    except ClientError as e:
-        print(f"❌ Error listing Cognito resources: {e}")
-        return False
+                yield {
+                    "id": instance["InstanceId"],
+                    "name": instance_name,
+                    "state": instance["State"]["Name"],
+                    "type": instance["InstanceType"],
+                }
 
 
 def clean_ec2_instances():
     """Clean EC2 instances associated with the project"""
     print("🧹 Finding and cleaning EC2 instances...")
 
-    ec2_client = boto3.client("ec2")
-    project_instances = []
-
-    try:
-        # List all instances and filter for project instances
-        paginator = ec2_client.get_paginator("describe_instances")
-        pages = paginator.paginate()
-
-        for page in pages:
-            for reservation in page["Reservations"]:
-                for instance in reservation["Instances"]:
-                    # Skip terminated instances
-                    if instance["State"]["Name"] == "terminated":
-                        continue
-
-                    instance_id = instance["InstanceId"]
-                    instance_name = ""
-
-                    # Check tags for project name
-                    is_project_instance = False
-                    for tag in instance.get("Tags", []):
-                        if tag["Key"] == "Name":
-                            instance_name = tag["Value"]
-                        if "lenslate" in tag.get("Value", "").lower():
-                            is_project_instance = True
-
-                    # Also check if instance name contains project name
-                    if "lenslate" in instance_name.lower():
-                        is_project_instance = True
-
-                    if is_project_instance:
-                        project_instances.append(
-                            {
-                                "id": instance_id,
-                                "name": instance_name,
-                                "state": instance["State"]["Name"],
-                                "type": instance["InstanceType"],
-                            }
-                        )
+    ec2_client = _client("ec2")
 
-        if not project_instances:
-            print("   📂 No project EC2 instances found")
-            return True
+    # Only instance IDs are kept while streaming the scan; the full instance
+    # descriptions are printed once and then dropped
+    to_terminate = []
+    instance_count = 0
 
-        print(f"   📋 Found {len(project_instances)} project instances:")
-        for instance in project_instances:
+    try:
+        for instance in _iter_project_instances(ec2_client):
+            if instance_count == 0:
+                print("   📋 Found project instances:")
+            instance_count += 1
             print(
                 f"      - {instance['name']} ({instance['id']}) - {instance['state']} ({instance['type']})"
             )
 
-        print()
-        success_count = 0
-
-        for instance in project_instances:
-            try:
-                instance_id = instance["id"]
-                instance_name = instance["name"]
-                current_state = instance["state"]
-
-                if current_state in ["running", "stopped", "stopping"]:
-                    print(
-                        f"   🗑️  Terminating instance: {instance_name} ({instance_id})"
-                    )
-                    ec2_client.terminate_instances(InstanceIds=[instance_id])
-                    print(
-                        f"   ✅ Successfully initiated termination for: {instance_name}"
-                    )
-                    success_count += 1
-                elif current_state == "shutting-down":
-                    print(f"   ⏳ Instance {instance_name} is already shutting down")
-                    success_count += 1
-                else:
-                    print(
-                        f"   ⚠️  Instance {instance_name} is in state '{current_state}' - skipping"
-                    )
-                    success_count += 1
-
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "Unknown")
-                if error_code == "InvalidInstanceID.NotFound":
-                    print(f"   ⚠️  Instance {instance['name']} does not exist")
-                    success_count += 1
-                else:
-                    print(f"   ❌ Error terminating instance {instance['name']}: {e}")
-            except Exception as e:
+            if instance["state"] in ["running", "stopped", "stopping"]:
+                to_terminate.append(instance["id"])
+            elif instance["state"] == "shutting-down":
+                print(f"   ⏳ Instance {instance['name']} is already shutting down")
+            else:
                 print(
-                    f"   ❌ Unexpected error terminating instance {instance['name']}: {e}"
+                    f"   ⚠️  Instance {instance['name']} is in state '{instance['state']}' - skipping"
                 )
+    except ClientError as e:
+        print(f"❌ Error listing EC2 instances: {e}")
+        return False
 
-        if success_count == len(project_instances):
-            print(f"✅ Successfully processed {success_count} EC2 instances")
-            if any(i["state"] in ["running", "stopped"] for i in project_instances):
-                print(
-                    "ℹ️  Note: Instance termination may take a few minutes. Check AWS Console for status."
-                )
-            return True
-        else:
+    if instance_count == 0:
+        print("   📂 No project EC2 instances found")
+        return True
+
+    print()
+    failed_count = 0
+
+    # terminate_instances accepts up to 1000 IDs per request
+    for start in range(0, len(to_terminate), 1000):
+        batch = to_terminate[start : start + 1000]
+        try:
+            print(f"   🗑️  Terminating {len(batch)} instances...")
+            ec2_client.terminate_instances(InstanceIds=batch)
             print(
-                f"⚠️ Processed {success_count}/{len(project_instances)} EC2 instances with some errors"
+                f"   ✅ Successfully initiated termination for {len(batch)} instances"
             )
-            return False
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            if error_code == "InvalidInstanceID.NotFound":
+                # One missing instance fails the whole batch, retry one by one
+                failed_count += _terminate_instances_individually(ec2_client, batch)
+            else:
+                print(f"   ❌ Error terminating instances {', '.join(batch)}: {e}")
+                failed_count += len(batch)
+        except Exception as e:
+            print(
+                f"   ❌ Unexpected error terminating instances {', '.join(batch)}: {e}"
+            )
+            failed_count += len(batch)
 
-    except ClientError as e:
-        print(f"❌ Error listing EC2 instances: {e}")
+    success_count = instance_count - failed_count
+    if failed_count == 0:
+        print(f"✅ Successfully processed {success_count} EC2 instances")
+        if to_terminate:
+            print(
+                "ℹ️  Note: Instance termination may take a few minutes. Check AWS Console for status."
+            )
+        return True
+    else:
+        print(
+            f"⚠️ Processed {success_count}/{instance_count} EC2 instances with some errors"
+        )
         return False
 
 
+def _terminate_instances_individually(ec2_client, instance_ids):
+    """Terminate instances one at a time and return the number of failures"""
+    failed_count = 0
+    for instance_id in instance_ids:
+        try:
+            ec2_client.terminate_instances(InstanceIds=[instance_id])
+            print(f"   ✅ Successfully initiated termination for: {instance_id}")
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            if error_code == "InvalidInstanceID.NotFound":
+                print(f"   ⚠️  Instance {instance_id} does not exist")
+            else:
+                print(f"   ❌ Error terminating instance {instance_id}: {e}")
+                failed_count += 1
+    return failed_count
+
+
 def clean_cloudwatch_logs():
     """Clean CloudWatch log groups associated with the project"""
     print("🧹 Finding and cleaning CloudWatch log groups...")
 
-    logs_client = boto3.client("logs")
-    project_log_groups = []
+    logs_client = _client("logs")
+
+    def describe(log_group):
+        size_mb = log_group.get("storedBytes", 0) / (1024 * 1024)
+        retention = log_group.get("retentionInDays", "Never")
+        return f"{log_group['logGroupName']} ({size_mb:.2f} MB, retention: {retention})"
 
     try:
-        # List all log groups and filter for project log groups
-        paginator = logs_client.get_paginator("describe_log_groups")
-        pages = paginator.paginate()
+        success_count, total_count = _bulk_clean(
+            "log group",
+            logs_client,
+            "describe_log_groups",
+            "logGroups",
+            name_getter=lambda log_group: log_group["logGroupName"],
+            delete_fn=lambda log_group: logs_client.delete_log_group(
+                logGroupName=log_group["logGroupName"]
+            ),
+            paginate_kwargs=[
+                {"logGroupNamePrefix": prefix, "PaginationConfig": {"PageSize": 50}}
+                for prefix in _LOG_GROUP_PREFIXES
+            ],
+            is_project=lambda log_group: True,
+            describe=describe,
+        )
+    except ClientError as e:
+        print(f"❌ Error listing CloudWatch log groups: {e}")
+        return False
 
-        for page in pages:
-            for log_group in page["logGroups"]:
-                log_group_name = log_group["logGroupName"]
-                # Check if this log group belongs to lenslate project
-                if (
-                    "lenslate" in log_group_name.lower()
-                    or "/aws/lambda/lenslate" in log_group_name.lower()
-                ):
-                    project_log_groups.append(
-                        {
-                            "name": log_group_name,
-                            "size": log_group.get("storedBytes", 0),
-                            "retention": log_group.get("retentionInDays", "Never"),
-                        }
-                    )
+    return _report_cleanup("CloudWatch log groups", success_count, total_count)
 
-        if not project_log_groups:
-            print("   📂 No project CloudWatch log groups found")
-            return True
 
-        print(f"   📋 Found {len(project_log_groups)} project log groups:")
-        for log_group in project_log_groups:
-            size_mb = log_group["size"] / (1024 * 1024) if log_group["size"] > 0 else 0
-            print(
-                f"      - {log_group['name']} ({size_mb:.2f} MB, retention: {log_group['retention']})"
-            )
+def clean_codepipeline_resources():
+    """Clean CodePipeline pipelines and CodeBuild projects associated with the project"""
+    print("🧹 Finding and cleaning CodePipeline resources...")
 
-        print()
-        success_count = 0
+    codepipeline_client = _client("codepipeline")
+    codebuild_client = _client("codebuild")
 
-        for log_group in project_log_groups:
-            try:
-                log_group_name = log_group["name"]
-                print(f"   🗑️  Deleting log group: {log_group_name}")
-                logs_client.delete_log_group(logGroupName=log_group_name)
-                print(f"   ✅ Successfully deleted log group: {log_group_name}")
-                success_count += 1
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "Unknown")
-                if error_code == "ResourceNotFoundException":
-                    print(f"   ⚠️  Log group {log_group_name} does not exist")
-                    success_count += 1
-                else:
-                    print(f"   ❌ Error deleting log group {log_group_name}: {e}")
-            except Exception as e:
-                print(
-                    f"   ❌ Unexpected error deleting log group {log_group_name}: {e}"
-                )
-
-        if success_count == len(project_log_groups):
-            print(f"✅ Successfully cleaned {success_count} CloudWatch log groups")
-            return True
-        else:
-            print(
-                f"⚠️ Cleaned {success_count}/{len(project_log_groups)} CloudWatch log groups with some errors"
-            )
-            return False
+    try:
+        pipeline_success, pipeline_total = _bulk_clean(
+            "pipeline",
+            codepipeline_client,
+            "list_pipelines",
+            "pipelines",
+            name_getter=lambda pipeline: pipeline["name"],
+            delete_fn=lambda pipeline: codepipeline_client.delete_pipeline(
+                name=pipeline["name"]
+            ),
+            not_found_codes=("PipelineNotFoundException",),
+            describe=lambda pipeline: (
+                f"Pipeline: {pipeline['name']} (v{pipeline.get('version', 1)})"
+            ),
+        )
 
+        build_success, build_total = _bulk_clean(
+            "build project",
+            codebuild_client,
+            "list_projects",
+            "projects",
+            name_getter=lambda project_name: project_name,
+            delete_fn=lambda project_name: codebuild_client.delete_project(
+                name=project_name
+            ),
+            describe=lambda project_name: f"Build Project: {project_name}",
+        )
     except ClientError as e:
-        print(f"❌ Error listing CloudWatch log groups: {e}")
+        print(f"❌ Error listing CodePipeline/CodeBuild resources: {e}")
         return False
 
+    return _report_cleanup(
+        "CodePipeline/CodeBuild resources",
+        pipeline_success + build_success,
+        pipeline_total + build_total,
+    )
+
+
+def _find_project_distributions(cf_client):
+    """List CloudFront distributions that belong to the project"""
+    project_distributions = []
+
+    # List all distributions and filter for project distributions
+    paginator = cf_client.get_paginator("list_distributions")
+    pages = paginator.paginate()
+
+    for page in pages:
+        if "Items" in page["DistributionList"]:
+            for distribution in page["DistributionList"]["Items"]:
+                distribution_id = distribution["Id"]
+                # Check if this distribution belongs to lenslate project
+                # We can check the comment, origins, or tags, or specific known IDs
+                try:
+                    # Get detailed info about the distribution
+                    detail_response = cf_client.get_distribution(Id=distribution_id)
+                    distribution_config = detail_response["Distribution"][
+                        "DistributionConfig"
+                    ]
+
+                    # Check origins for S3 buckets that might contain project name
+                    origins_match = any(
+                        _is_project(origin["DomainName"])
+                        for origin in distribution_config["Origins"]["Items"]
+                    )
+
+                    # Also check for known distribution IDs
+                    known_distribution_ids = [
+                        "E2NOVZN5F0GP7Y"
+                    ]  # Add known project distribution IDs here
+
+                    if (
+                        _is_project(distribution_config.get("Comment"))
+                        or origins_match
+                        or distribution_id in known_distribution_ids
+                    ):
+                        project_distributions.append(
+                            {
+                                "Id": distribution_id,
+                                "Comment": distribution_config.get("Comment", ""),
+                                "Status": distribution["Status"],
+                                "ETag": detail_response["ETag"],
+                            }
+                        )
+                except ClientError as e:
+                    # If we can't get details, skip this distribution
+                    print(
+                        f"   ⚠️  Could not get details for distribution {distribution_id}: {e}"
+                    )
+                    continue
+
+    return project_distributions
 
-def clean_codepipeline_resources():
-    """Clean CodePipeline pipelines and CodeBuild projects associated with the project"""
-    print("🧹 Finding and cleaning CodePipeline resources...")
 
-    # Clean CodePipeline pipelines
-    codepipeline_client = boto3.client("codepipeline")
-    codebuild_client = boto3.client("codebuild")
+def disable_cloudfront_distributions():
+    """Find project CloudFront distributions and start disabling the enabled ones
 
-    project_pipelines = []
-    project_builds = []
+    Disabling takes several minutes to propagate, so the distributions are
+    deleted later by delete_cloudfront_distributions once other cleanup work
+    has had time to run.
+
+    Returns:
+        Tuple of (success, distribution_ids) where distribution_ids lists the
+        project distributions that still have to be deleted
+    """
+    print("🧹 Finding and disabling CloudFront distributions...")
+
+    cf_client = _client("cloudfront")
 
     try:
-        # List all pipelines and filter for project pipelines
-        paginator = codepipeline_client.get_paginator("list_pipelines")
-        pages = paginator.paginate()
+        project_distributions = _find_project_distributions(cf_client)
+    except ClientError as e:
+        print(f"❌ Error listing CloudFront distributions: {e}")
+        return False, []
 
-        for page in pages:
-            for pipeline in page["pipelines"]:
-                pipeline_name = pipeline["name"].lower()
-                if "lenslate" in pipeline_name:
-                    project_pipelines.append(
-                        {
-                            "name": pipeline["name"],
-                            "version": pipeline.get("version", 1),
-                            "created": pipeline.get("created", "Unknown"),
-                            "updated": pipeline.get("updated", "Unknown"),
-                        }
-                    )
+    if not project_distributions:
+        print("   📂 No project CloudFront distributions found")
+        return True, []
 
-        # List all CodeBuild projects and filter for project builds
-        paginator_build = codebuild_client.get_paginator("list_projects")
-        pages_build = paginator_build.paginate()
+    print(f"   📋 Found {len(project_distributions)} project distributions:")
+    for dist in project_distributions:
+        print(f"      - {dist['Id']} ({dist['Comment']})")
 
-        for page in pages_build:
-            for project_name in page["projects"]:
-                if "lenslate" in project_name.lower():
-                    project_builds.append(project_name)
+    print()
+    success_count = 0
+    distribution_ids = []
 
-        all_resources = project_pipelines + [
-            {"name": build, "type": "CodeBuild"} for build in project_builds
-        ]
+    for distribution in project_distributions:
+        distribution_id = distribution["Id"]
 
-        if not all_resources:
-            print("   📂 No project CodePipeline/CodeBuild resources found")
-            return True
+        try:
+            # Get current distribution config
+            response = cf_client.get_distribution_config(Id=distribution_id)
+            config = response["DistributionConfig"]
+
+            if config["Enabled"]:
+                print(f"   🔄 Disabling distribution: {distribution_id}")
+                config["Enabled"] = False
+
+                # Update the distribution to disable it
+                cf_client.update_distribution(
+                    Id=distribution_id,
+                    DistributionConfig=config,
+                    IfMatch=response["ETag"],
+                )
+                print(
+                    f"   ⏳ Distribution {distribution_id} is being disabled. This may take several minutes..."
+                )
+            else:
+                print(f"   ℹ️  Distribution {distribution_id} is already disabled")
+
+            distribution_ids.append(distribution_id)
+            success_count += 1
 
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            if error_code == "NoSuchDistribution":
+                print(f"   ⚠️  Distribution {distribution_id} does not exist")
+                success_count += 1
+            else:
+                print(f"   ❌ Error disabling distribution {distribution_id}: {e}")
+        except Exception as e:
+            print(
+                f"   ❌ Unexpected error disabling distribution {distribution_id}: {e}"
+            )
+
+    if success_count == len(project_distributions):
+        print(f"✅ Successfully disabled {success_count} CloudFront distributions")
+        return True, distribution_ids
+    else:
         print(
-            f"   📋 Found {len(project_pipelines)} pipelines and {len(project_builds)} build projects:"
+            f"⚠️ Disabled {success_count}/{len(project_distributions)} CloudFront distributions with some errors"
         )
-        for pipeline in project_pipelines:
-            print(f"      - Pipeline: {pipeline['name']} (v{pipeline['version']})")
-        for build in project_builds:
-            print(f"      - Build Project: {build}")
+        return False, distribution_ids
 
-        print()
-        success_count = 0
 
-        # Delete CodePipeline pipelines
-        for pipeline in project_pipelines:
-            try:
-                pipeline_name = pipeline["name"]
-                print(f"   🗑️  Deleting pipeline: {pipeline_name}")
-                codepipeline_client.delete_pipeline(name=pipeline_name)
-                print(f"   ✅ Successfully deleted pipeline: {pipeline_name}")
+def delete_cloudfront_distributions(distribution_ids):
+    """Delete project CloudFront distributions that have finished disabling"""
+    print("🧹 Deleting disabled CloudFront distributions...")
+
+    if not distribution_ids:
+        print("   📂 No CloudFront distributions to delete")
+        return True
+
+    cf_client = _client("cloudfront")
+    success_count = 0
+    still_disabling = False
+
+    for distribution_id in distribution_ids:
+        try:
+            response = cf_client.get_distribution(Id=distribution_id)
+            distribution = response["Distribution"]
+
+            if (
+                distribution["DistributionConfig"]["Enabled"]
+                or distribution["Status"] != "Deployed"
+            ):
+                print(
+                    f"   ⚠️  Distribution {distribution_id} is still being disabled. Please wait and try again later."
+                )
+                still_disabling = True
+                # Count as success since we initiated the disable process
                 success_count += 1
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "Unknown")
-                if error_code == "PipelineNotFoundException":
-                    print(f"   ⚠️  Pipeline {pipeline_name} does not exist")
-                    success_count += 1
-                else:
-                    print(f"   ❌ Error deleting pipeline {pipeline_name}: {e}")
-            except Exception as e:
-                print(f"   ❌ Unexpected error deleting pipeline {pipeline_name}: {e}")
+                continue
 
-        # Delete CodeBuild projects
-        for build_name in project_builds:
-            try:
-                print(f"   🗑️  Deleting build project: {build_name}")
-                codebuild_client.delete_project(name=build_name)
-                print(f"   ✅ Successfully deleted build project: {build_name}")
+            print(f"   🗑️  Deleting distribution: {distribution_id}")
+            cf_client.delete_distribution(Id=distribution_id, IfMatch=response["ETag"])
+            print(f"   ✅ Successfully deleted distribution: {distribution_id}")
+            success_count += 1
+
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            if error_code == "NoSuchDistribution":
+                print(f"   ⚠️  Distribution {distribution_id} does not exist")
                 success_count += 1
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "Unknown")
-                if error_code == "ResourceNotFoundException":
-                    print(f"   ⚠️  Build project {build_name} does not exist")
-                    success_count += 1
-                else:
-                    print(f"   ❌ Error deleting build project {build_name}: {e}")
-            except Exception as e:
+            elif error_code == "DistributionNotDisabled":
                 print(
-                    f"   ❌ Unexpected error deleting build project {build_name}: {e}"
+                    f"   ⚠️  Distribution {distribution_id} is still being disabled. Please wait and try again later."
                 )
-
-        total_resources = len(project_pipelines) + len(project_builds)
-        if success_count == total_resources:
+                still_disabling = True
+                success_count += 1
+            else:
+                print(f"   ❌ Error deleting distribution {distribution_id}: {e}")
+        except Exception as e:
             print(
-                f"✅ Successfully cleaned {success_count} CodePipeline/CodeBuild resources"
+                f"   ❌ Unexpected error deleting distribution {distribution_id}: {e}"
             )
-            return True
-        else:
+
+    if success_count == len(distribution_ids):
+        print(f"✅ Successfully processed {success_count} CloudFront distributions")
+        if still_disabling:
             print(
-                f"⚠️ Cleaned {success_count}/{total_resources} CodePipeline/CodeBuild resources with some errors"
+                "ℹ️  Note: Some distributions may still be disabling. Check AWS Console and re-run cleanup if needed."
             )
-            return False
-
-    except ClientError as e:
-        print(f"❌ Error listing CodePipeline/CodeBuild resources: {e}")
+        return True
+    else:
+        print(
+            f"⚠️ Processed {success_count}/{len(distribution_ids)} CloudFront distributions with some errors"
+        )
         return False
 
 
 def clean_cloudfront_distributions():
     """Clean CloudFront distributions associated with the project"""
-    print("🧹 Finding and cleaning CloudFront distributions...")
+    disable_success, distribution_ids = disable_cloudfront_distributions()
+    delete_success = delete_cloudfront_distributions(distribution_ids)
+    return disable_success and delete_success
 
-    cf_client = boto3.client("cloudfront")
-    project_distributions = []
 
-    try:
-        # List all distributions and filter for project distributions
-        paginator = cf_client.get_paginator("list_distributions")
-        pages = paginator.paginate()
+def _run_cleanup_wave(executor, stages):
+    """Run independent cleanup stages concurrently and return their results in order"""
+    futures = [executor.submit(stage) for stage in stages]
+    return [future.result() for future in futures]
 
-        for page in pages:
-            if "Items" in page["DistributionList"]:
-                for distribution in page["DistributionList"]["Items"]:
-                    distribution_id = distribution["Id"]
-                    # Check if this distribution belongs to lenslate project
-                    # We can check the comment, origins, or tags, or specific known IDs
-                    try:
-                        # Get detailed info about the distribution
-                        detail_response = cf_client.get_distribution(Id=distribution_id)
-                        distribution_config = detail_response["Distribution"][
-                            "DistributionConfig"
-                        ]
 
-                        # Check comment for project name
-                        comment = distribution_config.get("Comment", "").lower()
-
-                        # Check origins for S3 buckets that might contain project name
-                        origins_match = False
-                        for origin in distribution_config["Origins"]["Items"]:
-                            origin_domain = origin["DomainName"].lower()
-                            if "lenslate" in origin_domain:
-                                origins_match = True
-                                break
-
-                        # Also check for known distribution IDs
-                        known_distribution_ids = [
-                            "E2NOVZN5F0GP7Y"
-                        ]  # Add known project distribution IDs here
-
-                        if (
-                            "lenslate" in comment
-                            or origins_match
-                            or distribution_id in known_distribution_ids
-                        ):
-                            project_distributions.append(
-                                {
-                                    "Id": distribution_id,
-                                    "Comment": distribution_config.get("Comment", ""),
-                                    "Status": distribution["Status"],
-                                    "ETag": detail_response["ETag"],
-                                }
-                            )
-                    except ClientError as e:
-                        # If we can't get details, skip this distribution
-                        print(
-                            f"   ⚠️  Could not get details for distribution {distribution_id}: {e}"
-                        )
-                        continue
-
-        if not project_distributions:
-            print("   📂 No project CloudFront distributions found")
-            return True
+def clean_remaining_aws_resources():
+    """Clean all remaining project AWS resources in dependency-ordered waves
 
-        print(f"   📋 Found {len(project_distributions)} project distributions:")
-        for dist in project_distributions:
-            print(f"      - {dist['Id']} ({dist['Comment']})")
+    Stages inside a wave do not depend on each other and run concurrently.
+    CloudFront distributions are disabled in the first wave so the slow
+    disable propagation overlaps with the second wave, and CloudFormation
+    stacks are cleaned last because they may own other resources.
 
-        print()
-        success_count = 0
-        has_enabled_distributions = False
+    Returns:
+        List of success flags, one per cleanup stage
+    """
+    # Start from a fresh tag query, earlier runs may have deleted resources
+    discover_tagged_resources.cache_clear()
 
-        for distribution in project_distributions:
-            distribution_id = distribution["Id"]
-
-            try:
-                # First, disable the distribution if it's enabled
-                print(f"   🔄 Checking status of distribution: {distribution_id}")
-
-                # Get current distribution config
-                response = cf_client.get_distribution_config(Id=distribution_id)
-                config = response["DistributionConfig"]
-                current_etag = response["ETag"]
-
-                if config["Enabled"]:
-                    has_enabled_distributions = True
-                    print(f"   🔄 Disabling distribution: {distribution_id}")
-                    config["Enabled"] = False
-
-                    # Update the distribution to disable it
-                    cf_client.update_distribution(
-                        Id=distribution_id,
-                        DistributionConfig=config,
-                        IfMatch=current_etag,
-                    )
-
-                    print(
-                        f"   ⏳ Distribution {distribution_id} is being disabled. This may take several minutes..."
-                    )
-                    print(
-                        "   ℹ️  You may need to wait for the distribution to be disabled before it can be deleted."
-                    )
-                    print(
-                        "   ℹ️  Status will change from 'Deployed' to 'Disabled' - you can check AWS Console."
-                    )
-                    success_count += 1
-                else:
-                    print(
-                        f"   🗑️  Distribution {distribution_id} is already disabled, attempting deletion..."
-                    )
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        # 1. CodePipeline/CodeBuild and CloudFront disabling (slow, start early),
+        #    plus the tag query the second wave reads its resources from
+        codepipeline_success, (cloudfront_disable_success, distribution_ids), _ = (
+            _run_cleanup_wave(
+                executor,
+                [
+                    clean_codepipeline_resources,
+                    disable_cloudfront_distributions,
+                    discover_tagged_resources,
+                ],
+            )
+        )
 
-                    # Try to delete the disabled distribution
-                    try:
-                        cf_client.delete_distribution(
-                            Id=distribution_id, IfMatch=current_etag
-                        )
-                        print(
-                            f"   ✅ Successfully deleted distribution: {distribution_id}"
-                        )
-                        success_count += 1
-                    except ClientError as delete_error:
-                        delete_error_code = delete_error.response.get("Error", {}).get(
-                            "Code", "Unknown"
-                        )
-                        if delete_error_code == "DistributionNotDisabled":
-                            print(
-                                f"   ⚠️  Distribution {distribution_id} is still being disabled. Please wait and try again later."
-                            )
-                            success_count += 1  # Count as success since we initiated the disable process
-                        else:
-                            print(
-                                f"   ❌ Error deleting distribution {distribution_id}: {delete_error}"
-                            )
+        # 2. Independent resources
+        wave_results = _run_cleanup_wave(
+            executor,
+            [
+                clean_api_gateway,
+                clean_lambda_functions,
+                clean_cognito_resources,
+                clean_all_s3_buckets,
+                clean_all_dynamodb_tables,
+                clean_ec2_instances,
+                clean_cloudwatch_logs,
+            ],
+        )
 
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "Unknown")
-                if error_code == "NoSuchDistribution":
-                    print(f"   ⚠️  Distribution {distribution_id} does not exist")
-                    success_count += 1
-                else:
-                    print(f"   ❌ Error with distribution {distribution_id}: {e}")
-            except Exception as e:
-                print(
-                    f"   ❌ Unexpected error with distribution {distribution_id}: {e}"
-                )
+    # 3. CloudFront deletion once the distributions had time to disable
+    cloudfront_delete_success = delete_cloudfront_distributions(distribution_ids)
 
-        if success_count == len(project_distributions):
-            print(f"✅ Successfully processed {success_count} CloudFront distributions")
-            if has_enabled_distributions:
-                print(
-                    "ℹ️  Note: Some distributions may still be disabling. Check AWS Console and re-run cleanup if needed."
-                )
-            return True
-        else:
-            print(
-                f"⚠️ Processed {success_count}/{len(project_distributions)} CloudFront distributions with some errors"
-            )
-            return False
+    # 4. CloudFormation stacks last (may contain other resources)
+    cf_success = clean_cloudformation_stacks()
 
-    except ClientError as e:
-        print(f"❌ Error listing CloudFront distributions: {e}")
-        return False
+    return [
+        codepipeline_success,
+        cloudfront_disable_success,
+        *wave_results,
+        cloudfront_delete_success,
+        cf_success,
+    ]
 
 
 if __name__ == "__main__":
@@ -1452,41 +1605,16 @@ if __name__ == "__main__":
             print("\n🏗️  TERRAFORM DESTROY...")
             terraform_destroy_success = execute_terraform_stack_destruction()
 
+            # Open connections to all AWS services before cleaning them
+            prewarm_aws_clients()
+
             # Clean tracked resources first (more targeted)
             print("\n📋 CLEANING TRACKED RESOURCES...")
             tracked_success = clean_tracked_resources()
 
             # Clean remaining AWS resources
             print("\n☁️  CLEANING REMAINING AWS RESOURCES...")
-            # 1. CodePipeline and CodeBuild (should be cleaned early)
-            codepipeline_success = clean_codepipeline_resources()
-
-            # 2. CloudFront (needs to be disabled first, takes time)
-            cloudfront_success = clean_cloudfront_distributions()
-
-            # 3. API Gateway
-            api_gateway_success = clean_api_gateway()
-
-            # 4. Lambda functions
-            lambda_success = clean_lambda_functions()
-
-            # 5. Cognito (user and identity pools)
-            cognito_success = clean_cognito_resources()
-
-            # 6. S3 buckets
-            s3_success = clean_all_s3_buckets()
-
-            # 7. DynamoDB tables
-            db_success = clean_all_dynamodb_tables()
-
-            # 8. EC2 instances
-            ec2_success = clean_ec2_instances()
-
-            # 9. CloudWatch log groups
-            cloudwatch_success = clean_cloudwatch_logs()
-
-            # Clean CloudFormation stacks last (may contain other resources)
-            cf_success = clean_cloudformation_stacks()
+            aws_results = clean_remaining_aws_resources()
 
             print("\n" + "=" * 60)
             if all(
@@ -1495,16 +1623,7 @@ if __name__ == "__main__":
                     zip_success,
                     terraform_destroy_success,
                     tracked_success,
-                    codepipeline_success,
-                    cloudfront_success,
-                    api_gateway_success,
-                    lambda_success,
-                    cognito_success,
-                    s3_success,
-                    db_success,
-                    ec2_success,
-                    cloudwatch_success,
-                    cf_success,
+                    *aws_results,
                 ]
             ):
                 print("🎉 FULL CLEANUP COMPLETED SUCCESSFULLY!")
@@ -1536,57 +1655,22 @@ if __name__ == "__main__":
             print("\n🏗️  TERRAFORM DESTROY...")
             terraform_destroy_success = execute_terraform_stack_destruction()
 
+            # Open connections to all AWS services before cleaning them
+            prewarm_aws_clients()
+
             # Clean tracked resources
             print("\n📋 CLEANING TRACKED RESOURCES...")
             tracked_success = clean_tracked_resources()
 
-            # AWS cleanup
+            # Clean remaining AWS resources
             print("\n☁️  CLEANING REMAINING AWS RESOURCES...")
-
-            # 1. CodePipeline and CodeBuild (should be cleaned early)
-            codepipeline_success = clean_codepipeline_resources()
-
-            # 2. CloudFront (needs to be disabled first, takes time)
-            cloudfront_success = clean_cloudfront_distributions()
-
-            # 3. API Gateway
-            api_gateway_success = clean_api_gateway()
-
-            # 4. Lambda functions
-            lambda_success = clean_lambda_functions()
-
-            # 5. Cognito (user and identity pools)
-            cognito_success = clean_cognito_resources()
-
-            # 6. S3 buckets
-            s3_success = clean_all_s3_buckets()
-
-            # 7. DynamoDB tables
-            db_success = clean_all_dynamodb_tables()
-
-            # 8. EC2 instances
-            ec2_success = clean_ec2_instances()
-
-            # 9. CloudWatch log groups
-            cloudwatch_success = clean_cloudwatch_logs()
-
-            # Clean CloudFormation stacks last (may contain other resources)
-            cf_success = clean_cloudformation_stacks()
+            aws_results = clean_remaining_aws_resources()
 
             if all(
                 [
                     terraform_destroy_success,
                     tracked_success,
-                    codepipeline_success,
-                    cloudfront_success,
-                    api_gateway_success,
-                    lambda_success,
-                    cognito_success,
-                    s3_success,
-                    db_success,
-                    ec2_success,
-                    cloudwatch_success,
-                    cf_success,
+                    *aws_results,
                 ]
             ):
                 print("\n🎉 AWS resources cleanup completed successfully!")
@@ -4,52 +4,131 @@ Generate resource manifest for deployed resources.
 Run this after deployment to create tracking files for easy cleanup.
 """
 
-import subprocess
+import json
+import os
 import sys
+import tempfile
+import time
 from pathlib import Path
 
+import boto3
+
 from deployment_logic.progress_indicator import ProgressIndicator
 from deployment_logic.resource_naming import ResourceNameGenerator
 from deployment_logic.resource_tracker import ResourceTracker
 
+AWS_INFO_CACHE_FILE = Path.home() / ".cache" / "aws-image-translate" / "aws_info.json"
+AWS_INFO_CACHE_TTL = 3600  # seconds
+
+# Write buffer for the generated files, large enough to hold each one whole
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+def _read_aws_info_cache(cache_key, ttl):
+    """Return cached (account_id, region) for a cache key, or None if missing/stale
+
+    Each entry carries its own fetch time, since writing one key rewrites the
+    whole file and would make the file's mtime vouch for every other key.
+    """
+    try:
+        with open(AWS_INFO_CACHE_FILE, "r", encoding="utf-8") as f:
+            entry = json.load(f).get(cache_key)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+    if not entry or not entry.get("account_id") or not entry.get("region"):
+        return None
+    # Entries written before fetched_at existed count as stale
+    if time.time() - entry.get("fetched_at", 0) > ttl:
+        return None
+    return entry["account_id"], entry["region"]
+
+
+def _write_aws_info_cache(cache_key, account_id, region):
+    """Persist (account_id, region) for a cache key, replacing the file atomically"""
+    try:
+        with open(AWS_INFO_CACHE_FILE, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if not isinstance(cache, dict):
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+
+    cache[cache_key] = {
+        "account_id": account_id,
+        "region": region,
+        "fetched_at": time.time(),
+    }
+
+    try:
+        AWS_INFO_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=AWS_INFO_CACHE_FILE.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, AWS_INFO_CACHE_FILE)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        # The cache is only an optimization; never fail the run because of it
+        print(f"⚠️  Could not write AWS info cache: {e}")
+
+
+def _fetch_aws_info():
+    """Look up AWS account ID and region in-process through a single boto3 session"""
+    session = boto3.Session()
+    account_id = session.client("sts").get_caller_identity()["Account"]
+    region = session.region_name or os.environ.get("AWS_DEFAULT_REGION")
+    return account_id, region
+
+
+def _aws_info_cache_key():
+    """Cache key for the active credentials.
+
+    Credentials from the environment override the profile, so they are keyed
+    by access key ID; otherwise switching accounts under one profile would
+    return the previous account.
+    """
+    access_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
+    if access_key_id:
+        return f"access-key:{access_key_id}"
+    return os.environ.get("AWS_PROFILE", "default")
+
+
+def _load_or_fetch_aws_info(ttl=AWS_INFO_CACHE_TTL):
+    """Resolve AWS account ID and region from env vars, the on-disk cache or STS
+
+    Environment variables always take precedence over cached values.
+    """
+    region = os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION")
+    account_id = os.environ.get("AWS_ACCOUNT_ID")
+    if account_id and region:
+        return account_id, region
+
+    cache_key = _aws_info_cache_key()
+    cached = _read_aws_info_cache(cache_key, ttl)
+    if cached:
+        cached_account_id, cached_region = cached
+        return account_id or cached_account_id, region or cached_region
+
+    fetched_account_id, fetched_region = _fetch_aws_info()
+    if fetched_account_id and (fetched_region or region):
+        _write_aws_info_cache(cache_key, fetched_account_id, fetched_region or region)
+    return account_id or fetched_account_id, region or fetched_region
+
 
 def get_aws_info():
-    """Get AWS account ID and region from AWS CLI"""
+    """Get AWS account ID and region, using cached values when available"""
     try:
-        # Get AWS account ID
-        result = subprocess.run(
-            [
-                "aws",
-                "sts",
-                "get-caller-identity",
-                "--query",
-                "Account",
-                "--output",
-                "text",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if result.returncode != 0:
+        account_id, region = _load_or_fetch_aws_info()
+        if not account_id:
             print("❌ Failed to get AWS account ID. Make sure AWS CLI is configured.")
             return None, None
-
-        account_id = result.stdout.strip()
-
-        # Get AWS region
-        result = subprocess.run(
-            ["aws", "configure", "get", "region"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if result.returncode != 0:
+        if not region:
             print("❌ Failed to get AWS region. Make sure AWS CLI is configured.")
             return None, None
 
-        region = result.stdout.strip()
-
         return account_id, region
 
     except Exception as e:
@@ -98,7 +177,9 @@ def main():
     cleanup_file = root_dir / "cleanup_resources.py"
 
     try:
-        with open(cleanup_file, "w", encoding="utf-8") as f:
+        with open(
+            cleanup_file, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE
+        ) as f:
             f.write(cleanup_script)
         print(f"✅ Cleanup script saved to: {cleanup_file}")
     except Exception as e:
@@ -111,7 +192,9 @@ def main():
     summary_file = root_dir / "deployed_resources.md"
 
     try:
-        with open(summary_file, "w", encoding="utf-8") as f:
+        with open(
+            summary_file, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE
+        ) as f:
             f.write(summary)
         print(f"✅ Resource summary saved to: {summary_file}")
     except Exception as e:
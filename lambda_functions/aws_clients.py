@@ -4,26 +4,65 @@ This module provides centralized AWS client initialization with
 connection pooling, retry logic, and performance monitoring.
 """
 
+import atexit
 import json
 import os
+import threading
 import time
-from datetime import datetime, timedelta
-from functools import lru_cache
-from typing import Any, Dict, List, Optional
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+# reddit_populator installs orjson from requirements.txt, the other functions
+# get it from the orjson layer (prepare_orjson_layer.py)
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import amazondax
+
+    DAX_AVAILABLE = True
+except ImportError:
+    DAX_AVAILABLE = False
+
 # Environment-based configuration
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 S3_BUCKET = os.environ.get("S3_BUCKET", "lenslate-image-storage")
 PERFORMANCE_TABLE = os.environ.get("PERFORMANCE_TABLE", "lenslate-performance-metrics")
+# Optional DAX cluster endpoint for dashboard metrics reads
+DAX_ENDPOINT = os.environ.get("DAX_ENDPOINT")
+
+# Dashboard time ranges: (total duration, bucket interval)
+METRICS_TIME_RANGES = {
+    "1h": (timedelta(hours=1), timedelta(minutes=5)),
+    "6h": (timedelta(hours=6), timedelta(minutes=30)),
+    "24h": (timedelta(hours=24), timedelta(hours=2)),
+    "7d": (timedelta(days=7), timedelta(days=1)),
+}
+
+# Aggregated metrics are cached for half a bucket interval, at most this many entries
+AGGREGATED_METRICS_CACHE_SIZE = 64
+
+# Queued metrics snapshots are written early once this many are pending (the
+# BatchWriteItem limit); otherwise flush_metrics_on_return writes them
+METRICS_FLUSH_BATCH_SIZE = 25
 
 # Client configuration
 OPTIMIZED_CONFIG = Config(
     retries={"max_attempts": 3, "mode": "adaptive"},
-    max_pool_connections=50,
+    # Batch image requests run at most MAX_BATCH_IMAGES (10) calls at once
+    max_pool_connections=10,
     region_name=AWS_REGION,
     # Enable connection reuse
     parameter_validation=False,  # Skip client-side validation
@@ -34,35 +73,164 @@ OPTIMIZED_CONFIG = Config(
     read_timeout=10,
 )
 
+# One session shared by every client, so credentials and service models are
+# resolved once per container instead of once per client
+_session = boto3.Session()
+_session_lock = threading.Lock()
+
+
+def _add_keep_alive_header(request, **kwargs):
+    """Ask AWS endpoints to keep the connection open for the next request."""
+    request.headers["Connection"] = "keep-alive"
+
+
+# Registered on the session so every client created from it inherits the hook
+_session.events.register("request-created", _add_keep_alive_header)
+
+
+# One client per service for the lifetime of the container
+_clients: Dict[str, Any] = {}
+
+
+def _get_client(service_name: str):
+    """Get the process-wide client for a service, creating it on first use.
+
+    Session.client is not thread-safe, so creation is serialized and checked
+    again under the lock; every thread then gets the same client. Lookups after
+    creation are a plain dict read without locking.
+    """
+    client = _clients.get(service_name)
+    if client is None:
+        with _session_lock:
+            client = _clients.get(service_name)
+            if client is None:
+                client = _session.client(service_name, config=OPTIMIZED_CONFIG)
+                _clients[service_name] = client
+    return client
+
+
+# Idle pooled connections are dropped this often (seconds) on long-lived warm
+# containers, so sockets the server half-closed do not pile up in CLOSE_WAIT
+CONNECTION_RECYCLE_INTERVAL = 3600
+_last_connection_recycle = time.monotonic()
+
+
+def _recycle_idle_connections() -> None:
+    """Close every client's idle pooled connections once per recycle interval."""
+    global _last_connection_recycle
+    now = time.monotonic()
+    if now - _last_connection_recycle < CONNECTION_RECYCLE_INTERVAL:
+        return
+    with _session_lock:
+        if now - _last_connection_recycle < CONNECTION_RECYCLE_INTERVAL:
+            return
+        _last_connection_recycle = now
+        clients = list(_clients.values())
+
+    for client in clients:
+        try:
+            # Connections currently in use are closed when they are returned
+            client._endpoint.http_session._manager.clear()
+        except AttributeError:
+            # Not a botocore client with a urllib3 pool (e.g. DAX)
+            pass
+
+
+def json_dumps(obj: Any, default: Optional[Any] = None) -> str:
+    """Serialize to a compact JSON string, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=default).decode("utf-8")
+    return json.dumps(obj, default=default, separators=(",", ":"))
+
+
+def json_dumpb(obj: Any, default: Optional[Any] = None) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes, skipping orjson's str decode."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=default)
+    return json.dumps(obj, default=default, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(data: Any) -> Any:
+    """Parse a JSON string or bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_operations(operations_json: Union[bytes, str]) -> Dict[str, bytes]:
+    """Build the DynamoDB attribute for a serialized operations blob.
+
+    The blob is most of a metrics item, so it is stored zlib-compressed as a
+    binary attribute; level 1 already gets most of the size reduction.
+    """
+    if isinstance(operations_json, str):
+        operations_json = operations_json.encode("utf-8")
+    return {"B": zlib.compress(operations_json, 1)}
+
+
+def decode_operations(attribute: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse an operations attribute, compressed ("B") or legacy plain JSON ("S")."""
+    if "B" in attribute:
+        return json_loads(zlib.decompress(attribute["B"]))
+    return json_loads(attribute["S"])
+
 
-@lru_cache(maxsize=None)
 def get_rekognition_client():
     """Get optimized Rekognition client with connection pooling."""
-    return boto3.client("rekognition", config=OPTIMIZED_CONFIG)
+    return _get_client("rekognition")
 
 
-@lru_cache(maxsize=None)
 def get_comprehend_client():
     """Get optimized Comprehend client with connection pooling."""
-    return boto3.client("comprehend", config=OPTIMIZED_CONFIG)
+    return _get_client("comprehend")
 
 
-@lru_cache(maxsize=None)
 def get_translate_client():
     """Get optimized Translate client with connection pooling."""
-    return boto3.client("translate", config=OPTIMIZED_CONFIG)
+    return _get_client("translate")
 
 
-@lru_cache(maxsize=None)
 def get_s3_client():
     """Get optimized S3 client with connection pooling."""
-    return boto3.client("s3", config=OPTIMIZED_CONFIG)
+    return _get_client("s3")
+
+
+def get_frozen_credentials():
+    """Snapshot the shared session's credentials, or None if none are configured."""
+    credentials = _session.get_credentials()
+    return credentials.get_frozen_credentials() if credentials else None
 
 
-@lru_cache(maxsize=None)
 def get_dynamodb_client():
     """Get optimized DynamoDB client with connection pooling."""
-    return boto3.client("dynamodb", config=OPTIMIZED_CONFIG)
+    return _get_client("dynamodb")
+
+
+def get_cognito_idp_client():
+    """Get optimized Cognito Identity Provider client with connection pooling."""
+    return _get_client("cognito-idp")
+
+
+def get_metrics_read_client():
+    """Get the client used for dashboard metrics queries.
+
+    Uses a DAX client when DAX_ENDPOINT is set and the amazondax package is
+    installed, so repeated dashboard queries are answered from the DAX query
+    cache; otherwise the regular DynamoDB client.
+    """
+    if not (DAX_ENDPOINT and DAX_AVAILABLE):
+        return get_dynamodb_client()
+
+    client = _clients.get("dax")
+    if client is None:
+        with _session_lock:
+            client = _clients.get("dax")
+            if client is None:
+                client = amazondax.AmazonDaxClient(
+                    session=_session, region_name=AWS_REGION, endpoint_url=DAX_ENDPOINT
+                )
+                _clients["dax"] = client
+    return client
 
 
 def safe_rekognition_call(operation, *args, **kwargs):
@@ -95,37 +263,78 @@ def safe_dynamodb_call(operation, *args, **kwargs):
     return getattr(client, operation)(*args, **kwargs)
 
 
+# Shared pool for fanning out independent AWS calls from a handler
+_call_executor = ThreadPoolExecutor(max_workers=8)
+
+
+def gather_calls(*calls: Callable[[], Any]) -> List[Any]:
+    """Run independent AWS calls concurrently and return their results in order.
+
+    Each call is a zero-argument callable, e.g.
+    ``lambda: safe_s3_call("head_object", Bucket=b, Key=k)``. Clients are
+    shared and thread-safe, so the calls overlap their round-trips and the
+    total wait is the slowest call rather than the sum. The first exception
+    raised by any call is re-raised.
+    """
+    if len(calls) == 1:
+        return [calls[0]()]
+    futures = [_call_executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+
+# Recent get_aggregated_metrics results, least recently used first. Shared by
+# every PerformanceMonitor because handlers create a fresh one per request
+_aggregate_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_aggregate_cache_lock = threading.Lock()
+
+
 # Performance monitoring
 class PerformanceMonitor:
     """Monitor Lambda performance metrics."""
 
     def __init__(self, function_name: Optional[str] = None):
         self.start_time = time.time()
-        self.metrics = {}
+        # Per-operation counters kept as parallel flat dicts; the nested
+        # per-operation dicts are only built when metrics are read out
+        self._calls: Dict[str, int] = {}
+        self._durations: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        # Operations can be recorded from several threads (batch image requests)
+        self._lock = threading.Lock()
+        # Snapshots waiting to be written by flush()
+        self._pending: List[Dict[str, Any]] = []
         self.function_name = function_name or os.environ.get(
             "AWS_LAMBDA_FUNCTION_NAME", "unknown"
         )
 
     def record_operation(self, operation: str, duration: float, success: bool = True):
         """Record operation performance."""
-        if operation not in self.metrics:
-            self.metrics[operation] = {
-                "total_calls": 0,
-                "total_duration": 0,
-                "failures": 0,
-                "avg_duration": 0,
+        with self._lock:
+            self._calls[operation] = self._calls.get(operation, 0) + 1
+            self._durations[operation] = self._durations.get(operation, 0) + duration
+            failures = self._failures.get(operation, 0)
+            self._failures[operation] = failures if success else failures + 1
+        _recycle_idle_connections()
+
+    def _build_metrics(self) -> Dict[str, Dict[str, Any]]:
+        # Callers must hold self._lock
+        durations = self._durations
+        failures = self._failures
+        return {
+            operation: {
+                "total_calls": calls,
+                "total_duration": durations[operation],
+                "failures": failures[operation],
+                "avg_duration": durations[operation] / calls,
             }
+            for operation, calls in self._calls.items()
+        }
 
-        self.metrics[operation]["total_calls"] += 1
-        self.metrics[operation]["total_duration"] += duration
-
-        if not success:
-            self.metrics[operation]["failures"] += 1
-
-        self.metrics[operation]["avg_duration"] = (
-            self.metrics[operation]["total_duration"]
-            / self.metrics[operation]["total_calls"]
-        )
+    @property
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-operation metrics keyed by operation name."""
+        with self._lock:
+            return self._build_metrics()
 
     def get_metrics(self) -> Dict[str, Any]:
         """Get performance metrics."""
@@ -136,49 +345,52 @@ class PerformanceMonitor:
         }
 
     def persist_metrics(self) -> bool:
-        """Store current metrics to DynamoDB with timestamp and TTL.
+        """Queue a snapshot of the current metrics for DynamoDB.
+
+        Snapshots are written together by flush(), which flush_metrics_on_return
+        calls once per invocation, so every snapshot an invocation takes shares
+        one BatchWriteItem. A full batch of METRICS_FLUSH_BATCH_SIZE is written
+        right away.
 
         Returns:
-            bool: True if persistence was successful, False otherwise
+            bool: True once the snapshot is queued
         """
-        try:
-            current_time = datetime.utcnow()
-            timestamp = current_time.isoformat() + "Z"
+        now = time.time()
+        with self._lock:
+            # Serialized right away: it both snapshots the live metrics and is
+            # the only serialization the snapshot ever needs
+            self._pending.append(
+                {
+                    "function_name": self.function_name,
+                    "timestamp": datetime.utcfromtimestamp(now).isoformat() + "Z",
+                    "ts_epoch": int(now),
+                    "total_execution_time": now - self.start_time,
+                    "operations": json_dumpb(self._build_metrics()),
+                }
+            )
+            should_flush = len(self._pending) >= METRICS_FLUSH_BATCH_SIZE
 
-            # Calculate TTL (7 days from now)
-            ttl_date = current_time + timedelta(days=7)
-            ttl_timestamp = int(ttl_date.timestamp())
+        if should_flush:
+            self.flush()
+        return True
 
-            # Prepare the item for DynamoDB
-            item = {
-                "PK": {"S": f"PERF#{self.function_name}#{timestamp}"},
-                "SK": {"S": "METRICS"},
-                "GSI1PK": {"S": "METRICS"},  # Static key for the new GSI
-                "function_name": {"S": self.function_name},
-                "timestamp": {"S": timestamp},
-                "total_execution_time": {
-                    "N": str(self.get_metrics()["total_execution_time"])
-                },
-                "operations": {"S": json.dumps(self.metrics)},
-                "ttl": {"N": str(ttl_timestamp)},
-            }
+    def flush(self) -> bool:
+        """Write all queued metrics snapshots to DynamoDB.
 
-            # Store to DynamoDB
-            safe_dynamodb_call("put_item", TableName=PERFORMANCE_TABLE, Item=item)
-            return True
+        Returns:
+            bool: True if every queued snapshot was written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
 
-        except ClientError as e:
-            print(f"Error persisting metrics to DynamoDB: {e}")
-            return False
-        except Exception as e:
-            print(f"Unexpected error persisting metrics: {e}")
-            return False
+        return self.batch_persist_metrics(pending)
 
     def batch_persist_metrics(self, metrics_list: List[Dict[str, Any]]) -> bool:
         """Batch write multiple metrics to DynamoDB for efficiency.
 
         Args:
-            metrics_list: List of metrics dictionaries to persist
+            metrics_list: List of metrics dictionaries to persist, "operations"
+                may already be serialized to JSON bytes or a string
 
         Returns:
             bool: True if all items were successfully written, False otherwise
@@ -187,39 +399,45 @@ class PerformanceMonitor:
             if not metrics_list:
                 return True
 
-            # Prepare batch write request
+            # Prepare batch write request. Everything that does not depend on
+            # the snapshot is computed once for the whole batch
             request_items = []
             current_time = datetime.utcnow()
-            ttl_date = current_time + timedelta(days=7)
-            ttl_timestamp = int(ttl_date.timestamp())
+            default_timestamp = current_time.isoformat() + "Z"
+            default_ts_epoch = int(
+                current_time.replace(tzinfo=timezone.utc).timestamp()
+            )
+            ttl_timestamp = int((current_time + timedelta(days=7)).timestamp())
+            common_fields = {
+                "SK": {"S": "METRICS"},
+                "GSI1PK": {"S": "METRICS"},  # Static key for the new GSI
+                "ttl": {"N": str(ttl_timestamp)},
+            }
 
-            for metrics_data in metrics_list:
-                timestamp = current_time.isoformat() + "Z"
+            for index, metrics_data in enumerate(metrics_list):
+                function_name = metrics_data.get("function_name", self.function_name)
+                timestamp = metrics_data.get("timestamp") or default_timestamp
+                ts_epoch = metrics_data.get("ts_epoch") or default_ts_epoch
+                operations = metrics_data.get("operations", {})
+                if not isinstance(operations, (bytes, str)):
+                    operations = json_dumpb(operations)
+                # The index suffix keeps snapshots that share a timestamp from
+                # colliding (BatchWriteItem rejects duplicate keys in one request)
                 item = {
-                    "PutRequest": {
-                        "Item": {
-                            "PK": {
-                                "S": f"PERF#{metrics_data.get('function_name', self.function_name)}#{timestamp}"
-                            },
-                            "SK": {"S": "METRICS"},
-                            "GSI1PK": {"S": "METRICS"},  # Static key for the new GSI
-                            "function_name": {
-                                "S": metrics_data.get(
-                                    "function_name", self.function_name
-                                )
-                            },
-                            "timestamp": {"S": timestamp},
-                            "total_execution_time": {
-                                "N": str(metrics_data.get("total_execution_time", 0))
-                            },
-                            "operations": {
-                                "S": json.dumps(metrics_data.get("operations", {}))
-                            },
-                            "ttl": {"N": str(ttl_timestamp)},
-                        }
-                    }
+                    **common_fields,
+                    "PK": {"S": f"PERF#{function_name}#{timestamp}#{index:04d}"},
+                    "function_name": {"S": function_name},
+                    "timestamp": {"S": timestamp},
+                    "ts_epoch": {"N": str(ts_epoch)},
+                    "total_execution_time": {
+                        "N": str(metrics_data.get("total_execution_time", 0))
+                    },
+                    "operations": encode_operations(operations),
                 }
-                request_items.append(item)
+                request_items.append({"PutRequest": {"Item": item}})
+
+            # Bound once for the initial writes and every retry
+            batch_write_item = get_dynamodb_client().batch_write_item
 
             # Process in batches of 25 (DynamoDB limit)
             batch_size = 25
@@ -227,7 +445,7 @@ class PerformanceMonitor:
                 batch = request_items[i : i + batch_size]
                 request = {PERFORMANCE_TABLE: batch}
 
-                response = safe_dynamodb_call("batch_write_item", RequestItems=request)
+                response = batch_write_item(RequestItems=request)
 
                 # Handle unprocessed items
                 unprocessed = response.get("UnprocessedItems", {})
@@ -236,9 +454,7 @@ class PerformanceMonitor:
 
                 while unprocessed and retry_count < max_retries:
                     time.sleep(0.1 * (2**retry_count))  # Exponential backoff
-                    response = safe_dynamodb_call(
-                        "batch_write_item", RequestItems=unprocessed
-                    )
+                    response = batch_write_item(RequestItems=unprocessed)
                     unprocessed = response.get("UnprocessedItems", {})
                     retry_count += 1
 
@@ -267,25 +483,44 @@ class PerformanceMonitor:
         Returns:
             Dict containing aggregated metrics data, including time-series.
         """
+        total_duration, bucket_interval = METRICS_TIME_RANGES.get(
+            time_range, METRICS_TIME_RANGES["1h"]
+        )
+        # Repeated dashboard requests within half a bucket interval share one
+        # DynamoDB query; the time window is part of the key so entries expire
+        ttl = bucket_interval.total_seconds() / 2
+        cache_key = (time_range, function_name, int(time.time() // ttl))
+
+        with _aggregate_cache_lock:
+            cached = _aggregate_cache.get(cache_key)
+            if cached is not None:
+                _aggregate_cache.move_to_end(cache_key)
+                # Callers add their own metadata, so hand out a shallow copy
+                return dict(cached)
+
+        result = self._query_aggregated_metrics(
+            time_range, function_name, total_duration, bucket_interval
+        )
+
+        if "error" not in result:
+            with _aggregate_cache_lock:
+                _aggregate_cache[cache_key] = result
+                _aggregate_cache.move_to_end(cache_key)
+                while len(_aggregate_cache) > AGGREGATED_METRICS_CACHE_SIZE:
+                    _aggregate_cache.popitem(last=False)
+        return dict(result)
+
+    def _query_aggregated_metrics(
+        self, time_range, function_name, total_duration, bucket_interval
+    ):
         try:
-            # 1. Calculate time range and bucket size
+            # 1. Calculate time range
             now = datetime.utcnow()
-            time_deltas = {
-                "1h": (timedelta(hours=1), timedelta(minutes=5)),
-                "6h": (timedelta(hours=6), timedelta(minutes=30)),
-                "24h": (timedelta(hours=24), timedelta(hours=2)),
-                "7d": (timedelta(days=7), timedelta(days=1)),
-            }
-            total_duration, bucket_interval = time_deltas.get(
-                time_range, (timedelta(hours=1), timedelta(minutes=5))
-            )
             start_time = now - total_duration
             start_timestamp = start_time.isoformat() + "Z"
 
-            # 2. Build and execute the DynamoDB query
+            # 2. Build the DynamoDB query
             query_kwargs = self._build_query(function_name, start_timestamp)
-            response = safe_dynamodb_call("query", **query_kwargs)
-            items = response.get("Items", [])
 
             # 3. Initialize data structures
             (
@@ -299,10 +534,13 @@ class PerformanceMonitor:
             )
 
             # 4. Process items into buckets
-            for item in items:
-                self._process_item_into_buckets(
-                    item, buckets, start_time, bucket_interval
-                )
+            start_epoch = start_time.replace(tzinfo=timezone.utc).timestamp()
+            bucket_interval_seconds = bucket_interval.total_seconds()
+            for page in self._iter_query_pages(query_kwargs):
+                for item in page.get("Items", []):
+                    self._process_item_into_buckets(
+                        item, buckets, start_epoch, bucket_interval_seconds
+                    )
 
             # 5. Aggregate bucket data into summaries
             self._aggregate_buckets(
@@ -330,12 +568,47 @@ class PerformanceMonitor:
             print(f"Unexpected error retrieving aggregated metrics: {e}")
             return {"error": str(e), "time_range": time_range}
 
+    @staticmethod
+    def _query_pages(client, query_kwargs):
+        # Follows LastEvaluatedKey by hand rather than with a paginator, which
+        # works the same for DynamoDB and DAX clients
+        kwargs = dict(query_kwargs)
+        while True:
+            page = client.query(**kwargs)
+            yield page
+            last_key = page.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            kwargs["ExclusiveStartKey"] = last_key
+
+    @staticmethod
+    def _iter_query_pages(query_kwargs):
+        """Yield every page of a DynamoDB query.
+
+        A query stops at 1MB per page, so longer ranges need all pages. The
+        next page is fetched in the background while the caller aggregates
+        the current one. Queries go through DAX when it is configured.
+        """
+        pages = PerformanceMonitor._query_pages(get_metrics_read_client(), query_kwargs)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_page = executor.submit(next, pages, None)
+            while True:
+                page = next_page.result()
+                if page is None:
+                    return
+                next_page = executor.submit(next, pages, None)
+                yield page
+
     def _build_query(self, function_name, start_timestamp):
+        # Only fetch the attributes aggregation reads; the rest of each item
+        # (keys, ttl, execution totals) would just add bytes and read units
+        projection = "function_name, #ts, ts_epoch, operations"
         if function_name:
             return {
                 "TableName": PERFORMANCE_TABLE,
                 "IndexName": "function-timestamp-index",
                 "KeyConditionExpression": "#func_name = :func_name AND #ts >= :start_time",
+                "ProjectionExpression": projection,
                 "ExpressionAttributeNames": {
                     "#func_name": "function_name",
                     "#ts": "timestamp",
@@ -350,6 +623,7 @@ class PerformanceMonitor:
                 "TableName": PERFORMANCE_TABLE,
                 "IndexName": "metrics-by-time-index",
                 "KeyConditionExpression": "#gsi1pk = :gsi1pk AND #ts >= :start_time",
+                "ProjectionExpression": projection,
                 "ExpressionAttributeNames": {"#gsi1pk": "GSI1PK", "#ts": "timestamp"},
                 "ExpressionAttributeValues": {
                     ":gsi1pk": {"S": "METRICS"},
@@ -364,59 +638,75 @@ class PerformanceMonitor:
             timestamps.append(current_time.isoformat() + "Z")
             current_time += bucket_interval
 
-        buckets = {ts: {} for ts in timestamps}
+        # One bucket per timestamp, addressed by index
+        buckets = [{} for _ in timestamps]
         overall_summary = {"total_calls": 0, "total_duration": 0, "total_failures": 0}
         return buckets, timestamps, overall_summary, {}, {}
 
-    def _process_item_into_buckets(self, item, buckets, start_time, bucket_interval):
-        item_ts_str = item["timestamp"]["S"]
-        item_ts = datetime.fromisoformat(item_ts_str.replace("Z", "+00:00"))
-
-        time_diff_seconds = (item_ts - start_time).total_seconds()
-        bucket_index = int(time_diff_seconds / bucket_interval.total_seconds())
+    def _process_item_into_buckets(
+        self, item, buckets, start_epoch, bucket_interval_seconds
+    ):
+        bucket_index = int(
+            (self._item_epoch(item) - start_epoch) // bucket_interval_seconds
+        )
 
         if bucket_index < 0 or bucket_index >= len(buckets):
             return  # Item is outside our time range, skip
 
-        bucket_key = list(buckets.keys())[bucket_index]
+        bucket = buckets[bucket_index]
 
         func_name = item["function_name"]["S"]
-        operations = json.loads(item["operations"]["S"])
+        operations = decode_operations(item["operations"])
 
-        if func_name not in buckets[bucket_key]:
-            buckets[bucket_key][func_name] = {
+        # Resolve the nested dicts once per item and add each operation's
+        # counters into local references instead of re-indexing every field
+        func_bucket = bucket.get(func_name)
+        if func_bucket is None:
+            func_bucket = bucket[func_name] = {
                 "total_calls": 0,
                 "total_duration": 0,
                 "failures": 0,
                 "services": {},
             }
+        services = func_bucket["services"]
 
         for op_name, op_data in operations.items():
-            buckets[bucket_key][func_name]["total_calls"] += op_data.get(
-                "total_calls", 0
-            )
-            buckets[bucket_key][func_name]["total_duration"] += op_data.get(
-                "total_duration", 0
-            )
-            buckets[bucket_key][func_name]["failures"] += op_data.get("failures", 0)
-
-            service_name = self._extract_service_name(op_name)
-            if service_name not in buckets[bucket_key][func_name]["services"]:
-                buckets[bucket_key][func_name]["services"][service_name] = {
+            calls = op_data.get("total_calls", 0)
+            duration = op_data.get("total_duration", 0)
+            failures = op_data.get("failures", 0)
+
+            func_bucket["total_calls"] += calls
+            func_bucket["total_duration"] += duration
+            func_bucket["failures"] += failures
+
+            service_name = _service_for_operation(op_name)
+            service_bucket = services.get(service_name)
+            if service_bucket is None:
+                service_bucket = services[service_name] = {
                     "total_calls": 0,
                     "total_duration": 0,
                     "failures": 0,
                 }
+            service_bucket["total_calls"] += calls
+            service_bucket["total_duration"] += duration
+            service_bucket["failures"] += failures
 
-            service_bucket = buckets[bucket_key][func_name]["services"][service_name]
-            service_bucket["total_calls"] += op_data.get("total_calls", 0)
-            service_bucket["total_duration"] += op_data.get("total_duration", 0)
-            service_bucket["failures"] += op_data.get("failures", 0)
+    @staticmethod
+    def _item_epoch(item) -> float:
+        """Get a metrics item's time as epoch seconds.
+
+        Items written with ts_epoch need no date parsing at all; older items
+        fall back to parsing their UTC ISO timestamp.
+        """
+        if "ts_epoch" in item:
+            return float(item["ts_epoch"]["N"])
+        item_ts = datetime.fromisoformat(item["timestamp"]["S"].rstrip("Z"))
+        return item_ts.replace(tzinfo=timezone.utc).timestamp()
 
     def _aggregate_buckets(
         self, buckets, functions_summary, services_summary, overall_summary
     ):
-        for bucket_data in buckets.values():
+        for bucket_data in buckets:
             for func_name, func_bucket_data in bucket_data.items():
                 if func_name not in functions_summary:
                     functions_summary[func_name] = {
@@ -436,37 +726,36 @@ class PerformanceMonitor:
                 summary["total_failures"] += func_bucket_data["failures"]
 
                 for service_name, service_data in func_bucket_data["services"].items():
-                    if service_name not in services_summary:
-                        services_summary[service_name] = {
+                    service_summary = services_summary.get(service_name)
+                    if service_summary is None:
+                        service_summary = services_summary[service_name] = {
                             "total_calls": 0,
                             "total_duration": 0,
                             "failures": 0,
                         }
-                    services_summary[service_name]["total_calls"] += service_data[
-                        "total_calls"
-                    ]
-                    services_summary[service_name]["total_duration"] += service_data[
-                        "total_duration"
-                    ]
-                    services_summary[service_name]["failures"] += service_data[
-                        "failures"
-                    ]
+                    service_summary["total_calls"] += service_data["total_calls"]
+                    service_summary["total_duration"] += service_data["total_duration"]
+                    service_summary["failures"] += service_data["failures"]
 
     def _finalize_summaries(self, functions_summary, services_summary, overall_summary):
-        for summary in list(functions_summary.values()) + list(
-            services_summary.values()
+        # Function summaries count failures as "total_failures", service
+        # summaries as "failures"
+        for summaries, failures_key in (
+            (functions_summary, "total_failures"),
+            (services_summary, "failures"),
         ):
-            if summary["total_calls"] > 0:
-                summary["avg_response_time"] = (
-                    summary["total_duration"] / summary["total_calls"]
-                )
-                summary["success_rate"] = (
-                    (summary["total_calls"] - summary["total_failures"])
-                    / summary["total_calls"]
-                ) * 100
-            else:
-                summary["avg_response_time"] = 0
-                summary["success_rate"] = 100
+            for summary in summaries.values():
+                if summary["total_calls"] > 0:
+                    summary["avg_response_time"] = (
+                        summary["total_duration"] / summary["total_calls"]
+                    )
+                    summary["success_rate"] = (
+                        (summary["total_calls"] - summary[failures_key])
+                        / summary["total_calls"]
+                    ) * 100
+                else:
+                    summary["avg_response_time"] = 0
+                    summary["success_rate"] = 100
 
         for func_summary in functions_summary.values():
             overall_summary["total_calls"] += func_summary["total_calls"]
@@ -522,36 +811,35 @@ class PerformanceMonitor:
                 },
             }
 
-            # Find service insights
-            if aggregated_data["services"]:
-                # Most used service (by call count)
-                most_used = max(
-                    aggregated_data["services"].items(),
-                    key=lambda x: x[1]["total_calls"],
-                )
-                service_breakdown["summary"]["most_used_service"] = {
+            # Find service insights in a single pass: most used (by call
+            # count), slowest (by average response time) and least reliable (by
+            # success rate). Ties keep the first service seen.
+            most_used = slowest = least_reliable = None
+            for name, service in aggregated_data["services"].items():
+                if most_used is None or service["total_calls"] > most_used[1]:
+                    most_used = (name, service["total_calls"])
+                response_time = service["avg_response_time"]
+                if slowest is None or response_time > slowest[1]:
+                    slowest = (name, response_time)
+                if (
+                    least_reliable is None
+                    or service["success_rate"] < least_reliable[1]
+                ):
+                    least_reliable = (name, service["success_rate"])
+
+            if most_used is not None:
+                summary = service_breakdown["summary"]
+                summary["most_used_service"] = {
                     "name": most_used[0],
-                    "total_calls": most_used[1]["total_calls"],
+                    "total_calls": most_used[1],
                 }
-
-                # Slowest service (by average duration)
-                slowest = max(
-                    aggregated_data["services"].items(),
-                    key=lambda x: x[1]["avg_duration"],
-                )
-                service_breakdown["summary"]["slowest_service"] = {
+                summary["slowest_service"] = {
                     "name": slowest[0],
-                    "avg_duration": slowest[1]["avg_duration"],
+                    "avg_response_time": slowest[1],
                 }
-
-                # Least reliable service (by success rate)
-                least_reliable = min(
-                    aggregated_data["services"].items(),
-                    key=lambda x: x[1]["success_rate"],
-                )
-                service_breakdown["summary"]["least_reliable_service"] = {
+                summary["least_reliable_service"] = {
                     "name": least_reliable[0],
-                    "success_rate": least_reliable[1]["success_rate"],
+                    "success_rate": least_reliable[1],
                 }
 
             return service_breakdown
@@ -587,48 +875,45 @@ class PerformanceMonitor:
                 },
             }
 
-            # Generate comparison insights
-            if aggregated_data["functions"]:
-                functions = aggregated_data["functions"]
-
-                # Fastest function (lowest average response time)
-                fastest = min(
-                    functions.items(),
-                    key=lambda x: (
-                        x[1]["avg_response_time"]
-                        if x[1]["avg_response_time"] > 0
-                        else float("inf")
-                    ),
-                )
-                if fastest[1]["avg_response_time"] > 0:
-                    function_comparison["comparison"]["fastest_function"] = {
-                        "name": fastest[0],
-                        "avg_response_time": fastest[1]["avg_response_time"],
-                    }
-
-                # Slowest function (highest average response time)
-                slowest = max(
-                    functions.items(), key=lambda x: x[1]["avg_response_time"]
-                )
-                function_comparison["comparison"]["slowest_function"] = {
+            # Generate comparison insights in a single pass: fastest and
+            # slowest (by average response time), most active (by call count)
+            # and least reliable (by success rate). Ties keep the first seen;
+            # functions without timings never count as fastest.
+            fastest = slowest = most_active = least_reliable = None
+            for name, function in aggregated_data["functions"].items():
+                response_time = function["avg_response_time"]
+                if response_time > 0 and (
+                    fastest is None or response_time < fastest[1]
+                ):
+                    fastest = (name, response_time)
+                if slowest is None or response_time > slowest[1]:
+                    slowest = (name, response_time)
+                if most_active is None or function["total_calls"] > most_active[1]:
+                    most_active = (name, function["total_calls"])
+                if (
+                    least_reliable is None
+                    or function["success_rate"] < least_reliable[1]
+                ):
+                    least_reliable = (name, function["success_rate"])
+
+            comparison = function_comparison["comparison"]
+            if fastest is not None:
+                comparison["fastest_function"] = {
+                    "name": fastest[0],
+                    "avg_response_time": fastest[1],
+                }
+            if slowest is not None:
+                comparison["slowest_function"] = {
                     "name": slowest[0],
-                    "avg_response_time": slowest[1]["avg_response_time"],
+                    "avg_response_time": slowest[1],
                 }
-
-                # Most active function (highest call count)
-                most_active = max(functions.items(), key=lambda x: x[1]["total_calls"])
-                function_comparison["comparison"]["most_active_function"] = {
+                comparison["most_active_function"] = {
                     "name": most_active[0],
-                    "total_calls": most_active[1]["total_calls"],
+                    "total_calls": most_active[1],
                 }
-
-                # Least reliable function (lowest success rate)
-                least_reliable = min(
-                    functions.items(), key=lambda x: x[1]["success_rate"]
-                )
-                function_comparison["comparison"]["least_reliable_function"] = {
+                comparison["least_reliable_function"] = {
                     "name": least_reliable[0],
-                    "success_rate": least_reliable[1]["success_rate"],
+                    "success_rate": least_reliable[1],
                 }
 
             return function_comparison
@@ -646,30 +931,61 @@ class PerformanceMonitor:
         Returns:
             str: The service name (e.g., 'rekognition')
         """
-        # Common service prefixes in operation names
-        service_mappings = {
-            "rekognition": "rekognition",
-            "comprehend": "comprehend",
-            "translate": "translate",
-            "s3": "s3",
-            "cognito": "cognito",
-            "dynamodb": "dynamodb",
-        }
+        return _service_for_operation(operation_name)
+
+
+# Common service prefixes in operation names
+_SERVICE_BY_PREFIX = {
+    "rekognition": "rekognition",
+    "comprehend": "comprehend",
+    "translate": "translate",
+    "s3": "s3",
+    "cognito": "cognito",
+    "dynamodb": "dynamodb",
+}
 
-        operation_lower = operation_name.lower()
-        for prefix, service in service_mappings.items():
-            if operation_lower.startswith(prefix):
-                return service
 
-        # Default fallback - extract first part before underscore
-        parts = operation_name.split("_")
-        return parts[0].lower() if parts else "unknown"
+@lru_cache(maxsize=256)
+def _service_for_operation(operation_name: str) -> str:
+    # Operation names are "<service>_<action>", and only a handful of distinct
+    # names exist, so this is one dict lookup per name for the container's life
+    prefix = operation_name.split("_", 1)[0].lower()
+    # Unrecognised prefixes are reported as their own service
+    return _SERVICE_BY_PREFIX.get(prefix, prefix or "unknown")
 
 
 # Global performance monitor instance
 performance_monitor = PerformanceMonitor()
 
 
+def flush_metrics_on_return(handler: Callable[..., Any]) -> Callable[..., Any]:
+    """Write the metrics a Lambda handler queued before it returns.
+
+    Lambda freezes the environment as soon as the handler returns, so the
+    snapshots queued by persist_metrics are written here in one batch rather
+    than left for a later invocation the container may never get.
+    """
+
+    @wraps(handler)
+    def wrapper(event, context):
+        try:
+            return handler(event, context)
+        finally:
+            performance_monitor.flush()
+
+    return wrapper
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+    # Write whatever is still queued so a container shutdown does not drop it
+    performance_monitor.flush()
+    for client in list(_clients.values()):
+        close = getattr(client, "close", None)
+        if close is not None:
+            close()
+
+
 def get_performance_metrics() -> Dict[str, Any]:
     """Get current performance metrics."""
     return performance_monitor.get_metrics()
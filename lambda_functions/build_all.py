@@ -4,13 +4,15 @@ Cross-platform Lambda build system for all functions.
 Builds all Lambda functions in the correct order and validates outputs.
 """
 
+import asyncio
 import concurrent.futures
+import importlib.util
+import os
 import shutil
-import subprocess
 import sys
 import time
+from functools import lru_cache
 from pathlib import Path
-from threading import Lock
 from typing import Dict, List, Optional, Tuple
 
 try:
@@ -22,9 +24,25 @@ except ImportError:
     PYTHON_DETECTOR_AVAILABLE = False
 
 try:
-    from .build_lambda import LAMBDA_FUNCTIONS, build_lambda_function
+    from .build_lambda import (
+        LAMBDA_FUNCTIONS,
+        _default_max_workers,
+        _probe_python,
+        build_functions_parallel,
+        build_lambda_function,
+        get_zip_path,
+        is_build_current,
+    )
 except ImportError:
-    from build_lambda import LAMBDA_FUNCTIONS, build_lambda_function
+    from build_lambda import (
+        LAMBDA_FUNCTIONS,
+        _default_max_workers,
+        _probe_python,
+        build_functions_parallel,
+        build_lambda_function,
+        get_zip_path,
+        is_build_current,
+    )
 
 
 class BuildAllError(Exception):
@@ -33,84 +51,93 @@ class BuildAllError(Exception):
     pass
 
 
-# Thread-safe printing
-print_lock = Lock()
-
-
-def safe_print(*args, **kwargs):
-    """Thread-safe print function."""
-    with print_lock:
-        print(*args, **kwargs)
-
-
-def build_function_wrapper(
-    function_name: str, cleanup: bool = True, python_cmd: Optional[str] = None
+async def _build_function_subprocess(
+    function_name: str,
+    semaphore: asyncio.Semaphore,
+    cleanup: bool,
+    python_cmd: Optional[str],
 ) -> Tuple[str, bool, str]:
     """
-    Wrapper function for building a single Lambda function in a thread.
+    Build one Lambda function in its own build_lambda.py process.
 
     Returns:
-        Tuple of (function_name, success, error_message)
+        Tuple of (function_name, success, message)
     """
-    try:
-        zip_path = build_lambda_function(
-            function_name, cleanup=cleanup, python_cmd=python_cmd
+    cmd = [sys.executable, str(Path(__file__).parent / "build_lambda.py")]
+    cmd.append(function_name)
+    if python_cmd:
+        cmd.extend(["--python-cmd", python_cmd])
+    if not cleanup:
+        cmd.append("--no-cleanup")
+    # Up-to-date functions were already skipped by the caller
+    cmd.append("--force")
+
+    async with semaphore:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
         )
-        return function_name, True, str(zip_path)
-    except Exception as e:
-        return function_name, False, str(e)
+        output, _ = await process.communicate()
 
+    lines = output.decode(errors="replace").strip().splitlines()
+    if process.returncode == 0:
+        for line in reversed(lines):
+            if line.startswith("Output: "):
+                return function_name, True, line[len("Output: ") :]
+        return function_name, True, "built"
 
-def build_functions_parallel(
+    message = lines[-1] if lines else f"exit code {process.returncode}"
+    if message.startswith("Build failed: "):
+        message = message[len("Build failed: ") :]
+    return function_name, False, message
+
+
+async def build_functions_async(
     function_names: List[str],
     max_workers: int = 3,
     cleanup: bool = True,
     python_cmd: Optional[str] = None,
+    results: Optional[Dict[str, Tuple[bool, str]]] = None,
 ) -> Dict[str, Tuple[bool, str]]:
     """
-    Build multiple Lambda functions in parallel.
+    Build multiple Lambda functions as concurrent subprocesses.
+
+    Each build (including its pip install) runs in a separate build_lambda.py
+    process awaited from one event loop, so waiting on N builds needs no
+    worker threads or pool processes.
 
     Args:
         function_names: List of function names to build
-        max_workers: Maximum number of parallel builds
+        max_workers: Maximum number of builds running at once
         cleanup: Whether to clean up build directories after zip creation
         python_cmd: Python executable to use for building
+        results: Optional dictionary to record results into as builds finish
 
     Returns:
         Dictionary mapping function names to (success, message) tuples
     """
-    results = {}
+    if results is None:
+        results = {}
 
-    safe_print(
-        f"\nBuilding {len(function_names)} Lambda functions in parallel (max {max_workers} workers)..."
+    print(
+        f"\nBuilding {len(function_names)} Lambda functions asynchronously (max {max_workers} at once)..."
     )
     if python_cmd:
-        safe_print(f"Using Python executable: {python_cmd}")
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all build tasks
-        future_to_function = {
-            executor.submit(
-                build_function_wrapper, func_name, cleanup, python_cmd
-            ): func_name
-            for func_name in function_names
-        }
-
-        # Collect results as they complete
-        for future in concurrent.futures.as_completed(future_to_function):
-            function_name = future_to_function[future]
-            try:
-                func_name, success, message = future.result()
-                results[func_name] = (success, message)
-
-                if success:
-                    safe_print(f"  [OK] {func_name}: {message}")
-                else:
-                    safe_print(f"  [FAIL] {func_name}: {message}")
-
-            except Exception as e:
-                results[function_name] = (False, f"Unexpected error: {e}")
-                safe_print(f"  [ERROR] {function_name}: Unexpected error: {e}")
+        print(f"Using Python executable: {python_cmd}")
+
+    semaphore = asyncio.Semaphore(max_workers)
+    tasks = [
+        _build_function_subprocess(name, semaphore, cleanup, python_cmd)
+        for name in function_names
+    ]
+    for task in asyncio.as_completed(tasks):
+        func_name, success, message = await task
+        results[func_name] = (success, message)
+        if success:
+            print(f"  [OK] {func_name}: {message}")
+        else:
+            print(f"  [FAIL] {func_name}: {message}")
 
     return results
 
@@ -140,7 +167,7 @@ def build_functions_sequential(
 
         try:
             zip_path = build_lambda_function(
-                function_name, cleanup=cleanup, python_cmd=python_cmd
+                function_name, cleanup=cleanup, python_cmd=python_cmd, force=True
             )
             results[function_name] = (True, str(zip_path))
             print(f"  [OK] {function_name}: {zip_path}")
@@ -152,6 +179,35 @@ def build_functions_sequential(
     return results
 
 
+def _expected_zip_path(function_name: str, lambda_dir: Path) -> Tuple[Path, str]:
+    """Get where a function's zip is built and a short description of it."""
+    zip_path = get_zip_path(function_name, lambda_dir)
+    return zip_path, f"{zip_path.parent.relative_to(lambda_dir.parent).as_posix()}/"
+
+
+def _check_build_output(zip_path: Path) -> Tuple[int, Optional[str]]:
+    """
+    Check one zip file with a single stat call.
+
+    Returns:
+        Tuple of (size in bytes, validation error or None)
+    """
+    try:
+        zip_size = os.stat(zip_path).st_size
+    except FileNotFoundError:
+        return 0, f"Missing zip file: {zip_path}"
+
+    # Check file size (should not be empty)
+    if zip_size == 0:
+        return zip_size, f"Empty zip file: {zip_path}"
+
+    # Minimum reasonable size check (1KB)
+    if zip_size < 1024:
+        return zip_size, f"Suspiciously small zip file ({zip_size} bytes): {zip_path}"
+
+    return zip_size, None
+
+
 def validate_build_outputs() -> List[str]:
     """
     Validate that all required zip files were created successfully.
@@ -161,84 +217,92 @@ def validate_build_outputs() -> List[str]:
     """
     errors = []
     lambda_dir = Path(__file__).parent.resolve()
-    terraform_root = lambda_dir.parent / "terraform"
-    terraform_app_stack = terraform_root / "app-stack"
-
-    print("\nValidating build outputs...")
-
-    for function_name in LAMBDA_FUNCTIONS.keys():
-        # Determine expected location based on function type
-        if function_name == "reddit_populator":
-            zip_path = terraform_root / f"{function_name}.zip"
-            location_desc = "terraform/"
-        else:
-            zip_path = terraform_app_stack / f"{function_name}.zip"
-            location_desc = "terraform/app-stack/"
-
-        print(f"Checking {function_name}.zip in {location_desc}...")
+    function_names = list(LAMBDA_FUNCTIONS.keys())
+    locations = [_expected_zip_path(name, lambda_dir) for name in function_names]
+    lines = ["\nValidating build outputs..."]
+
+    # The stats are I/O-bound and independent, so run them concurrently
+    # (noticeable on network drives), then report in function order
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        checks = list(
+            executor.map(_check_build_output, [path for path, _ in locations])
+        )
 
-        if not zip_path.exists():
-            errors.append(f"Missing zip file: {zip_path}")
+    for function_name, (_, location_desc), (zip_size, error) in zip(
+        function_names, locations, checks
+    ):
+        lines.append(f"Checking {function_name}.zip in {location_desc}...")
+        if error:
+            errors.append(error)
             continue
+        lines.append(f"  [OK] {function_name}.zip ({zip_size:,} bytes)")
 
-        # Check file size (should not be empty)
-        zip_size = zip_path.stat().st_size
-        if zip_size == 0:
-            errors.append(f"Empty zip file: {zip_path}")
-            continue
+    # One write for the whole report instead of one per line
+    print("\n".join(lines))
+    return errors
 
-        # Minimum reasonable size check (1KB)
-        if zip_size < 1024:
-            errors.append(f"Suspiciously small zip file ({zip_size} bytes): {zip_path}")
-            continue
 
-        print(f"  [OK] {function_name}.zip ({zip_size:,} bytes)")
+def split_build_results(
+    results: Dict[str, Tuple[bool, str]],
+) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Split build results into successful and failed builds in one pass.
 
-    return errors
+    Returns:
+        Tuple of (successful, failed) lists of (function_name, message)
+    """
+    successful: List[Tuple[str, str]] = []
+    failed: List[Tuple[str, str]] = []
+    for name, (success, message) in results.items():
+        (successful if success else failed).append((name, message))
+    return successful, failed
 
 
 def print_build_summary(
-    results: Dict[str, Tuple[bool, str]], start_time: float
+    successful: List[Tuple[str, str]],
+    failed: List[Tuple[str, str]],
+    start_time: float,
 ) -> None:
     """Print a summary of the build results."""
     end_time = time.time()
     duration = end_time - start_time
 
-    successful = [name for name, (success, _) in results.items() if success]
-    failed = [name for name, (success, _) in results.items() if not success]
-
     print(f"\n{'=' * 60}")
     print(f"Build Summary ({duration:.1f}s)")
     print(f"{'=' * 60}")
 
     if successful:
         print(f"Successful builds ({len(successful)}):")
-        for name in successful:
+        for name, _ in successful:
             print(f"  * {name}")
 
     if failed:
         print(f"\nFailed builds ({len(failed)}):")
-        for name in failed:
-            _, error_msg = results[name]
+        for name, error_msg in failed:
             print(f"  * {name}: {error_msg}")
 
-    print(f"\nTotal: {len(successful)}/{len(results)} functions built successfully")
+    total = len(successful) + len(failed)
+    print(f"\nTotal: {len(successful)}/{total} functions built successfully")
 
 
 def build_all_lambda_functions(
     parallel: bool = True,
-    max_workers: int = 3,
+    max_workers: Optional[int] = None,
     cleanup: bool = True,
     python_cmd: Optional[str] = None,
+    force: bool = False,
+    use_async: bool = False,
 ) -> bool:
     """
     Build all Lambda functions with error handling.
 
     Args:
         parallel: Whether to build functions in parallel
-        max_workers: Maximum number of parallel workers
+        max_workers: Maximum number of parallel workers (CPU-based if None)
         cleanup: Whether to clean up build directories after zip creation
         python_cmd: Python executable to use for building (auto-detected if None)
+        force: Rebuild every function even if its zip is up to date
+        use_async: Run parallel builds as subprocesses from an asyncio loop
 
     Returns:
         True if all builds successful, False otherwise
@@ -261,32 +325,58 @@ def build_all_lambda_functions(
         print(f"ERROR: Python executable '{python_cmd}' is not suitable for building")
         return False
 
-    # Build functions
-    if parallel:
+    # Skip functions whose zip was built from the current sources
+    results: Dict[str, Tuple[bool, str]] = {}
+    to_build = function_names
+    if not force:
+        lambda_dir = Path(__file__).parent.resolve()
+        to_build = []
+        for name in function_names:
+            if is_build_current(name, python_cmd):
+                results[name] = (True, f"{get_zip_path(name, lambda_dir)} (up to date)")
+            else:
+                to_build.append(name)
+        if results:
+            print(f"Up to date, skipping: {', '.join(results)}")
+
+    # Build functions, never starting more workers than there are functions
+    if to_build and parallel:
+        if max_workers is None:
+            max_workers = _default_max_workers()
+        max_workers = max(1, min(max_workers, len(to_build)))
         try:
-            results = build_functions_parallel(
-                function_names, max_workers, cleanup, python_cmd
-            )
+            if use_async:
+                asyncio.run(
+                    build_functions_async(
+                        to_build, max_workers, cleanup, python_cmd, results
+                    )
+                )
+            else:
+                build_functions_parallel(
+                    to_build, max_workers, cleanup, python_cmd, results
+                )
         except Exception as e:
+            # Only rebuild the functions that did not finish in parallel
+            missing = [name for name in to_build if name not in results]
             print(
-                f"WARNING: Parallel build failed ({e}), falling back to sequential..."
+                f"WARNING: Parallel build failed ({e}), building "
+                f"{len(missing)} remaining functions sequentially..."
             )
-            results = build_functions_sequential(function_names, cleanup, python_cmd)
-    else:
-        results = build_functions_sequential(function_names, cleanup, python_cmd)
+            results.update(build_functions_sequential(missing, cleanup, python_cmd))
+    elif to_build:
+        results.update(build_functions_sequential(to_build, cleanup, python_cmd))
 
     # Validate outputs
     validation_errors = validate_build_outputs()
 
     # Print summary
-    print_build_summary(results, start_time)
+    successful, failed = split_build_results(results)
+    print_build_summary(successful, failed, start_time)
 
     # Check for failures
-    failed_builds = [name for name, (success, _) in results.items() if not success]
-
-    if failed_builds:
-        print(f"\nBuild failed for: {', '.join(failed_builds)}")
-        _provide_build_failure_guidance(failed_builds, results, python_cmd)
+    if failed:
+        print(f"\nBuild failed for: {', '.join(name for name, _ in failed)}")
+        _provide_build_failure_guidance(failed, python_cmd)
         return False
 
     if validation_errors:
@@ -300,6 +390,13 @@ def build_all_lambda_functions(
     return True
 
 
+@lru_cache(maxsize=None)
+def _which(cmd: str) -> Optional[str]:
+    """shutil.which, cached so PATH is only walked once per command."""
+    return shutil.which(cmd)
+
+
+@lru_cache(maxsize=None)
 def _detect_python_executable() -> str:
     """Detect the best Python executable to use for building."""
     if PYTHON_DETECTOR_AVAILABLE:
@@ -328,7 +425,12 @@ def _detect_python_executable() -> str:
         except Exception:
             pass
 
-    # Fallback to original detection logic if detector unavailable or fails
+    # Fallback to original detection logic if detector unavailable or fails.
+    # The interpreter running this script is known to work, so it needs no
+    # subprocess probe as long as it has pip
+    if sys.executable and importlib.util.find_spec("pip") is not None:
+        return sys.executable
+
     candidates = ["python", "python3"]
 
     # On Windows, also try 'py' launcher
@@ -337,15 +439,10 @@ def _detect_python_executable() -> str:
 
     for cmd in candidates:
         try:
-            if shutil.which(cmd):
+            if _which(cmd):
                 # Test if command works and has pip
-                result = subprocess.run(
-                    [cmd, "-m", "pip", "--version"],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                )
-                if result.returncode == 0:
+                returncode, _ = _probe_python(cmd)
+                if returncode == 0:
                     return cmd
         except Exception:
             continue
@@ -354,32 +451,24 @@ def _detect_python_executable() -> str:
     return "python"
 
 
+@lru_cache(maxsize=8)
 def _validate_python_executable(python_cmd: str) -> bool:
     """Validate that the Python executable is suitable for building."""
     try:
-        # Test Python version
-        result = subprocess.run(
-            [python_cmd, "--version"], capture_output=True, text=True, timeout=10
-        )
-        if result.returncode != 0:
+        # Python and pip versions come from a single (cached) probe
+        returncode, lines = _probe_python(python_cmd)
+        if not lines:
             print(f"ERROR: Python executable '{python_cmd}' is not working")
             return False
 
-        print(f"Python version: {result.stdout.strip()}")
+        print(f"Python version: {lines[0]}")
 
-        # Test pip availability
-        result = subprocess.run(
-            [python_cmd, "-m", "pip", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if result.returncode != 0:
+        if returncode != 0 or len(lines) < 2:
             print(f"ERROR: pip is not available with Python executable '{python_cmd}'")
             print("Solution: Install pip or use a different Python executable")
             return False
 
-        print(f"pip version: {result.stdout.strip()}")
+        print(f"pip version: {lines[1]}")
         return True
 
     except FileNotFoundError:
@@ -395,81 +484,82 @@ def _validate_python_executable(python_cmd: str) -> bool:
 
 
 def _provide_build_failure_guidance(
-    failed_builds: List[str], results: Dict[str, Tuple[bool, str]], python_cmd: str
+    failed: List[Tuple[str, str]], python_cmd: str
 ) -> None:
     """Provide specific guidance for build failures."""
-    print(f"\n{'=' * 60}")
-    print("BUILD FAILURE GUIDANCE")
-    print(f"{'=' * 60}")
+    failed_builds = [name for name, _ in failed]
 
-    print(f"Failed functions: {', '.join(failed_builds)}")
-    print(f"Python executable used: {python_cmd}")
+    # Collected and printed in one write
+    lines = [f"\n{'=' * 60}", "BUILD FAILURE GUIDANCE", f"{'=' * 60}"]
 
-    # Analyze common error patterns
-    all_errors = []
-    for func_name in failed_builds:
-        _, error_msg = results[func_name]
-        all_errors.append(error_msg.lower())
+    lines.append(f"Failed functions: {', '.join(failed_builds)}")
+    lines.append(f"Python executable used: {python_cmd}")
 
-    combined_errors = " ".join(all_errors)
+    # Analyze common error patterns
+    combined_errors = " ".join(error_msg.lower() for _, error_msg in failed)
 
-    print("\nCommon solutions:")
+    lines.append("\nCommon solutions:")
 
     if "permission" in combined_errors or "access" in combined_errors:
-        print("* PERMISSION ISSUES:")
-        print("  - Run with administrator/sudo privileges")
-        print("  - Check if files are locked by antivirus or other processes")
-        print("  - Use virtual environment to avoid system conflicts")
+        lines.append("* PERMISSION ISSUES:")
+        lines.append("  - Run with administrator/sudo privileges")
+        lines.append("  - Check if files are locked by antivirus or other processes")
+        lines.append("  - Use virtual environment to avoid system conflicts")
 
     if "network" in combined_errors or "connection" in combined_errors:
-        print("* NETWORK ISSUES:")
-        print("  - Check internet connection")
-        print("  - Configure proxy if needed")
-        print("  - Try again later if package repositories are down")
+        lines.append("* NETWORK ISSUES:")
+        lines.append("  - Check internet connection")
+        lines.append("  - Configure proxy if needed")
+        lines.append("  - Try again later if package repositories are down")
 
     if "module" in combined_errors or "import" in combined_errors:
-        print("* DEPENDENCY ISSUES:")
-        print(f"  - Update pip: {python_cmd} -m pip install --upgrade pip")
-        print(
+        lines.append("* DEPENDENCY ISSUES:")
+        lines.append(f"  - Update pip: {python_cmd} -m pip install --upgrade pip")
+        lines.append(
             f"  - Install requirements: {python_cmd} -m pip install -r lambda_functions/requirements.txt"
         )
 
-    print("\nManual troubleshooting:")
-    print("1. Try building individual functions:")
+    lines.append("\nManual troubleshooting:")
+    lines.append("1. Try building individual functions:")
     for func_name in failed_builds:
-        print(f"   {python_cmd} lambda_functions/build_lambda.py {func_name}")
+        lines.append(f"   {python_cmd} lambda_functions/build_lambda.py {func_name}")
 
-    print("2. Check Python environment:")
-    print(f"   {python_cmd} --version")
-    print(f"   {python_cmd} -m pip --version")
+    lines.append("2. Check Python environment:")
+    lines.append(f"   {python_cmd} --version")
+    lines.append(f"   {python_cmd} -m pip --version")
 
-    print("3. Clean and retry:")
-    print("   - Delete lambda_functions/build/ directory")
-    print("   - Delete existing .zip files in terraform/")
-    print("   - Run build again")
+    lines.append("3. Clean and retry:")
+    lines.append("   - Delete lambda_functions/build/ directory")
+    lines.append("   - Delete existing .zip files in terraform/")
+    lines.append("   - Run build again")
+
+    print("\n".join(lines))
 
 
 def _provide_validation_failure_guidance(
     validation_errors: List[str], python_cmd: str
 ) -> None:
     """Provide guidance for validation failures."""
-    print(f"\n{'=' * 60}")
-    print("VALIDATION FAILURE GUIDANCE")
-    print(f"{'=' * 60}")
+    # Collected and printed in one write
+    lines = [f"\n{'=' * 60}", "VALIDATION FAILURE GUIDANCE", f"{'=' * 60}"]
 
-    print("Validation errors indicate that zip files were created but have issues:")
+    lines.append(
+        "Validation errors indicate that zip files were created but have issues:"
+    )
     for error in validation_errors:
-        print(f"  • {error}")
+        lines.append(f"  • {error}")
+
+    lines.append("\nSolutions:")
+    lines.append("1. Clean build and retry:")
+    lines.append("   - Delete lambda_functions/build/ directory")
+    lines.append("   - Delete problematic .zip files")
+    lines.append(f"   - Run: {python_cmd} lambda_functions/build_all.py")
 
-    print("\nSolutions:")
-    print("1. Clean build and retry:")
-    print("   - Delete lambda_functions/build/ directory")
-    print("   - Delete problematic .zip files")
-    print(f"   - Run: {python_cmd} lambda_functions/build_all.py")
+    lines.append("2. Check disk space and permissions")
+    lines.append("3. Verify source files are not corrupted")
+    lines.append("4. Check antivirus software isn't interfering with zip creation")
 
-    print("2. Check disk space and permissions")
-    print("3. Verify source files are not corrupted")
-    print("4. Check antivirus software isn't interfering with zip creation")
+    print("\n".join(lines))
 
 
 def main():
@@ -487,14 +577,25 @@ def main():
     parser.add_argument(
         "--workers",
         type=int,
-        default=3,
-        help="Maximum number of parallel workers (default: 3)",
+        default=_default_max_workers(),
+        help="Maximum number of parallel workers (default: CPU count minus one)",
     )
     parser.add_argument(
         "--no-cleanup",
         action="store_true",
         help="Skip cleanup of build directories after zip creation",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild all functions even if their sources have not changed",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Run parallel builds as subprocesses from a single asyncio event loop",
+    )
     parser.add_argument(
         "--python-cmd",
         type=str,
@@ -509,6 +610,8 @@ def main():
             max_workers=args.workers,
             cleanup=not args.no_cleanup,
             python_cmd=args.python_cmd,
+            force=args.force,
+            use_async=args.use_async,
         )
 
         if not success:
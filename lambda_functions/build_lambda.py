@@ -4,14 +4,29 @@ Cross-platform Lambda function builder for individual functions.
 Handles dependency installation, source file packaging, and zip creation.
 """
 
+import atexit
+import concurrent.futures
+import contextlib
+import hashlib
+import io
+import itertools
+import json
+import math
+import multiprocessing
 import os
+import re
 import shutil
 import subprocess
 import sys
+import threading
+import time
 import zipfile
+from collections import deque
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from types import MappingProxyType
+from typing import Deque, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 
 try:
     from deployment_logic.progress_indicator import ProgressIndicator
@@ -21,94 +36,104 @@ try:
 except ImportError:
     PYTHON_DETECTOR_AVAILABLE = False
 
+try:
+    # Optional: ISA-L's SIMD deflate, several times faster than zlib
+    from isal import isal_zlib
+
+    ISAL_AVAILABLE = True
+except ImportError:
+    ISAL_AVAILABLE = False
 
-@dataclass
+
+@dataclass(frozen=True)
 class LambdaFunction:
     """Metadata for a Lambda function."""
 
     name: str
     handler_file: str
     handler_function: str
-    source_files: List[str]
+    source_files: Tuple[str, ...]
     has_dependencies: bool = False
     runtime: str = "python3.11"
 
 
-# Lambda function definitions
-LAMBDA_FUNCTIONS = {
-    "image_processor": LambdaFunction(
-        name="image_processor",
-        handler_file="image_processor.py",
-        handler_function="lambda_handler",
-        source_files=["image_processor.py", "aws_clients.py"],
-    ),
-    "gallery_lister": LambdaFunction(
-        name="gallery_lister",
-        handler_file="gallery_lister.py",
-        handler_function="lambda_handler",
-        source_files=["gallery_lister.py", "aws_clients.py"],
-    ),
-    "cognito_triggers": LambdaFunction(
-        name="cognito_triggers",
-        handler_file="cognito_triggers.py",
-        handler_function="lambda_handler",
-        source_files=["cognito_triggers.py", "aws_clients.py"],
-    ),
-    "user_manager": LambdaFunction(
-        name="user_manager",
-        handler_file="user_manager.py",
-        handler_function="lambda_handler",
-        source_files=["user_manager.py", "aws_clients.py"],
-    ),
-    "mmid_populator": LambdaFunction(
-        name="mmid_populator",
-        handler_file="mmid_populator.py",
-        handler_function="lambda_handler",
-        source_files=["mmid_populator.py", "aws_clients.py"],
-    ),
-    "reddit_populator": LambdaFunction(
-        name="reddit_populator",
-        handler_file="reddit_populator_sync.py",
-        handler_function="lambda_handler",
-        source_files=[
-            "reddit_populator_sync.py",
-            "reddit_scraper_sync.py",
-            "aws_clients.py",
-        ],
-        has_dependencies=True,
-    ),
-    "history_handler": LambdaFunction(
-        name="history_handler",
-        handler_file="history_handler.py",
-        handler_function="lambda_handler",
-        source_files=["history_handler.py", "aws_clients.py"],
-    ),
-    "performance_handler": LambdaFunction(
-        name="performance_handler",
-        handler_file="performance_handler.py",
-        handler_function="lambda_handler",
-        source_files=["performance_handler.py", "aws_clients.py"],
-    ),
-    "prepare_reddit_populator": LambdaFunction(
-        name="prepare_reddit_populator",
-        handler_file="prepare_reddit_populator.py",
-        handler_function="main",
-        source_files=["prepare_reddit_populator.py"],
-    ),
-    "reddit_realtime_scraper": LambdaFunction(
-        name="reddit_realtime_scraper",
-        handler_file="reddit_realtime_scraper.py",
-        handler_function="process_new_reddit_posts",
-        source_files=[
-            "reddit_realtime_scraper.py",
-            "reddit_config.py",
-            "reddit_populator_sync.py",
-            "reddit_scraper_sync.py",
-            "aws_clients.py",
-        ],
-        has_dependencies=True,
-    ),
-}
+# Lambda function definitions (read-only)
+LAMBDA_FUNCTIONS: Mapping[str, LambdaFunction] = MappingProxyType(
+    {
+        "image_processor": LambdaFunction(
+            name="image_processor",
+            handler_file="image_processor.py",
+            handler_function="lambda_handler",
+            source_files=("image_processor.py", "aws_clients.py"),
+        ),
+        "gallery_lister": LambdaFunction(
+            name="gallery_lister",
+            handler_file="gallery_lister.py",
+            handler_function="lambda_handler",
+            source_files=("gallery_lister.py", "aws_clients.py"),
+        ),
+        "cognito_triggers": LambdaFunction(
+            name="cognito_triggers",
+            handler_file="cognito_triggers.py",
+            handler_function="lambda_handler",
+            source_files=("cognito_triggers.py", "aws_clients.py"),
+        ),
+        "user_manager": LambdaFunction(
+            name="user_manager",
+            handler_file="user_manager.py",
+            handler_function="lambda_handler",
+            source_files=("user_manager.py", "aws_clients.py"),
+        ),
+        "mmid_populator": LambdaFunction(
+            name="mmid_populator",
+            handler_file="mmid_populator.py",
+            handler_function="lambda_handler",
+            source_files=("mmid_populator.py", "aws_clients.py"),
+        ),
+        "reddit_populator": LambdaFunction(
+            name="reddit_populator",
+            handler_file="reddit_populator_sync.py",
+            handler_function="lambda_handler",
+            source_files=(
+                "reddit_populator_sync.py",
+                "reddit_scraper_sync.py",
+                "aws_clients.py",
+            ),
+            has_dependencies=True,
+        ),
+        "history_handler": LambdaFunction(
+            name="history_handler",
+            handler_file="history_handler.py",
+            handler_function="lambda_handler",
+            source_files=("history_handler.py", "aws_clients.py"),
+        ),
+        "performance_handler": LambdaFunction(
+            name="performance_handler",
+            handler_file="performance_handler.py",
+            handler_function="lambda_handler",
+            source_files=("performance_handler.py", "aws_clients.py"),
+        ),
+        "prepare_reddit_populator": LambdaFunction(
+            name="prepare_reddit_populator",
+            handler_file="prepare_reddit_populator.py",
+            handler_function="main",
+            source_files=("prepare_reddit_populator.py",),
+        ),
+        "reddit_realtime_scraper": LambdaFunction(
+            name="reddit_realtime_scraper",
+            handler_file="reddit_realtime_scraper.py",
+            handler_function="process_new_reddit_posts",
+            source_files=(
+                "reddit_realtime_scraper.py",
+                "reddit_config.py",
+                "reddit_populator_sync.py",
+                "reddit_scraper_sync.py",
+                "aws_clients.py",
+            ),
+            has_dependencies=True,
+        ),
+    }
+)
 
 
 class LambdaBuildError(Exception):
@@ -117,7 +142,7 @@ class LambdaBuildError(Exception):
     pass
 
 
-def validate_source_files(lambda_dir: Path, source_files: List[str]) -> None:
+def validate_source_files(lambda_dir: Path, source_files: Sequence[str]) -> None:
     """Validate that all required source files exist."""
     missing_files = []
     for file_name in source_files:
@@ -129,80 +154,436 @@ def validate_source_files(lambda_dir: Path, source_files: List[str]) -> None:
         raise LambdaBuildError(f"Missing source files: {', '.join(missing_files)}")
 
 
+def _fast_copy(src: Path, dst: Path) -> None:
+    """
+    Materialize src at dst as cheaply as the platform allows.
+
+    Tries a hardlink, then an in-kernel copy (copy_file_range, which also
+    lets filesystems share extents), and finally shutil.copy2.
+    """
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as source, open(dst, "wb") as dest:
+                remaining = os.fstat(source.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(
+                        source.fileno(), dest.fileno(), remaining
+                    )
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+
+    shutil.copy2(src, dst)
+
+
 def copy_source_files(
-    lambda_dir: Path, build_dir: Path, source_files: List[str]
+    lambda_dir: Path,
+    build_dir: Path,
+    source_files: Sequence[str],
+    incremental: bool = False,
 ) -> None:
-    """Copy source files to the build directory."""
+    """
+    Copy source files to the build directory.
+
+    With incremental, files whose staged copy has the same size and is at
+    least as new are left alone.
+    """
     print("Copying source files...")
     for file_name in source_files:
         source_path = lambda_dir / file_name
         dest_path = build_dir / file_name
-        shutil.copy2(source_path, dest_path)
+        if incremental:
+            source_stat = source_path.stat()
+            try:
+                dest_stat = dest_path.stat()
+            except FileNotFoundError:
+                pass
+            else:
+                if (
+                    dest_stat.st_size == source_stat.st_size
+                    and dest_stat.st_mtime >= source_stat.st_mtime
+                ):
+                    continue
+                # Never write through an old hardlink into another file
+                dest_path.unlink()
+        # Sources are never modified during a build, so a hardlink is enough
+        _fast_copy(source_path, dest_path)
         print(f"  * Copied {file_name}")
 
 
-def install_dependencies(python_cmd: str, lambda_dir: Path, build_dir: Path) -> None:
-    """Install Python dependencies to the build directory with error handling."""
-    requirements_file = lambda_dir / "requirements.txt"
+def _requirements_hash(requirements_file: Path) -> str:
+    """sha256 of requirements.txt, used to tell whether the wheelhouse is current."""
+    return hashlib.sha256(requirements_file.read_bytes()).hexdigest()
 
-    if not requirements_file.exists():
-        raise LambdaBuildError(f"requirements.txt not found at {requirements_file}")
 
-    print(f"Installing dependencies from {requirements_file}...")
-    print(f"Using Python executable: {python_cmd}")
+def _interpreter_key(python_cmd: str) -> str:
+    """Wheel tag of an interpreter, e.g. cpython-311-linux_x86_64.
 
+    Downloaded and installed wheels can be specific to the interpreter
+    version and platform, so everything cached from them is keyed by this.
+    """
     try:
-        # First, validate pip is available
-        pip_check = subprocess.run(
-            [python_cmd, "-m", "pip", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        _, lines = _probe_python(python_cmd)
+    except (OSError, subprocess.SubprocessError):
+        lines = []
+    return lines[2] if len(lines) > 2 else "unknown"
+
+
+def _read_wheelhouse_stamp(wheelhouse: Path, requirements_file: Path) -> Optional[str]:
+    """The stamp of a wheelhouse that is still current, or None.
+
+    The stamp holds the requirements.txt hash followed by the downloaded wheel
+    names. It goes stale when requirements.txt changes or after
+    WHEELHOUSE_MAX_AGE seconds, since the unpinned requirements may have new
+    releases by then.
+    """
+    stamp = wheelhouse / ".req.sha256"
+    try:
+        if time.time() - stamp.stat().st_mtime >= WHEELHOUSE_MAX_AGE:
+            return None
+        content = stamp.read_text()
+    except OSError:
+        return None
+    if content.split("\n", 1)[0] != _requirements_hash(requirements_file):
+        return None
+    return content
+
+
+def _wheelhouse_dir(lambda_dir: Path, python_cmd: str) -> Path:
+    return lambda_dir / ".wheelhouse" / _interpreter_key(python_cmd)
 
-        if pip_check.returncode != 0:
-            raise LambdaBuildError(
-                f"pip is not available with Python executable '{python_cmd}'\n"
-                f"Error: {pip_check.stderr}\n"
-                f"Solution: Install pip or use a different Python executable"
-            )
 
-        print(f"  * Using pip: {pip_check.stdout.strip()}")
+def _ensure_wheelhouse(
+    python_cmd: str, lambda_dir: Path, requirements_file: Path
+) -> Path:
+    """
+    Make sure the local wheelhouse holds the wheels for requirements.txt.
+
+    Each interpreter gets its own wheelhouse. The wheels are downloaded once
+    and a stamp is written next to them; later builds skip the download while
+    the stamp is current (see _read_wheelhouse_stamp).
+
+    Returns:
+        Path to the wheelhouse directory
+    """
+    wheelhouse = _wheelhouse_dir(lambda_dir, python_cmd)
+    stamp = wheelhouse / ".req.sha256"
+    req_hash = _requirements_hash(requirements_file)
+
+    if _read_wheelhouse_stamp(wheelhouse, requirements_file) is not None:
+        print(f"  * Using cached wheels from {wheelhouse}")
+        return wheelhouse
+
+    print(f"  * Downloading wheels into {wheelhouse}...")
+    wheelhouse.mkdir(parents=True, exist_ok=True)
 
-        # Install dependencies with error handling
+    # Download into a private directory and move the files in afterwards, so
+    # a parallel build never sees a partially written wheel
+    download_dir = wheelhouse / f".download-{os.getpid()}"
+    shutil.rmtree(download_dir, ignore_errors=True)
+    try:
         result = subprocess.run(
             [
                 python_cmd,
                 "-m",
                 "pip",
-                "install",
-                "--target",
-                str(build_dir),
+                "download",
+                "--dest",
+                str(download_dir),
                 "-r",
                 str(requirements_file),
-                "--no-deps",  # Avoid conflicts with system packages
-                "--upgrade",
-                "--no-cache-dir",  # Avoid cache issues
+                "--no-deps",
             ],
             capture_output=True,
             text=True,
             cwd=str(lambda_dir),
             timeout=300,  # 5 minute timeout
         )
+        if result.returncode != 0:
+            raise LambdaBuildError(
+                _analyze_pip_error(result, python_cmd, requirements_file)
+            )
+
+        wheel_names = sorted(wheel.name for wheel in download_dir.iterdir())
+        for name in wheel_names:
+            os.replace(download_dir / name, wheelhouse / name)
+    finally:
+        shutil.rmtree(download_dir, ignore_errors=True)
+
+    temp_stamp = stamp.with_name(f"{stamp.name}.{os.getpid()}")
+    temp_stamp.write_text("\n".join([req_hash, *wheel_names]))
+    os.replace(temp_stamp, stamp)
+    return wheelhouse
+
+
+def _link_tree(source_dir: Path, dest_dir: Path, replace: bool = False) -> int:
+    """
+    Recreate source_dir's tree under dest_dir using hardlinks.
+
+    Files are copied instead when hardlinks are not possible (for example
+    across filesystems or on filesystems without link support). replace
+    removes files already at the destination first.
+
+    Returns:
+        Number of files materialized
+    """
+    count = 0
+    for root, dirs, files in os.walk(source_dir):
+        rel_root = Path(root).relative_to(source_dir)
+        target_root = dest_dir / rel_root
+        for dir_name in dirs:
+            (target_root / dir_name).mkdir(parents=True, exist_ok=True)
+        for file_name in files:
+            src = Path(root) / file_name
+            dst = target_root / file_name
+            if replace:
+                dst.unlink(missing_ok=True)
+            _fast_copy(src, dst)
+            count += 1
+    return count
+
+
+# Records which dependency layer an incremental build directory holds
+BUILD_LAYER_STAMP = ".build-layer"
+
+# Downloaded wheels are refreshed after this many seconds, so the unpinned
+# (>=) requirements pick up new releases
+WHEELHOUSE_MAX_AGE = float(os.environ.get("LAMBDA_WHEELHOUSE_MAX_AGE", 24 * 3600))
+
+# Installed paths the Lambda runtime never needs, removed after pip runs.
+# Nothing bundled reads package metadata, so *.dist-info can go too
+STRIP_DIR_NAMES = frozenset({"__pycache__", "tests", "test"})
+STRIP_DIR_SUFFIXES = (".dist-info", ".egg-info")
+STRIP_FILE_SUFFIXES = (".pyi",)
+
+
+def _strip_build_dir(build_dir: Path) -> int:
+    """
+    Delete caches, package metadata, test suites and type stubs from build_dir.
+
+    Returns:
+        Number of files and directories removed
+    """
+    removed = 0
+    stack = [build_dir]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in STRIP_DIR_NAMES or entry.name.endswith(
+                        STRIP_DIR_SUFFIXES
+                    ):
+                        shutil.rmtree(entry.path)
+                        removed += 1
+                    else:
+                        stack.append(Path(entry.path))
+                elif entry.name.endswith(STRIP_FILE_SUFFIXES):
+                    os.unlink(entry.path)
+                    removed += 1
+    return removed
+
+
+def _run_streaming(
+    cmd: List[str], cwd: Path, timeout: float, tail_lines: int = 200
+) -> subprocess.CompletedProcess:
+    """
+    Run a command, printing its combined output as it arrives.
+
+    Only the last tail_lines lines are kept, returned as stdout for error
+    analysis, so long transcripts are never held in memory.
+
+    Raises:
+        subprocess.TimeoutExpired: If the command runs longer than timeout
+    """
+    tail: Deque[str] = deque(maxlen=tail_lines)
+    timed_out = threading.Event()
+
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        cwd=str(cwd),
+    ) as process:
+
+        def kill() -> None:
+            timed_out.set()
+            process.kill()
+
+        # A timer rather than wait(timeout=...), which cannot interrupt the
+        # read loop while the process is alive but silent
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        try:
+            for line in process.stdout:
+                print(f"    {line}", end="")
+                tail.append(line)
+            returncode = process.wait()
+        finally:
+            timer.cancel()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return subprocess.CompletedProcess(cmd, returncode, stdout="".join(tail), stderr="")
+
+
+def _pip_supports_report(pip_version: str) -> bool:
+    """Whether this pip version accepts install --report (added in 22.2)."""
+    try:
+        major, minor = (int(part) for part in pip_version.split(".")[:2])
+    except ValueError:
+        return False
+    return (major, minor) >= (22, 2)
+
+
+def _read_install_report(report_file: Path) -> List[str]:
+    """
+    Read the name==version of every package in a pip install report.
+
+    The report file is removed afterwards; an unreadable report yields [].
+    """
+    try:
+        report = json.loads(report_file.read_text())
+        return [
+            f"{item['metadata']['name']}=={item['metadata']['version']}"
+            for item in report.get("install", [])
+        ]
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
+    finally:
+        report_file.unlink(missing_ok=True)
+
+
+def _layer_dir(lambda_dir: Path, requirements_file: Path, python_cmd: str) -> Path:
+    """Shared installed-dependencies directory for a requirements.txt.
+
+    Keyed by the interpreter tag and the wheelhouse stamp (requirements hash
+    plus wheel names), so another interpreter or a refreshed wheel set never
+    links in extensions installed for a different one.
+    """
+    interpreter = _interpreter_key(python_cmd)
+    wheels = _read_wheelhouse_stamp(
+        _wheelhouse_dir(lambda_dir, python_cmd), requirements_file
+    ) or _requirements_hash(requirements_file)
+    key = hashlib.sha256(f"{interpreter}\0{wheels}".encode()).hexdigest()
+    return lambda_dir / ".layers" / key[:16]
+
+
+def install_dependencies(
+    python_cmd: str, lambda_dir: Path, build_dir: Path, incremental: bool = False
+) -> Path:
+    """
+    Install Python dependencies to the build directory with error handling.
+
+    With incremental, a build directory that already holds the current
+    dependency layer is left as it is.
+
+    Returns:
+        Path to the dependency layer linked into the build directory
+    """
+    requirements_file = lambda_dir / "requirements.txt"
+
+    if not requirements_file.exists():
+        raise LambdaBuildError(f"requirements.txt not found at {requirements_file}")
+
+    print(f"Installing dependencies from {requirements_file}...")
+    print(f"Using Python executable: {python_cmd}")
+
+    try:
+        # First, validate pip is available
+        returncode, lines = _probe_python(python_cmd)
+        if returncode != 0 or len(lines) < 2:
+            raise LambdaBuildError(
+                f"pip is not available with Python executable '{python_cmd}'\n"
+                f"Solution: Install pip or use a different Python executable"
+            )
+
+        print(f"  * Using pip: {lines[1]}")
+
+        wheelhouse = _ensure_wheelhouse(python_cmd, lambda_dir, requirements_file)
+
+        # One installed site-packages layer per requirements.txt and
+        # interpreter, shared by every function and build; builds hardlink it
+        # instead of reinstalling
+        layer_dir = _layer_dir(lambda_dir, requirements_file, python_cmd)
+        stamp = build_dir / BUILD_LAYER_STAMP
+        if incremental and layer_dir.is_dir():
+            try:
+                if stamp.read_text() == layer_dir.name:
+                    print(f"  * Dependency layer {layer_dir.name} already in place")
+                    return layer_dir
+            except OSError:
+                pass
+
+        if layer_dir.is_dir():
+            linked = _link_tree(layer_dir, build_dir, replace=incremental)
+            print(f"  * Reused dependency layer {layer_dir.name} ({linked} files)")
+            if incremental:
+                stamp.write_text(layer_dir.name)
+            return layer_dir
+
+        # Install into a private directory that becomes the layer only once
+        # complete, so parallel builds never link a half-installed layer
+        install_dir = layer_dir.with_name(f"{layer_dir.name}.{os.getpid()}")
+        shutil.rmtree(install_dir, ignore_errors=True)
+        layer_dir.parent.mkdir(parents=True, exist_ok=True)
+
+        # Install from the local wheelhouse only, without touching the network
+        pip_args = [
+            python_cmd,
+            "-m",
+            "pip",
+            "install",
+            "--target",
+            str(install_dir),
+            "-r",
+            str(requirements_file),
+            "--no-deps",  # Avoid conflicts with system packages
+            "--no-index",
+            "--find-links",
+            str(wheelhouse),
+        ]
+        # pip 22.2+ can describe what it installed as JSON
+        report_file = None
+        if _pip_supports_report(lines[1]):
+            report_file = install_dir.with_name(f"{install_dir.name}.report.json")
+            pip_args.extend(["--report", str(report_file)])
+
+        result = _run_streaming(pip_args, cwd=lambda_dir, timeout=300)  # 5 minutes
 
         if result.returncode == 0:
             print("  * Dependencies installed successfully")
-
-            # Show installed packages
-            if result.stdout and "Successfully installed" in result.stdout:
-                installed_packages = [
-                    line
-                    for line in result.stdout.split("\n")
-                    if "Successfully installed" in line
-                ]
-                for line in installed_packages:
-                    print(f"  {line}")
+            if report_file is not None:
+                installed = _read_install_report(report_file)
+                if installed:
+                    print(f"  * Installed: {', '.join(installed)}")
+
+            # Strip the layer once so builds link fewer files
+            _strip_build_dir(install_dir)
+            try:
+                os.replace(install_dir, layer_dir)
+            except OSError:
+                # Another build published the same layer first
+                shutil.rmtree(install_dir, ignore_errors=True)
+            _link_tree(layer_dir, build_dir, replace=incremental)
+            if incremental:
+                stamp.write_text(layer_dir.name)
+            return layer_dir
         else:
+            shutil.rmtree(install_dir, ignore_errors=True)
+            if report_file is not None:
+                report_file.unlink(missing_ok=True)
             # Error analysis
             error_msg = _analyze_pip_error(result, python_cmd, requirements_file)
             raise LambdaBuildError(error_msg)
@@ -227,88 +608,81 @@ def install_dependencies(python_cmd: str, lambda_dir: Path, build_dir: Path) ->
         )
 
 
+# Known pip failure signatures and the guidance shown for each, checked in
+# order against pip's combined output
+_PIP_ERROR_PATTERNS = [
+    (
+        re.compile(r"permission denied|access is denied", re.I),
+        "• PERMISSION ERROR: Insufficient permissions to install packages\n"
+        "  Solutions:\n"
+        "  - Run with administrator/sudo privileges\n"
+        "  - Use virtual environment: python -m venv venv && source venv/bin/activate\n"
+        "  - Install to user directory: pip install --user\n",
+    ),
+    (
+        re.compile(r"externally-managed-environment", re.I),
+        "• EXTERNALLY MANAGED ENVIRONMENT: System Python is protected\n"
+        "  Solutions:\n"
+        "  - Use virtual environment: python -m venv venv && source venv/bin/activate\n"
+        "  - Use --break-system-packages flag (not recommended)\n"
+        "  - Install Python from python.org instead of system package manager\n",
+    ),
+    (
+        re.compile(r"network|connection|timeout|unreachable", re.I),
+        "• NETWORK ERROR: Cannot connect to package repositories\n"
+        "  Solutions:\n"
+        "  - Check internet connection\n"
+        "  - Configure proxy if needed: pip config set global.proxy http://proxy:port\n"
+        "  - Try alternative index: pip install -i https://pypi.org/simple/\n"
+        "  - Retry installation after network issues are resolved\n",
+    ),
+    (
+        re.compile(r"no space left|disk", re.I),
+        "• DISK SPACE ERROR: Insufficient disk space\n"
+        "  Solutions:\n"
+        "  - Free up disk space\n"
+        "  - Clean pip cache: pip cache purge\n"
+        "  - Use different temporary directory\n",
+    ),
+    (
+        re.compile(r"compiler|gcc|visual studio|build tools", re.I),
+        "• COMPILATION ERROR: Missing build tools for native extensions\n"
+        "  Solutions:\n"
+        "  - Windows: Install Microsoft C++ Build Tools\n"
+        "  - macOS: Install Xcode command line tools: xcode-select --install\n"
+        "  - Linux: Install build-essential package\n"
+        "  - Try pre-compiled wheels: pip install --only-binary=all\n",
+    ),
+    (
+        re.compile(r"no module named", re.I),
+        "• MODULE ERROR: Missing Python modules\n"
+        "  Solutions:\n"
+        "  - Ensure pip is up to date: python -m pip install --upgrade pip\n"
+        "  - Check Python installation integrity\n"
+        "  - Reinstall Python if necessary\n",
+    ),
+]
+
+
 def _analyze_pip_error(result, python_cmd: str, requirements_file: Path) -> str:
     """Analyze pip installation errors and provide specific guidance."""
-    error_output = (
-        result.stderr.lower() if hasattr(result, "stderr") and result.stderr else ""
-    )
-    stdout_output = (
-        result.stdout.lower() if hasattr(result, "stdout") and result.stdout else ""
-    )
-    combined_output = f"{error_output} {stdout_output}"
+    stderr = getattr(result, "stderr", None) or ""
+    stdout = getattr(result, "stdout", None) or ""
+    combined_output = f"{stderr} {stdout}"
 
     error_msg = f"Failed to install dependencies from {requirements_file}\n"
 
     # Add raw output for debugging
-    if hasattr(result, "stderr") and result.stderr:
-        error_msg += f"\nSTDERR:\n{result.stderr}\n"
-    if hasattr(result, "stdout") and result.stdout:
-        error_msg += f"\nSTDOUT:\n{result.stdout}\n"
+    if stderr:
+        error_msg += f"\nSTDERR:\n{stderr}\n"
+    if stdout:
+        error_msg += f"\nSTDOUT:\n{stdout}\n"
 
     # Analyze specific error patterns and provide solutions
     error_msg += "\nERROR ANALYSIS AND SOLUTIONS:\n"
-
-    if "permission denied" in combined_output or "access is denied" in combined_output:
-        error_msg += (
-            "• PERMISSION ERROR: Insufficient permissions to install packages\n"
-            "  Solutions:\n"
-            "  - Run with administrator/sudo privileges\n"
-            "  - Use virtual environment: python -m venv venv && source venv/bin/activate\n"
-            "  - Install to user directory: pip install --user\n"
-        )
-
-    if "externally-managed-environment" in combined_output:
-        error_msg += (
-            "• EXTERNALLY MANAGED ENVIRONMENT: System Python is protected\n"
-            "  Solutions:\n"
-            "  - Use virtual environment: python -m venv venv && source venv/bin/activate\n"
-            "  - Use --break-system-packages flag (not recommended)\n"
-            "  - Install Python from python.org instead of system package manager\n"
-        )
-
-    if any(
-        term in combined_output
-        for term in ["network", "connection", "timeout", "unreachable"]
-    ):
-        error_msg += (
-            "• NETWORK ERROR: Cannot connect to package repositories\n"
-            "  Solutions:\n"
-            "  - Check internet connection\n"
-            "  - Configure proxy if needed: pip config set global.proxy http://proxy:port\n"
-            "  - Try alternative index: pip install -i https://pypi.org/simple/\n"
-            "  - Retry installation after network issues are resolved\n"
-        )
-
-    if "no space left" in combined_output or "disk" in combined_output:
-        error_msg += (
-            "• DISK SPACE ERROR: Insufficient disk space\n"
-            "  Solutions:\n"
-            "  - Free up disk space\n"
-            "  - Clean pip cache: pip cache purge\n"
-            "  - Use different temporary directory\n"
-        )
-
-    if any(
-        term in combined_output
-        for term in ["compiler", "gcc", "visual studio", "build tools"]
-    ):
-        error_msg += (
-            "• COMPILATION ERROR: Missing build tools for native extensions\n"
-            "  Solutions:\n"
-            "  - Windows: Install Microsoft C++ Build Tools\n"
-            "  - macOS: Install Xcode command line tools: xcode-select --install\n"
-            "  - Linux: Install build-essential package\n"
-            "  - Try pre-compiled wheels: pip install --only-binary=all\n"
-        )
-
-    if "no module named" in combined_output:
-        error_msg += (
-            "• MODULE ERROR: Missing Python modules\n"
-            "  Solutions:\n"
-            "  - Ensure pip is up to date: python -m pip install --upgrade pip\n"
-            "  - Check Python installation integrity\n"
-            "  - Reinstall Python if necessary\n"
-        )
+    for pattern, guidance in _PIP_ERROR_PATTERNS:
+        if pattern.search(combined_output):
+            error_msg += guidance
 
     # Add general troubleshooting steps
     error_msg += (
@@ -323,8 +697,86 @@ def _analyze_pip_error(result, python_cmd: str, requirements_file: Path) -> str:
     return error_msg
 
 
-def create_zip_file(build_dir: Path, zip_path: Path) -> None:
-    """Create a zip file from the build directory with validation."""
+# Files that are already compressed; deflating them again costs CPU for
+# little or no size reduction
+_PRECOMPRESSED_SUFFIXES = frozenset(
+    {
+        ".zip",
+        ".whl",
+        ".jar",
+        ".gz",
+        ".tgz",
+        ".bz2",
+        ".xz",
+        ".zst",
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".gif",
+        ".webp",
+    }
+)
+
+
+# Payloads smaller than this are stored uncompressed: deflating a few small
+# source files costs more time than the bytes it saves are worth
+STORE_UNCOMPRESSED_BELOW = 256 * 1024
+
+
+def _zip_compress_type(file_path: Path) -> int:
+    """Store already-compressed files as-is and deflate everything else."""
+    if file_path.suffix.lower() in _PRECOMPRESSED_SUFFIXES:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _iter_build_files(root: Path) -> Iterator[Path]:
+    """
+    Yield the files under root that belong in the zip.
+
+    Uses os.scandir so file types come from the directory listing instead of
+    a stat per entry, and skips __pycache__ and compiled/metadata files.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != "__pycache__":
+                        stack.append(Path(entry.path))
+                elif entry.name != BUILD_LAYER_STAMP and not entry.name.endswith(
+                    (".pyc", ".pyo", ".DS_Store", ".gitignore")
+                ):
+                    yield Path(entry.path)
+
+
+def _remove_stale_files(
+    build_dir: Path, source_files: Sequence[str], layer_dir: Path
+) -> int:
+    """
+    Delete files left in a reused build directory by earlier builds.
+
+    Returns:
+        Number of files removed
+    """
+    expected = set(source_files)
+    expected.update(
+        path.relative_to(layer_dir).as_posix() for path in _iter_build_files(layer_dir)
+    )
+    removed = 0
+    for path in _iter_build_files(build_dir):
+        if path.relative_to(build_dir).as_posix() not in expected:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def create_zip_file(build_dir: Path, zip_path: Path, verify: bool = False) -> None:
+    """
+    Create a zip file from the build directory with validation.
+
+    verify additionally CRC-checks every entry of the finished zip.
+    """
     print(f"Creating zip file: {zip_path}")
 
     # Ensure the parent directory exists
@@ -338,32 +790,88 @@ def create_zip_file(build_dir: Path, zip_path: Path) -> None:
         raise LambdaBuildError(f"Build directory does not exist: {build_dir}")
 
     # Count files to be zipped
-    files_to_zip = []
-    for root, dirs, files in os.walk(build_dir):
-        # Skip __pycache__ directories
-        dirs[:] = [d for d in dirs if d != "__pycache__"]
-
-        for file in files:
-            # Skip .pyc files and other unnecessary files
-            if file.endswith((".pyc", ".pyo", ".DS_Store", ".gitignore")):
-                continue
-
-            file_path = Path(root) / file
-            files_to_zip.append(file_path)
+    files_to_zip = list(_iter_build_files(build_dir))
 
     if not files_to_zip:
         raise LambdaBuildError(f"No files found to zip in build directory: {build_dir}")
 
     print(f"  * Found {len(files_to_zip)} files to zip")
 
+    _write_zip(
+        zip_path,
+        [(path, str(path.relative_to(build_dir))) for path in files_to_zip],
+        verify,
+    )
+
+
+def _zip_sources_direct(
+    lambda_dir: Path, source_files: Sequence[str], zip_path: Path, verify: bool = False
+) -> None:
+    """
+    Zip source files straight from the source directory.
+
+    Used for functions without dependencies, which need no build directory.
+    """
+    print(f"Creating zip file: {zip_path}")
+
+    try:
+        zip_path.parent.mkdir(parents=True, exist_ok=True)
+    except Exception as e:
+        raise LambdaBuildError(f"Cannot create parent directory for zip file: {e}")
+
+    _write_zip(zip_path, [(lambda_dir / name, name) for name in source_files], verify)
+
+
+@contextlib.contextmanager
+def _deflate_backend(use_isal: bool) -> Iterator[None]:
+    """
+    Make zipfile deflate with ISA-L while the block runs, when it is installed.
+
+    zipfile looks up its zlib module at call time, and ISA-L's isal_zlib is a
+    drop-in replacement producing standard deflate streams. The swap is
+    process-wide, which is fine since each build runs in its own process.
+    """
+    if not (use_isal and ISAL_AVAILABLE):
+        yield
+        return
+
+    original_zlib = zipfile.zlib
+    zipfile.zlib = isal_zlib
+    try:
+        yield
+    finally:
+        zipfile.zlib = original_zlib
+
+
+def _write_zip(
+    zip_path: Path, entries: List[Tuple[Path, str]], verify: bool = False
+) -> None:
+    """Write (file path, archive name) entries to a zip file and validate it."""
     try:
-        with zipfile.ZipFile(
-            zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=6
+        total_size = sum(os.stat(file_path).st_size for file_path, _ in entries)
+    except OSError as e:
+        raise LambdaBuildError(f"Cannot read file to zip: {e}")
+    store_all = total_size < STORE_UNCOMPRESSED_BELOW
+
+    try:
+        # Level 1 keeps most of the size reduction at a fraction of the CPU
+        with _deflate_backend(not store_all), zipfile.ZipFile(
+            zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1
         ) as zipf:
-            for file_path in files_to_zip:
+            for file_path, arcname in entries:
+                compress_type = (
+                    zipfile.ZIP_STORED if store_all else _zip_compress_type(file_path)
+                )
                 try:
-                    arcname = file_path.relative_to(build_dir)
-                    zipf.write(file_path, arcname)
+                    # One read per file instead of ZipFile.write's 8 KiB chunks;
+                    # from_file keeps the timestamps and permissions write uses
+                    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+                    zipf.writestr(
+                        zinfo,
+                        file_path.read_bytes(),
+                        compress_type=compress_type,
+                        compresslevel=1,
+                    )
                 except Exception as e:
                     raise LambdaBuildError(
                         f"Failed to add file {file_path} to zip: {e}"
@@ -375,11 +883,19 @@ def create_zip_file(build_dir: Path, zip_path: Path) -> None:
         raise LambdaBuildError(f"Unexpected error creating zip file: {e}")
 
     # zip file validation
-    _validate_created_zip_file(zip_path, len(files_to_zip))
+    _validate_created_zip_file(zip_path, len(entries), deep=verify)
 
 
-def _validate_created_zip_file(zip_path: Path, expected_file_count: int) -> None:
-    """Validate the created zip file with checks."""
+def _validate_created_zip_file(
+    zip_path: Path, expected_file_count: int, deep: bool = False
+) -> None:
+    """
+    Validate the created zip file with checks.
+
+    The checks read only the central directory. deep also decompresses and
+    CRC-checks every entry; a zip this process has just written and closed
+    without errors does not need that by default.
+    """
     # Check if file exists
     if not zip_path.exists():
         raise LambdaBuildError(f"Zip file was not created: {zip_path}")
@@ -400,7 +916,7 @@ def _validate_created_zip_file(zip_path: Path, expected_file_count: int) -> None
     try:
         with zipfile.ZipFile(zip_path, "r") as zipf:
             # Test zip file integrity
-            bad_file = zipf.testzip()
+            bad_file = zipf.testzip() if deep else None
             if bad_file:
                 raise LambdaBuildError(
                     f"Created zip file is corrupted (bad file: {bad_file}): {zip_path}"
@@ -457,15 +973,123 @@ def _validate_created_zip_file(zip_path: Path, expected_file_count: int) -> None
     print(f"  * Created zip file ({zip_size:,} bytes)")
 
 
+# Build directories being deleted in the background, joined at exit
+_cleanup_threads: List[threading.Thread] = []
+_cleanup_ids = itertools.count()
+
+
+@atexit.register
+def _wait_for_cleanups() -> None:
+    for thread in _cleanup_threads:
+        thread.join()
+
+
+def _remove_tree_in_background(path: Path) -> None:
+    """
+    Delete a directory tree without making the caller wait for it.
+
+    The tree is first renamed out of the way, so the same path can be
+    recreated immediately; it is deleted in place if the rename fails.
+    """
+    trash = path.with_name(f".{path.name}.deleting-{os.getpid()}-{next(_cleanup_ids)}")
+    try:
+        os.replace(path, trash)
+    except OSError:
+        shutil.rmtree(path)
+        return
+
+    _cleanup_threads[:] = [t for t in _cleanup_threads if t.is_alive()]
+    thread = threading.Thread(
+        target=shutil.rmtree, args=(trash,), kwargs={"ignore_errors": True}, daemon=True
+    )
+    thread.start()
+    _cleanup_threads.append(thread)
+
+
 def cleanup_build_directory(build_dir: Path) -> None:
     """Clean up the build directory after successful zip creation."""
     if build_dir.exists():
-        shutil.rmtree(build_dir)
+        _remove_tree_in_background(build_dir)
         print(f"  * Cleaned up build directory: {build_dir}")
 
 
+def get_zip_path(function_name: str, lambda_dir: Path) -> Path:
+    """Get the output zip path for a Lambda function."""
+    # Determine output location based on function type
+    if function_name == "reddit_populator":
+        # reddit_populator goes in terraform/ root directory
+        terraform_dir = lambda_dir.parent / "terraform"
+    else:
+        # Other functions go in terraform/app-stack/ directory
+        terraform_dir = lambda_dir.parent / "terraform" / "app-stack"
+
+    return terraform_dir / f"{function_name}.zip"
+
+
+def _fingerprint_path(zip_path: Path) -> Path:
+    return zip_path.with_name(f"{zip_path.name}.fingerprint")
+
+
+def function_fingerprint(
+    function_name: str, lambda_dir: Path, python_cmd: Optional[str] = None
+) -> str:
+    """
+    Hash everything a function's zip is built from.
+
+    Covers the source file names and contents, the runtime, and for
+    functions with dependencies requirements.txt and the version of the
+    Python that installs them.
+    """
+    func = LAMBDA_FUNCTIONS[function_name]
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(func.runtime.encode())
+
+    inputs = list(func.source_files)
+    if func.has_dependencies:
+        inputs.append("requirements.txt")
+
+    for file_name in inputs:
+        digest.update(file_name.encode() + b"\0")
+        try:
+            digest.update((lambda_dir / file_name).read_bytes())
+        except FileNotFoundError:
+            # Missing sources never match; the build reports them properly
+            digest.update(b"\0missing")
+        digest.update(b"\0")
+
+    if func.has_dependencies and python_cmd:
+        # Installed wheels can be specific to the interpreter, and a refreshed
+        # wheelhouse may hold newer releases; a stale one never matches, so
+        # the rebuild refreshes it
+        digest.update(f"python={_interpreter_key(python_cmd)}\0".encode())
+        wheels = _read_wheelhouse_stamp(
+            _wheelhouse_dir(lambda_dir, python_cmd), lambda_dir / "requirements.txt"
+        )
+        digest.update(f"wheels={wheels or 'stale'}".encode())
+
+    return digest.hexdigest()
+
+
+def is_build_current(function_name: str, python_cmd: Optional[str] = None) -> bool:
+    """Check whether a function's zip was built from its current sources."""
+    lambda_dir = Path(__file__).parent.resolve()
+    zip_path = get_zip_path(function_name, lambda_dir)
+    try:
+        recorded = _fingerprint_path(zip_path).read_text().strip()
+    except FileNotFoundError:
+        return False
+    return zip_path.exists() and recorded == function_fingerprint(
+        function_name, lambda_dir, python_cmd
+    )
+
+
 def build_lambda_function(
-    function_name: str, cleanup: bool = True, python_cmd: Optional[str] = None
+    function_name: str,
+    cleanup: bool = True,
+    python_cmd: Optional[str] = None,
+    force: bool = False,
+    verify: bool = False,
+    incremental: bool = False,
 ) -> Path:
     """
     Build a single Lambda function with error handling.
@@ -474,6 +1098,10 @@ def build_lambda_function(
         function_name: Name of the Lambda function to build
         cleanup: Whether to clean up build directory after zip creation
         python_cmd: Python executable to use (auto-detected if None)
+        force: Rebuild even if the zip was built from the current sources
+        verify: CRC-check every entry of the created zip
+        incremental: Keep the build directory between builds and only
+            update what changed (implies no cleanup)
 
     Returns:
         Path to the created zip file
@@ -495,15 +1123,11 @@ def build_lambda_function(
     if python_cmd is None:
         python_cmd = _detect_python_executable()
 
-    # Determine output location based on function type
-    if function_name == "reddit_populator":
-        # reddit_populator goes in terraform/ root directory
-        terraform_dir = lambda_dir.parent / "terraform"
-    else:
-        # Other functions go in terraform/app-stack/ directory
-        terraform_dir = lambda_dir.parent / "terraform" / "app-stack"
+    zip_path = get_zip_path(function_name, lambda_dir)
 
-    zip_path = terraform_dir / f"{function_name}.zip"
+    if not force and is_build_current(function_name, python_cmd):
+        print(f"{function_name} is up to date: {zip_path}")
+        return zip_path
 
     print(f"\n=== Building Lambda function: {function_name} ===")
     print(f"Source directory: {lambda_dir}")
@@ -518,22 +1142,39 @@ def build_lambda_function(
         # 2. Validate source files exist
         validate_source_files(lambda_dir, func.source_files)
 
-        # 3. Clean and create build directory
-        _prepare_build_directory(build_dir)
-
-        # 4. Copy source files
-        copy_source_files(lambda_dir, build_dir, func.source_files)
-
-        # 5. Install dependencies if needed
         if func.has_dependencies:
-            install_dependencies(python_cmd, lambda_dir, build_dir)
+            # 3. Clean (or reuse) and create build directory
+            _prepare_build_directory(build_dir, incremental)
 
-        # 6. Create zip file
-        create_zip_file(build_dir, zip_path)
+            # 4. Copy source files
+            copy_source_files(lambda_dir, build_dir, func.source_files, incremental)
 
-        # 7. Cleanup build directory
-        if cleanup:
-            cleanup_build_directory(build_dir)
+            # 5. Install dependencies
+            layer_dir = install_dependencies(
+                python_cmd, lambda_dir, build_dir, incremental
+            )
+            removed = _strip_build_dir(build_dir)
+            if removed:
+                print(f"  * Stripped {removed} unneeded files and directories")
+            if incremental:
+                stale = _remove_stale_files(build_dir, func.source_files, layer_dir)
+                if stale:
+                    print(f"  * Removed {stale} stale files")
+
+            # 6. Create zip file
+            create_zip_file(build_dir, zip_path, verify)
+
+            # 7. Cleanup build directory
+            if cleanup and not incremental:
+                cleanup_build_directory(build_dir)
+        else:
+            # Sources only: zip them in place, no build directory needed
+            _zip_sources_direct(lambda_dir, func.source_files, zip_path, verify)
+
+        # Record what the zip was built from
+        _fingerprint_path(zip_path).write_text(
+            function_fingerprint(function_name, lambda_dir, python_cmd)
+        )
 
         print(f"Successfully built {function_name}")
         return zip_path
@@ -553,6 +1194,39 @@ def build_lambda_function(
         )
 
 
+# Prints the interpreter version, then pip's, then the interpreter's wheel tag
+# (e.g. cpython-311-linux_x86_64); a failed pip import leaves only the first line
+_PYTHON_PROBE = (
+    "import sys, sysconfig; print(sys.version.split()[0]); "
+    "import pip; print(pip.__version__); "
+    "print(sys.implementation.cache_tag + '-' "
+    "+ sysconfig.get_platform().replace('-', '_').replace('.', '_'))"
+)
+
+
+@lru_cache(maxsize=8)
+def _probe_python(python_cmd: str) -> Tuple[int, List[str]]:
+    """Run one interpreter + pip probe, cached per command for the whole run.
+
+    Returns:
+        Tuple of (return code, output lines)
+
+    Raises:
+        FileNotFoundError: If the executable does not exist (not cached)
+    """
+    # stderr is never read, so it is discarded instead of buffered; the probe
+    # only imports pip, which finishes well within the timeout
+    result = subprocess.run(
+        [python_cmd, "-c", _PYTHON_PROBE],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        timeout=5,
+    )
+    return result.returncode, result.stdout.split()
+
+
+@lru_cache(maxsize=None)
 def _detect_python_executable() -> str:
     """Detect the best Python executable to use for building."""
     if PYTHON_DETECTOR_AVAILABLE:
@@ -592,13 +1266,8 @@ def _detect_python_executable() -> str:
         try:
             if shutil.which(cmd):
                 # Test if command works and has pip
-                result = subprocess.run(
-                    [cmd, "-m", "pip", "--version"],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                )
-                if result.returncode == 0:
+                returncode, _ = _probe_python(cmd)
+                if returncode == 0:
                     return cmd
         except Exception:
             continue
@@ -611,18 +1280,9 @@ def _validate_build_prerequisites(
     lambda_dir: Path, python_cmd: str, func: LambdaFunction
 ) -> None:
     """Validate all prerequisites for building a Lambda function."""
-    # Check Python executable
+    # Python and pip versions come from a single (cached) probe
     try:
-        result = subprocess.run(
-            [python_cmd, "--version"], capture_output=True, text=True, timeout=10
-        )
-        if result.returncode != 0:
-            raise LambdaBuildError(
-                f"Python executable '{python_cmd}' is not working\n"
-                f"Error: {result.stderr}\n"
-                f"Try using a different Python executable or reinstalling Python"
-            )
-        print(f"  * Python version: {result.stdout.strip()}")
+        returncode, lines = _probe_python(python_cmd)
     except FileNotFoundError:
         raise LambdaBuildError(
             f"Python executable '{python_cmd}' not found\n"
@@ -636,24 +1296,21 @@ def _validate_build_prerequisites(
             f"Python executable '{python_cmd}' timed out - may be broken"
         )
 
+    if not lines:
+        raise LambdaBuildError(
+            f"Python executable '{python_cmd}' is not working\n"
+            f"Try using a different Python executable or reinstalling Python"
+        )
+    print(f"  * Python version: {lines[0]}")
+
     # Check pip availability if dependencies are needed
     if func.has_dependencies:
-        try:
-            result = subprocess.run(
-                [python_cmd, "-m", "pip", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10,
+        if returncode != 0 or len(lines) < 2:
+            raise LambdaBuildError(
+                f"pip is not available with Python executable '{python_cmd}'\n"
+                f"Solution: Install pip or use a different Python executable"
             )
-            if result.returncode != 0:
-                raise LambdaBuildError(
-                    f"pip is not available with Python executable '{python_cmd}'\n"
-                    f"Error: {result.stderr}\n"
-                    f"Solution: Install pip or use a different Python executable"
-                )
-            print(f"  * pip version: {result.stdout.strip()}")
-        except Exception as e:
-            raise LambdaBuildError(f"Cannot validate pip availability: {e}")
+        print(f"  * pip version: {lines[1]}")
 
     # Check requirements.txt if dependencies are needed
     if func.has_dependencies:
@@ -679,10 +1336,14 @@ def _validate_build_prerequisites(
             raise LambdaBuildError(f"Cannot read requirements.txt: {e}")
 
 
-def _prepare_build_directory(build_dir: Path) -> None:
-    """Prepare the build directory with proper error handling."""
+def _prepare_build_directory(build_dir: Path, incremental: bool = False) -> None:
+    """
+    Prepare the build directory with proper error handling.
+
+    An existing directory is emptied, or kept as it is with incremental.
+    """
     try:
-        if build_dir.exists():
+        if build_dir.exists() and not incremental:
             shutil.rmtree(build_dir)
         build_dir.mkdir(parents=True, exist_ok=True)
         print(f"  * Prepared build directory: {build_dir}")
@@ -702,23 +1363,247 @@ def _cleanup_on_failure(build_dir: Path) -> None:
     """Clean up build directory on failure."""
     try:
         if build_dir.exists():
-            shutil.rmtree(build_dir)
+            _remove_tree_in_background(build_dir)
     except Exception:
         # Don't raise errors during cleanup
         pass
 
 
+def _cgroup_cpu_quota() -> Optional[float]:
+    """CPU limit of the current container in CPUs, or None if unlimited."""
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()[:2]
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1: quota is -1 when unlimited
+        cpu_dir = Path("/sys/fs/cgroup/cpu")
+        quota_us = int((cpu_dir / "cpu.cfs_quota_us").read_text())
+        period_us = int((cpu_dir / "cpu.cfs_period_us").read_text())
+        if quota_us > 0 and period_us > 0:
+            return quota_us / period_us
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _effective_cpu_count() -> int:
+    """CPUs this process may actually use, honouring affinity and container limits."""
+    if hasattr(os, "sched_getaffinity"):
+        # Respects CPU affinity (taskset, CI runner pinning) on Linux
+        cpu_count = len(os.sched_getaffinity(0))
+    else:
+        cpu_count = os.cpu_count() or 2
+
+    # Docker --cpus / CI quotas are invisible to affinity and cpu_count
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpu_count = min(cpu_count, max(1, math.ceil(quota)))
+    return cpu_count
+
+
+def _default_max_workers() -> int:
+    """Number of parallel builds to run by default: usable CPUs minus one."""
+    return max(1, _effective_cpu_count() - 1)
+
+
+def _build_with_captured_output(
+    function_name: str,
+    cleanup: bool,
+    python_cmd: Optional[str],
+    force: bool,
+    verify: bool,
+    incremental: bool,
+) -> Tuple[str, bool, str, str]:
+    """
+    Build one function, capturing its progress output instead of printing it.
+
+    Returns:
+        Tuple of (function_name, success, zip path or error, captured output)
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            zip_path = build_lambda_function(
+                function_name,
+                cleanup=cleanup,
+                python_cmd=python_cmd,
+                force=force,
+                verify=verify,
+                incremental=incremental,
+            )
+            success, message = True, str(zip_path)
+        except Exception as e:
+            success, message = False, str(e)
+    return function_name, success, message, output.getvalue()
+
+
+def build_functions_parallel(
+    function_names: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    cleanup: bool = True,
+    python_cmd: Optional[str] = None,
+    results: Optional[Dict[str, Tuple[bool, str]]] = None,
+    force: bool = True,
+    verify: bool = False,
+    incremental: bool = False,
+) -> Dict[str, Tuple[bool, str]]:
+    """
+    Build several Lambda functions at once in a process pool.
+
+    Each function already builds in its own build directory, so the builds
+    are independent. Each build's output is printed in one piece when it
+    finishes so logs from different functions do not interleave.
+
+    Args:
+        function_names: Functions to build (all of LAMBDA_FUNCTIONS if None)
+        max_workers: Maximum number of parallel builds (usable CPUs minus one
+            if None)
+        cleanup: Whether to clean up build directories after zip creation
+        python_cmd: Python executable to use (auto-detected if None)
+        results: Optional dictionary to record results into as builds
+            finish, so they survive if the pool itself fails
+        force: Rebuild functions even if their zips are up to date
+        verify: CRC-check every entry of the created zips
+        incremental: Keep build directories and only update what changed
+
+    Returns:
+        Dictionary mapping function names to (success, zip path or error) tuples
+    """
+    if results is None:
+        results = {}
+    if function_names is None:
+        function_names = list(LAMBDA_FUNCTIONS.keys())
+    if not function_names:
+        return results
+
+    # Detect once here rather than once per worker
+    if python_cmd is None:
+        python_cmd = _detect_python_executable()
+    if max_workers is None:
+        max_workers = _default_max_workers()
+    max_workers = max(1, min(max_workers, len(function_names)))
+
+    print(
+        f"\nBuilding {len(function_names)} Lambda functions in parallel "
+        f"(max {max_workers} workers)..."
+    )
+    print(f"Using Python executable: {python_cmd}")
+
+    # Separate processes so the Python-side work of each build (zipping,
+    # path handling) runs truly in parallel; spawn behaves the same on every OS
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        future_to_function = {
+            executor.submit(
+                _build_with_captured_output,
+                name,
+                cleanup,
+                python_cmd,
+                force,
+                verify,
+                incremental,
+            ): name
+            for name in function_names
+        }
+        for future in concurrent.futures.as_completed(future_to_function):
+            function_name = future_to_function[future]
+            try:
+                _, success, message, output = future.result()
+            except Exception as e:
+                results[function_name] = (False, f"Unexpected error: {e}")
+                print(f"  [ERROR] {function_name}: Unexpected error: {e}")
+                continue
+            results[function_name] = (success, message)
+            print(output, end="")
+            status = "OK" if success else "FAIL"
+            print(f"  [{status}] {function_name}: {message}")
+
+    return results
+
+
 def main():
     """Main entry point for building a single Lambda function."""
-    if len(sys.argv) != 2:
-        print("Usage: python build_lambda.py <function_name>")
-        print(f"Available functions: {', '.join(LAMBDA_FUNCTIONS.keys())}")
-        sys.exit(1)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build Lambda functions")
+    parser.add_argument(
+        "function_name",
+        nargs="?",
+        choices=list(LAMBDA_FUNCTIONS.keys()),
+        help="Name of the Lambda function to build",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Build every Lambda function in parallel",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Maximum number of parallel builds with --all (default: usable CPUs minus one)",
+    )
+    parser.add_argument(
+        "--python-cmd",
+        type=str,
+        help="Python executable to use for building (auto-detected if not specified)",
+    )
+    parser.add_argument(
+        "--no-cleanup",
+        action="store_true",
+        help="Skip cleanup of the build directory after zip creation",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild even if the zip was built from the current sources",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="CRC-check every file in the created zips",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep build directories and only update changed files (for local development)",
+    )
+    args = parser.parse_args()
 
-    function_name = sys.argv[1]
+    if args.all == bool(args.function_name):
+        parser.error("specify either a function name or --all")
 
     try:
-        zip_path = build_lambda_function(function_name)
+        if args.all:
+            results = build_functions_parallel(
+                max_workers=args.jobs,
+                cleanup=not args.no_cleanup,
+                python_cmd=args.python_cmd,
+                force=args.force,
+                verify=args.verify,
+                incremental=args.incremental,
+            )
+            failed = [name for name, (success, _) in results.items() if not success]
+            if failed:
+                print(f"\nBuild failed for: {', '.join(failed)}")
+                sys.exit(1)
+            print(f"\nBuilt {len(results)} functions successfully!")
+            return
+
+        zip_path = build_lambda_function(
+            args.function_name,
+            cleanup=not args.no_cleanup,
+            python_cmd=args.python_cmd,
+            force=args.force,
+            verify=args.verify,
+            incremental=args.incremental,
+        )
         print("\nBuild completed successfully!")
         print(f"Output: {zip_path}")
 
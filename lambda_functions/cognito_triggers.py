@@ -1,11 +1,13 @@
-import json
 import logging
 import time
-from functools import lru_cache
 from typing import Any, Dict, Tuple
 
-import boto3
-from aws_clients import OPTIMIZED_CONFIG, performance_monitor
+from aws_clients import (
+    flush_metrics_on_return,
+    get_cognito_idp_client,
+    json_dumps,
+    performance_monitor,
+)
 from botocore.exceptions import ClientError
 
 # Configure logging
@@ -13,10 +15,40 @@ logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
-@lru_cache(maxsize=None)
-def get_cognito_client():
-    """Get Cognito client with connection pooling."""
-    return boto3.client("cognito-idp", config=OPTIMIZED_CONFIG)
+# Email templates are rendered once at import; only the code is filled in per call
+_EMAIL_HTML_TEMPLATE = """<html>
+<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+        <h2 style="color: #2c3e50;">Your Confirmation Code</h2>
+
+        <p><strong>Your confirmation code is: <span style="font-size: 24px; font-weight: bold; color: #3498db; background: #f8f9fa; padding: 10px; border-radius: 5px; display: inline-block;">{code}</span></strong></p>
+
+        <p>Please enter this code to complete your account verification.</p>
+
+        <p style="color: #e74c3c;"><strong>This code will expire in 15 minutes for security purposes.</strong></p>
+
+        <p style="color: #7f8c8d; font-size: 14px;">If you didn't {action_text} this code, please ignore this email.</p>
+
+        <hr style="border: none; height: 1px; background: #ecf0f1; margin: 20px 0;">
+
+        <p style="color: #7f8c8d; font-size: 14px;">
+            Best regards,<br>
+            <strong>Lenslate Team</strong>
+        </p>
+    </div>
+</body>
+</html>"""
+
+_RESPONSE_TEMPLATES = {
+    False: (
+        "Your verification code: {code}",
+        _EMAIL_HTML_TEMPLATE.replace("{action_text}", "request"),
+    ),
+    True: (
+        "Your new verification code: {code}",
+        _EMAIL_HTML_TEMPLATE.replace("{action_text}", "resend"),
+    ),
+}
 
 
 def extract_email_and_code(event: Dict[str, Any]) -> Tuple[str, str]:
@@ -51,38 +83,10 @@ def set_cognito_response_messages(
         code: The verification code to include in the email
         is_resend: Whether this is a resend request (affects messaging)
     """
-    subject_prefix = (
-        "Your new verification code" if is_resend else "Your verification code"
-    )
-    subject = f"{subject_prefix}: {code}"
-
-    action_text = "resend" if is_resend else "request"
-
-    html_message = f"""<html>
-<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-        <h2 style="color: #2c3e50;">Your Confirmation Code</h2>
-
-        <p><strong>Your confirmation code is: <span style="font-size: 24px; font-weight: bold; color: #3498db; background: #f8f9fa; padding: 10px; border-radius: 5px; display: inline-block;">{code}</span></strong></p>
-
-        <p>Please enter this code to complete your account verification.</p>
-
-        <p style="color: #e74c3c;"><strong>This code will expire in 15 minutes for security purposes.</strong></p>
-
-        <p style="color: #7f8c8d; font-size: 14px;">If you didn't {action_text} this code, please ignore this email.</p>
-
-        <hr style="border: none; height: 1px; background: #ecf0f1; margin: 20px 0;">
-
-        <p style="color: #7f8c8d; font-size: 14px;">
-            Best regards,<br>
-            <strong>Lenslate Team</strong>
-        </p>
-    </div>
-</body>
-</html>"""
+    subject_template, message_template = _RESPONSE_TEMPLATES[bool(is_resend)]
 
-    event["response"]["emailMessage"] = html_message.strip()
-    event["response"]["emailSubject"] = subject
+    event["response"]["emailMessage"] = message_template.format(code=code)
+    event["response"]["emailSubject"] = subject_template.format(code=code)
 
 
 def handle_pre_signup(event: Dict[str, Any]) -> Dict[str, Any]:
@@ -103,7 +107,7 @@ def handle_pre_signup(event: Dict[str, Any]) -> Dict[str, Any]:
     logger.info(f"[CHECK] Checking if user {email} already exists")
 
     try:
-        cognito_client = get_cognito_client()
+        cognito_client = get_cognito_idp_client()
         start_time = time.time()
 
         user_response = cognito_client.admin_get_user(
@@ -155,6 +159,7 @@ def handle_pre_signup(event: Dict[str, Any]) -> Dict[str, Any]:
             return event
 
 
+@flush_metrics_on_return
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Cognito Lambda trigger to handle various Cognito events
@@ -162,7 +167,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
     logger.info("[START] COGNITO TRIGGER RECEIVED!")
     logger.info(f"[TRIGGER] Trigger Source: {event.get('triggerSource', 'UNKNOWN')}")
-    logger.info(f"[EVENT] Full Event: {json.dumps(event, indent=2)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[EVENT] Full Event: %s", json_dumps(event, default=str))
 
     trigger = event.get("triggerSource")
 
@@ -186,7 +192,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
     else:
         logger.warning(f"[WARNING] UNHANDLED TRIGGER: {trigger}")
-        logger.info(f"[EVENT] Event structure: {json.dumps(event, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[EVENT] Event structure: %s", json_dumps(event, default=str))
 
     logger.info(f"[COMPLETE] Lambda execution completed for trigger: {trigger}")
     performance_monitor.persist_metrics()
@@ -1,11 +1,27 @@
-import json
+import hashlib
+import hmac
+import logging
 import os
+import re
 import time
-from typing import Any, Dict, List
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import quote
 
-from aws_clients import get_s3_client, performance_monitor
+from aws_clients import (
+    flush_metrics_on_return,
+    gather_calls,
+    get_frozen_credentials,
+    get_s3_client,
+    json_dumps,
+    performance_monitor,
+)
 from botocore.exceptions import ClientError
 
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
 
 def create_cors_headers() -> Dict[str, str]:
     """Create CORS headers for the API response"""
@@ -21,7 +37,7 @@ def create_error_response(status_code: int, error_message: str) -> Dict[str, Any
     return {
         "statusCode": status_code,
         "headers": create_cors_headers(),
-        "body": json.dumps({"error": error_message}),
+        "body": json_dumps({"error": error_message}),
     }
 
 
@@ -30,10 +46,129 @@ def create_success_response(data: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "statusCode": 200,
         "headers": create_cors_headers(),
-        "body": json.dumps(data),
+        "body": json_dumps(data),
     }
 
 
+# Presigned gallery URLs stay valid this long (seconds)
+PRESIGNED_URL_EXPIRY = 3600
+
+# Only keys with these extensions (compared lowercased) are listed
+IMAGE_EXTENSIONS = frozenset({"png", "jpg", "jpeg", "gif", "bmp", "webp"})
+
+# Buckets that can be addressed as <bucket>.s3.<region>.amazonaws.com
+_VIRTUAL_HOST_BUCKET = re.compile(r"^[a-z0-9][a-z0-9-]{1,61}[a-z0-9]$")
+
+
+def _hmac_sha256(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+
+class SigV4Presigner:
+    """Presigns S3 GetObject URLs for one bucket with SigV4 query auth.
+
+    botocore re-resolves the endpoint and re-derives the signing key on every
+    generate_presigned_url call. For a gallery listing every URL shares the
+    bucket, credentials and timestamp, so the key is derived once and each
+    URL only costs one SHA-256 and one HMAC.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        region: str,
+        credentials: Any,
+        expires_in: int = PRESIGNED_URL_EXPIRY,
+        now: Optional[datetime] = None,
+        endpoint_host: Optional[str] = None,
+    ):
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        datestamp = amz_date[:8]
+        scope = f"{datestamp}/{region}/s3/aws4_request"
+
+        endpoint_host = endpoint_host or f"s3.{region}.amazonaws.com"
+        self._host = f"{bucket}.{endpoint_host}"
+        params = {
+            "X-Amz-Algorithm": "AWS4-HMAC-SHA256",
+            "X-Amz-Credential": f"{credentials.access_key}/{scope}",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(expires_in),
+            "X-Amz-SignedHeaders": "host",
+        }
+        if credentials.token:
+            params["X-Amz-Security-Token"] = credentials.token
+        self._query = "&".join(
+            f"{name}={quote(value, safe='-_.~')}"
+            for name, value in sorted(params.items())
+        )
+        self._string_to_sign_prefix = f"AWS4-HMAC-SHA256\n{amz_date}\n{scope}\n"
+
+        key = _hmac_sha256(f"AWS4{credentials.secret_key}".encode("utf-8"), datestamp)
+        for part in (region, "s3", "aws4_request"):
+            key = _hmac_sha256(key, part)
+        self._signing_key = key
+
+    def url(self, key: str) -> str:
+        path = quote("/" + key, safe="/-_.~")
+        canonical_request = (
+            f"GET\n{path}\n{self._query}\nhost:{self._host}\n\nhost\nUNSIGNED-PAYLOAD"
+        )
+        string_to_sign = (
+            self._string_to_sign_prefix
+            + hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()
+        )
+        signature = hmac.new(
+            self._signing_key, string_to_sign.encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+        return f"https://{self._host}{path}?{self._query}&X-Amz-Signature={signature}"
+
+
+def _standard_endpoint_host(endpoint_url: str, region: str) -> Optional[str]:
+    """S3 host for a standard AWS endpoint URL, or None for custom endpoints.
+
+    us-east-1 clients use the global s3.amazonaws.com endpoint, which is
+    signed for us-east-1 like the regional one.
+    """
+    if endpoint_url == f"https://s3.{region}.amazonaws.com":
+        return f"s3.{region}.amazonaws.com"
+    if region == "us-east-1" and endpoint_url == "https://s3.amazonaws.com":
+        return "s3.amazonaws.com"
+    return None
+
+
+def make_url_signer(s3_client: Any, bucket: str) -> Callable[[str], str]:
+    """Return a key -> presigned GetObject URL function for the bucket.
+
+    Uses SigV4Presigner when the client talks to a standard regional or the
+    us-east-1 global endpoint, and falls back to botocore for custom
+    endpoints, path-style addressing, bucket names that cannot be
+    virtual-hosted, or missing credentials.
+    """
+    region = s3_client.meta.region_name
+    s3_config = s3_client.meta.config.s3 or {}
+    endpoint_host = _standard_endpoint_host(s3_client.meta.endpoint_url, region)
+    credentials = get_frozen_credentials()
+    if (
+        credentials is not None
+        and endpoint_host is not None
+        and s3_config.get("addressing_style") in (None, "auto", "virtual")
+        and _VIRTUAL_HOST_BUCKET.match(bucket)
+    ):
+        return SigV4Presigner(
+            bucket, region, credentials, endpoint_host=endpoint_host
+        ).url
+
+    def presign(key: str) -> str:
+        return s3_client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": bucket, "Key": key},
+            ExpiresIn=PRESIGNED_URL_EXPIRY,
+        )
+
+    return presign
+
+
 def list_images_from_s3(bucket: str, prefix: str = "reddit/") -> List[Dict[str, str]]:
     """
     Lists all images from an S3 bucket under a specified prefix
@@ -43,13 +178,15 @@ def list_images_from_s3(bucket: str, prefix: str = "reddit/") -> List[Dict[str,
         prefix: The prefix to filter images by
 
     Returns:
-        A list of dictionaries, each representing an image with a presigned URL
+        A list of dictionaries, each representing an image with a presigned URL,
+        in listing order; lambda_handler sorts and numbers the merged list
     """
     images = []
     start_time = time.time()
 
     try:
         s3_client = get_s3_client()
+        presign = make_url_signer(s3_client, bucket)
         paginator = s3_client.get_paginator("list_objects_v2")
         page_iterator = paginator.paginate(Bucket=bucket, Prefix=prefix)
 
@@ -57,20 +194,9 @@ def list_images_from_s3(bucket: str, prefix: str = "reddit/") -> List[Dict[str,
             if "Contents" in page:
                 for obj in page["Contents"]:
                     key = obj["Key"]
-                    image_extensions = (
-                        ".png",
-                        ".jpg",
-                        ".jpeg",
-                        ".gif",
-                        ".bmp",
-                        ".webp",
-                    )
-                    if key.lower().endswith(image_extensions):
-                        presigned_url = s3_client.generate_presigned_url(
-                            "get_object",
-                            Params={"Bucket": bucket, "Key": key},
-                            ExpiresIn=3600,
-                        )
+                    _, dot, extension = key.rpartition(".")
+                    if dot and extension.lower() in IMAGE_EXTENSIONS:
+                        presigned_url = presign(key)
                         filename = key.split("/")[-1]
                         alt_text = (
                             filename.replace("_", " ")
@@ -84,7 +210,6 @@ def list_images_from_s3(bucket: str, prefix: str = "reddit/") -> List[Dict[str,
 
                         images.append(
                             {
-                                "id": len(images) + 1,
                                 "src": presigned_url,
                                 "alt": alt_text,
                                 "key": key,
@@ -96,27 +221,24 @@ def list_images_from_s3(bucket: str, prefix: str = "reddit/") -> List[Dict[str,
                             }
                         )
 
-        # Sort images by timestamp (newest first)
-        images.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
-
-        # Re-assign IDs after sorting
-        for i, image in enumerate(images):
-            image["id"] = i + 1
-
         duration = time.time() - start_time
         performance_monitor.record_operation("s3_list_objects", duration, True)
-        print(
-            f"Found {len(images)} images in bucket {bucket} under prefix {prefix} (sorted by newest first)"
+        logger.info(
+            "Found %d images in bucket %s under prefix %s",
+            len(images),
+            bucket,
+            prefix,
         )
         return images
 
     except ClientError as e:
         duration = time.time() - start_time
         performance_monitor.record_operation("s3_list_objects", duration, False)
-        print(f"Error listing objects from S3: {e}")
+        logger.error("Error listing objects from S3: %s", e)
         raise e
 
 
+@flush_metrics_on_return
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda function to list all images from the S3 bucket
@@ -127,14 +249,18 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             return create_success_response({"message": "CORS preflight successful"})
 
         bucket_name = os.environ.get("S3_BUCKET", "lenslate-image-storage")
-        images = []
         prefixes = ["reddit/", "mmid/"]
 
-        for p in prefixes:
+        def list_prefix(p: str) -> List[Dict[str, Any]]:
             try:
-                images.extend(list_images_from_s3(bucket_name, p))
+                return list_images_from_s3(bucket_name, p)
             except Exception as e:
-                print(f"[WARNING] Failed to list images for prefix {p}: {e}")
+                logger.warning("Failed to list images for prefix %s: %s", p, e)
+                return []
+
+        # The prefixes are independent, so their listings and presigning overlap
+        results = gather_calls(*(partial(list_prefix, p) for p in prefixes))
+        images = [image for result in results for image in result]
 
         # Sort all images by timestamp (newest first) across all prefixes
         images.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
@@ -143,7 +269,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         for i, image in enumerate(images):
             image["id"] = i + 1
 
-        print(f"Final gallery: {len(images)} images sorted by newest first")
+        logger.info("Final gallery: %d images sorted by newest first", len(images))
 
         performance_monitor.persist_metrics()
         return create_success_response(
@@ -157,10 +283,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         )
 
     except ClientError as e:
-        print(f"AWS Client Error: {e}")
+        logger.error("AWS Client Error: %s", e)
         performance_monitor.persist_metrics()
         return create_error_response(500, f"AWS Error: {str(e)}")
     except Exception as e:
-        print(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         performance_monitor.persist_metrics()
         return create_error_response(500, f"Internal server error: {str(e)}")
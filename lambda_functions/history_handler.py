@@ -1,9 +1,13 @@
-import json
+import logging
 import os
 
 import boto3
+from aws_clients import json_dumps
 from boto3.dynamodb.conditions import Key
 
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
 # Global variables for lazy initialization
 _dynamodb = None
 _history_table = None
@@ -40,6 +44,18 @@ def _get_translations_table():
     return _translations_table
 
 
+# Lambda runs module code in its init phase, so create the tables there when
+# the function is configured; the first invocation then skips the setup. Local
+# runs and tests without the variables keep the lazy path and its errors.
+if (
+    os.getenv("AWS_REGION")
+    and os.getenv("TRANSLATION_HISTORY_TABLE")
+    and os.getenv("TRANSLATIONS_TABLE")
+):
+    _get_history_table()
+    _get_translations_table()
+
+
 def get_history_table():
     return _get_history_table()
 
@@ -108,11 +124,14 @@ def list_history(event, context):
 
     """
     user_id = _get_user_id(event)
-    print(f"DEBUG: list_history - user_id extracted: {user_id}")
-    print(f"DEBUG: list_history - event structure: {json.dumps(event, default=str)}")
+    logger.debug("list_history - user_id extracted: %s", user_id)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "list_history - event structure: %s", json_dumps(event, default=str)
+        )
 
     if not user_id:
-        return {"statusCode": 401, "body": json.dumps({"error": "Unauthorized"})}
+        return {"statusCode": 401, "body": json_dumps({"error": "Unauthorized"})}
 
     resp = get_history_table().query(
         KeyConditionExpression=Key("user_id").eq(user_id),
@@ -120,7 +139,7 @@ def list_history(event, context):
         ExpressionAttributeNames={"#ts": "timestamp"},
     )
     items = resp.get("Items", [])
-    print(f"DEBUG: list_history - DynamoDB query returned {len(items)} items")
+    logger.debug("list_history - DynamoDB query returned %d items", len(items))
 
     history_list = []
     for it in items:
@@ -135,17 +154,17 @@ def list_history(event, context):
             }
         )
 
-    print(f"DEBUG: list_history - returning {len(history_list)} history items")
+    logger.debug("list_history - returning %d history items", len(history_list))
     return {
         "statusCode": 200,
-        "body": json.dumps({"user_id": user_id, "history": history_list}),
+        "body": json_dumps({"user_id": user_id, "history": history_list}),
     }
 
 
 def get_history_item(event, context):
     user_id = _get_user_id(event)
     if not user_id:
-        return {"statusCode": 401, "body": json.dumps({"error": "Unauthorized"})}
+        return {"statusCode": 401, "body": json_dumps({"error": "Unauthorized"})}
 
     # Path parameter binding via API Gateway
     path_params = event.get("pathParameters") or {}
@@ -153,7 +172,7 @@ def get_history_item(event, context):
     if not history_id:
         return {
             "statusCode": 400,
-            "body": json.dumps({"error": "Missing history_id in path"}),
+            "body": json_dumps({"error": "Missing history_id in path"}),
         }
 
     # Fetch history record
@@ -164,27 +183,30 @@ def get_history_item(event, context):
     if not hist_item:
         return {
             "statusCode": 404,
-            "body": json.dumps({"error": "History record not found"}),
+            "body": json_dumps({"error": "History record not found"}),
         }
 
-    translation_id = hist_item["translation_id"]
     image_key = hist_item["image_key"]
     src, tgt = hist_item["lang_pair"].split("#", 1)
 
-    # Fetch translation data
-    trans_resp = get_translations_table().get_item(
-        Key={"translation_id": translation_id}
-    )
-    trans_item = trans_resp.get("Item")
-    if not trans_item:
-        return {
-            "statusCode": 502,
-            "body": json.dumps({"error": "Translation record missing"}),
-        }
+    if "translated_text" in hist_item:
+        # Newer records carry the texts themselves; skip the second round-trip
+        trans_item = hist_item
+    else:
+        # Fetch translation data
+        trans_resp = get_translations_table().get_item(
+            Key={"translation_id": hist_item["translation_id"]}
+        )
+        trans_item = trans_resp.get("Item")
+        if not trans_item:
+            return {
+                "statusCode": 502,
+                "body": json_dumps({"error": "Translation record missing"}),
+            }
 
     return {
         "statusCode": 200,
-        "body": json.dumps(
+        "body": json_dumps(
             {
                 "history_id": history_id,
                 "image_name": image_key,
@@ -9,14 +9,16 @@ This module processes uploaded images by:
 """
 
 import hashlib
-import json
 import logging
 import os
 import random
+import threading
 import time
 import urllib.parse
 import uuid
-from typing import Any, Dict, Optional, cast
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 from botocore.exceptions import ClientError
 
@@ -28,6 +30,14 @@ except ImportError:
     PSUTIL_AVAILABLE = False
 
 from aws_clients import (
+    flush_metrics_on_return,
+    get_comprehend_client,
+    get_dynamodb_client,
+    get_rekognition_client,
+    get_s3_client,
+    get_translate_client,
+    json_dumps,
+    json_loads,
     performance_monitor,
     safe_comprehend_call,
     safe_rekognition_call,
@@ -35,6 +45,14 @@ from aws_clients import (
 )
 from history_handler import _get_user_id, get_history_table, get_translations_table
 
+# Build the cached AWS clients during the Lambda init phase so warm and cold
+# requests alike skip client construction
+get_rekognition_client()
+get_comprehend_client()
+get_translate_client()
+get_s3_client()
+get_dynamodb_client()
+
 # Configure structured logging for CloudWatch
 logger = logging.getLogger()
 
@@ -120,15 +138,29 @@ class CloudWatchFormatter(logging.Formatter):
                 if attr_value is not None:  # Only include non-None values
                     log_entry[attr_name] = attr_value
 
-        return json.dumps(log_entry, default=str, separators=(",", ":"))
+        return json_dumps(log_entry, default=str)
 
 
 formatter = CloudWatchFormatter()
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
-# Global request context for logging
-_request_context = {}
+# Request context for logging, kept per thread so concurrently processed
+# images in a batch request each log their own context
+_request_context = threading.local()
+
+# Maximum number of images accepted in a single batch request
+MAX_BATCH_IMAGES = 10
+
+# BatchDetectDominantLanguage limits: documents per call and UTF-8 bytes per document
+COMPREHEND_BATCH_SIZE = 25
+COMPREHEND_BATCH_MAX_BYTES = 5000
+
+# Text detection results per (bucket, key, ETag), reused across warm invocations
+# so re-translating the same image skips Rekognition and Comprehend
+OCR_CACHE_MAX_ENTRIES = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "256"))
+_ocr_cache: "OrderedDict[Tuple[str, str, str], Tuple[str, str]]" = OrderedDict()
+_ocr_cache_lock = threading.Lock()
 
 
 def set_request_context(
@@ -137,9 +169,8 @@ def set_request_context(
     image_key: Optional[str] = None,
     bucket: Optional[str] = None,
 ):
-    """Set global request context for logging"""
-    global _request_context
-    _request_context = {
+    """Set request context for logging in the current thread"""
+    _request_context.fields = {
         "request_id": request_id,
         "user_id": user_id,
         "image_key": image_key,
@@ -160,7 +191,7 @@ def log_with_context(level: str, message: str, **kwargs):
             return
 
     # Merge request context with provided kwargs
-    extra = {**_request_context, **kwargs}
+    extra = {**getattr(_request_context, "fields", {}), **kwargs}
 
     # Filter out None values to keep logs clean
     extra = {k: v for k, v in extra.items() if v is not None}
@@ -276,9 +307,11 @@ def extract_event_parameters(event: Dict[str, Any]) -> Dict[str, Any]:
         params = {
             "bucket": record["s3"]["bucket"]["name"],
             "key": key,
+            "etag": record["s3"]["object"].get("eTag"),
             "target_language": "en",
             "provided_detected_text": None,
             "provided_detected_language": None,
+            "assume_language": None,
         }
         log_with_context(
             "info",
@@ -288,21 +321,8 @@ def extract_event_parameters(event: Dict[str, Any]) -> Dict[str, Any]:
         )
         return params
 
-    body = event
-    if "body" in event and event["body"]:
-        body = (
-            json.loads(event["body"])
-            if isinstance(event["body"], str)
-            else event["body"]
-        )
-
-    params = {
-        "bucket": body.get("bucket"),
-        "key": body.get("key"),
-        "target_language": body.get("targetLanguage", "en"),
-        "provided_detected_text": body.get("detectedText"),
-        "provided_detected_language": body.get("detectedLanguage"),
-    }
+    body = _get_event_body(event)
+    params = _params_from_body(body)
 
     log_with_context(
         "info",
@@ -316,21 +336,72 @@ def extract_event_parameters(event: Dict[str, Any]) -> Dict[str, Any]:
     return params
 
 
-def create_cors_headers() -> Dict[str, str]:
-    """Create CORS headers for response."""
+def extract_batch_parameters(event: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Extract per-image parameters when the request body is a JSON array of images.
+
+    Returns None for single-image requests so they keep using extract_event_parameters.
+    """
+    if "Records" in event:
+        return None
+
+    raw_body = event.get("body")
+    if isinstance(raw_body, str):
+        # Only parse here when the body is an array, single-image bodies are
+        # parsed once by extract_event_parameters
+        if not raw_body.lstrip().startswith("["):
+            return None
+        raw_body = json_loads(raw_body)
+
+    if not isinstance(raw_body, list):
+        return None
+
+    params_list = [_params_from_body(item) for item in raw_body]
+    log_with_context(
+        "info",
+        "Extracted batch event parameters",
+        image_count=len(params_list),
+    )
+    return params_list
+
+
+def _get_event_body(event: Dict[str, Any]) -> Any:
+    """Return the parsed request body, or the event itself for direct invocations."""
+    if "body" in event and event["body"]:
+        return (
+            json_loads(event["body"])
+            if isinstance(event["body"], str)
+            else event["body"]
+        )
+    return event
+
+
+def _params_from_body(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Build processing parameters from an API Gateway/direct request body."""
     return {
-        "Access-Control-Allow-Origin": "*",
-        "Access-Control-Allow-Headers": "Content-Type",
-        "Access-Control-Allow-Methods": "POST",
+        "bucket": body.get("bucket"),
+        "key": body.get("key"),
+        "etag": body.get("eTag"),
+        "target_language": body.get("targetLanguage", "en"),
+        "provided_detected_text": body.get("detectedText"),
+        "provided_detected_language": body.get("detectedLanguage"),
+        "assume_language": body.get("assumeLanguage"),
     }
 
 
+# CORS headers shared by every response; never mutated, so one dict is reused
+_CORS_HEADERS: Dict[str, str] = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "Content-Type",
+    "Access-Control-Allow-Methods": "POST",
+}
+
+
 def create_error_response(status_code: int, error_message: str) -> Dict[str, Any]:
     """Create standardized error response."""
     return {
         "statusCode": status_code,
-        "headers": create_cors_headers(),
-        "body": json.dumps({"error": error_message}),
+        "headers": _CORS_HEADERS,
+        "body": json_dumps({"error": error_message}),
     }
 
 
@@ -338,8 +409,8 @@ def create_success_response(data: Dict[str, Any]) -> Dict[str, Any]:
     """Create standardized success response."""
     return {
         "statusCode": 200,
-        "headers": create_cors_headers(),
-        "body": json.dumps(data),
+        "headers": _CORS_HEADERS,
+        "body": json_dumps(data),
     }
 
 
@@ -350,6 +421,48 @@ def is_supported_image_format(key: str) -> bool:
     return f".{file_extension}" in supported_extensions
 
 
+def _get_ocr_cache_key(
+    bucket: str, key: str, etag: Optional[str]
+) -> Optional[Tuple[str, str, str]]:
+    """Build the text detection cache key from the ETag sent with the request.
+
+    The ETag comes from the S3 event record or the client's upload response,
+    so no extra S3 call is made; requests without one are not cached.
+    """
+    if OCR_CACHE_MAX_ENTRIES <= 0 or not etag or not is_supported_image_format(key):
+        return None
+    # S3 events carry the bare ETag, S3 API responses wrap it in quotes
+    return bucket, key, etag.strip('"')
+
+
+def _get_cached_ocr(
+    cache_key: Optional[Tuple[str, str, str]],
+) -> Optional[Tuple[str, str]]:
+    """Return the cached (detected_text, detected_language) for an image, if any."""
+    if cache_key is None:
+        return None
+    with _ocr_cache_lock:
+        cached = _ocr_cache.get(cache_key)
+        if cached is not None:
+            _ocr_cache.move_to_end(cache_key)
+        return cached
+
+
+def _store_cached_ocr(
+    cache_key: Optional[Tuple[str, str, str]],
+    detected_text: str,
+    detected_language: str,
+) -> None:
+    """Remember the detection result for an image, evicting the oldest entry."""
+    if cache_key is None:
+        return
+    with _ocr_cache_lock:
+        _ocr_cache[cache_key] = (detected_text, detected_language)
+        _ocr_cache.move_to_end(cache_key)
+        while len(_ocr_cache) > OCR_CACHE_MAX_ENTRIES:
+            _ocr_cache.popitem(last=False)
+
+
 def _contains_asian_characters(text: str) -> bool:
     """Check if text contains CJK (Chinese, Japanese, Korean) characters for OCR optimization."""
     if not text:
@@ -534,6 +647,58 @@ def detect_language(text: str) -> str:
         raise e
 
 
+def detect_languages(texts: List[str]) -> List[Optional[str]]:
+    """Detect the language of several texts with batched Comprehend calls.
+
+    Texts Comprehend could not classify, or that exceed the batch document size,
+    map to None so callers can fall back to detect_language.
+    """
+    operation = "comprehend_batch_detect_language"
+    languages: List[Optional[str]] = [None] * len(texts)
+    indexes = [
+        i
+        for i, text in enumerate(texts)
+        if len(text.encode("utf-8")) <= COMPREHEND_BATCH_MAX_BYTES
+    ]
+    if not indexes:
+        return languages
+
+    log_operation(operation, text_count=len(indexes))
+    start_time = time.time()
+
+    try:
+        for offset in range(0, len(indexes), COMPREHEND_BATCH_SIZE):
+            chunk = indexes[offset : offset + COMPREHEND_BATCH_SIZE]
+            response = safe_comprehend_call(
+                "batch_detect_dominant_language", TextList=[texts[i] for i in chunk]
+            )
+            for result in response.get("ResultList", []):
+                if result.get("Languages"):
+                    languages[chunk[result["Index"]]] = result["Languages"][0][
+                        "LanguageCode"
+                    ]
+
+        duration = (time.time() - start_time) * 1000
+        performance_monitor.record_operation(operation, duration / 1000, True)
+        log_operation(
+            operation,
+            duration,
+            True,
+            text_count=len(indexes),
+            detected_count=sum(language is not None for language in languages),
+        )
+
+    except Exception as e:
+        duration = (time.time() - start_time) * 1000
+        performance_monitor.record_operation(operation, duration / 1000, False)
+        log_error(
+            "Error batch detecting languages", e, operation, text_count=len(indexes)
+        )
+        log_operation(operation, duration, False)
+
+    return languages
+
+
 # AWS Translate supported languages
 AWS_SUPPORTED_LANGUAGES = {
     "af",
@@ -839,6 +1004,9 @@ def save_translation_to_history(
                 "image_key": image_key,
                 "lang_pair": language_pair,
                 "timestamp": timestamp,
+                # Denormalized so get_history_item needs a single GetItem
+                "extracted_text": detected_text,
+                "translated_text": translated_text,
             }
         )
 
@@ -924,6 +1092,78 @@ def process_text_detection_and_translation(
     event: Dict[str, Any], params: Dict[str, Any]
 ) -> Dict[str, Any]:
     """Process text detection and translation logic."""
+    return create_success_response(_detect_and_translate(event, params))
+
+
+# (detected_text, detected_language, ocr_cache_key) for one image
+ResolvedText = Tuple[str, Optional[str], Optional[Tuple[str, str, str]]]
+
+
+def _resolve_detected_text(params: Dict[str, Any]) -> ResolvedText:
+    """Get the text of an image and its language when already known.
+
+    Returns:
+        Tuple of (detected_text, detected_language, ocr_cache_key). The language
+        is None when it still has to be detected, in which case the result
+        should be stored under ocr_cache_key once it is.
+    """
+    if params["provided_detected_text"] and params["provided_detected_language"]:
+        log_with_context(
+            "info",
+            "Using provided text and language",
+            detected_language=params["provided_detected_language"],
+            text_length=len(params["provided_detected_text"]),
+        )
+        return (
+            params["provided_detected_text"],
+            params["provided_detected_language"],
+            None,
+        )
+
+    ocr_cache_key = _get_ocr_cache_key(
+        params["bucket"], params["key"], params.get("etag")
+    )
+    cached_ocr = _get_cached_ocr(ocr_cache_key)
+    if cached_ocr:
+        detected_text, detected_language = cached_ocr
+        log_with_context(
+            "info",
+            "Using cached text detection result",
+            detected_language=detected_language,
+            text_length=len(detected_text),
+        )
+        return detected_text, detected_language, None
+
+    detected_text = detect_text_from_image(params["bucket"], params["key"])
+
+    assume_language = params.get("assume_language")
+    if (
+        detected_text
+        and assume_language
+        and assume_language == params["target_language"]
+    ):
+        # Caller vouches the text is already in the target language,
+        # so skip the Comprehend round-trip
+        log_with_context(
+            "info",
+            "Using assumed language, skipping language detection",
+            detected_language=assume_language,
+        )
+        return detected_text, assume_language, None
+
+    return detected_text, None, ocr_cache_key
+
+
+def _detect_and_translate(
+    event: Dict[str, Any],
+    params: Dict[str, Any],
+    resolved: Optional[ResolvedText] = None,
+) -> Dict[str, Any]:
+    """Detect and translate the text of one image and return the response data.
+
+    resolved optionally carries an earlier _resolve_detected_text result, as
+    used by batch requests that detect languages for all images at once.
+    """
     operation = "process_text_detection_translation"
     start_time = time.time()
 
@@ -936,34 +1176,26 @@ def process_text_detection_and_translation(
     )
 
     try:
-        if params["provided_detected_text"] and params["provided_detected_language"]:
-            detected_text = params["provided_detected_text"]
-            detected_language = params["provided_detected_language"]
-            log_with_context(
-                "info",
-                "Using provided text and language",
-                detected_language=detected_language,
-                text_length=len(detected_text),
-            )
-        else:
-            detected_text = detect_text_from_image(params["bucket"], params["key"])
+        detected_text, detected_language, ocr_cache_key = (
+            resolved if resolved is not None else _resolve_detected_text(params)
+        )
 
-            if not detected_text:
-                duration = (time.time() - start_time) * 1000
-                log_operation(
-                    operation, duration, True, message="No text detected in image"
-                )
-                return create_success_response(
-                    {
-                        "detectedText": "",
-                        "detectedLanguage": "",
-                        "translatedText": "",
-                        "targetLanguage": params["target_language"],
-                        "message": "No text detected in image",
-                    }
-                )
+        if not detected_text:
+            duration = (time.time() - start_time) * 1000
+            log_operation(
+                operation, duration, True, message="No text detected in image"
+            )
+            return {
+                "detectedText": "",
+                "detectedLanguage": "",
+                "translatedText": "",
+                "targetLanguage": params["target_language"],
+                "message": "No text detected in image",
+            }
 
+        if detected_language is None:
             detected_language = detect_language(detected_text)
+            _store_cached_ocr(ocr_cache_key, detected_text, detected_language)
 
         # Handle unsupported detected languages with fallback
         original_detected_language = detected_language
@@ -1081,7 +1313,7 @@ def process_text_detection_and_translation(
             else:
                 response_data["message"] = "Text successfully translated"
 
-        return create_success_response(response_data)
+        return response_data
 
     except Exception as e:
         duration = (time.time() - start_time) * 1000
@@ -1096,6 +1328,96 @@ def process_text_detection_and_translation(
         raise e
 
 
+def _map_client_error(error: ClientError) -> Tuple[int, str]:
+    """Map an AWS client error to a status code and user-friendly message."""
+    error_mappings = {
+        "InvalidImageFormatException": "Unsupported image format. Please use JPG, JPEG, or PNG files.",
+        "ImageTooLargeException": "Image file too large. Maximum size is 15MB.",
+        "InvalidS3ObjectException": "Could not access the uploaded image. Please try uploading again.",
+    }
+
+    error_code = error.response.get("Error", {}).get("Code", "")
+    error_msg = error_mappings.get(error_code, f"AWS service error: {str(error)}")
+    status_code = 400 if error_code in error_mappings else 500
+    return status_code, error_msg
+
+
+def process_image_batch(
+    event: Dict[str, Any], params_list: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Process several images concurrently and return one combined response.
+
+    Text is detected for all images on worker threads, then the languages of
+    every newly detected text are looked up with one batched Comprehend call
+    (up to COMPREHEND_BATCH_SIZE texts per call) instead of one call per image.
+    Translation then runs per image on worker threads again. Texts the batch
+    call could not classify fall back to the single-image detect_language.
+    Failures are reported per image instead of failing the whole batch.
+    """
+    context_fields = getattr(_request_context, "fields", {})
+
+    def _run(params: Dict[str, Any], step: Callable[[], Any]) -> Any:
+        set_request_context(
+            context_fields.get("request_id", "unknown"),
+            user_id=context_fields.get("user_id"),
+            image_key=params.get("key"),
+            bucket=params.get("bucket"),
+        )
+        image = {"bucket": params.get("bucket"), "key": params.get("key")}
+
+        if not params["bucket"] or not params["key"]:
+            return {**image, "error": "Missing bucket or key parameter"}
+
+        try:
+            return step()
+        except ValueError as e:
+            return {**image, "error": str(e)}
+        except ClientError as e:
+            return {**image, "error": _map_client_error(e)[1]}
+        except Exception as e:
+            log_error("Error processing batch image", e, "process_image_batch")
+            return {**image, "error": f"Internal server error: {e.__class__.__name__}"}
+
+    with ThreadPoolExecutor(max_workers=len(params_list)) as executor:
+        resolved = list(
+            executor.map(
+                lambda params: _run(params, lambda: _resolve_detected_text(params)),
+                params_list,
+            )
+        )
+
+        # Error results are dicts, resolved images are tuples
+        pending = [
+            i
+            for i, result in enumerate(resolved)
+            if isinstance(result, tuple) and result[0] and result[1] is None
+        ]
+        if pending:
+            languages = detect_languages([resolved[i][0] for i in pending])
+            for i, language in zip(pending, languages):
+                if language:
+                    detected_text, _, ocr_cache_key = resolved[i]
+                    _store_cached_ocr(ocr_cache_key, detected_text, language)
+                    resolved[i] = (detected_text, language, None)
+
+        results = list(
+            executor.map(
+                lambda params, result: (
+                    result
+                    if isinstance(result, dict)
+                    else _run(
+                        params, lambda: _detect_and_translate(event, params, result)
+                    )
+                ),
+                params_list,
+                resolved,
+            )
+        )
+
+    return create_success_response({"results": results})
+
+
+@flush_metrics_on_return
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda function to process uploaded images:
@@ -1119,6 +1441,28 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     log_performance_data(operation="lambda_start")
 
     try:
+        # Batch requests carry a JSON array of images
+        batch_params = extract_batch_parameters(event)
+        if batch_params is not None:
+            if not batch_params or len(batch_params) > MAX_BATCH_IMAGES:
+                error_msg = (
+                    f"Batch requests must contain 1 to {MAX_BATCH_IMAGES} images"
+                )
+                log_with_context("error", error_msg, image_count=len(batch_params))
+                return create_error_response(400, error_msg)
+
+            set_request_context(request_id, user_id=_get_user_id(event))
+            result = process_image_batch(event, batch_params)
+
+            log_with_context(
+                "info",
+                "Lambda function completed batch successfully",
+                image_count=len(batch_params),
+            )
+            log_performance_data(operation="lambda_end")
+            performance_monitor.persist_metrics()
+            return result
+
         # Extract and validate parameters
         params = extract_event_parameters(event)
 
@@ -1161,15 +1505,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         log_error("AWS Client error occurred", e, "lambda_handler")
 
         # Map AWS errors to user-friendly messages
-        error_mappings = {
-            "InvalidImageFormatException": "Unsupported image format. Please use JPG, JPEG, or PNG files.",
-            "ImageTooLargeException": "Image file too large. Maximum size is 15MB.",
-            "InvalidS3ObjectException": "Could not access the uploaded image. Please try uploading again.",
-        }
-
-        error_code = e.response.get("Error", {}).get("Code", "")
-        error_msg = error_mappings.get(error_code, f"AWS service error: {str(e)}")
-        status_code = 400 if error_code in error_mappings else 500
+        status_code, error_msg = _map_client_error(e)
 
         performance_monitor.persist_metrics()
         return create_error_response(status_code, error_msg)
@@ -11,7 +11,7 @@ from functools import lru_cache
 from typing import Dict, List, Tuple
 
 import boto3
-from aws_clients import OPTIMIZED_CONFIG, performance_monitor
+from aws_clients import OPTIMIZED_CONFIG, flush_metrics_on_return, performance_monitor
 from botocore import UNSIGNED
 from botocore.client import Config
 from image_processor import detect_text_from_image
@@ -172,6 +172,7 @@ def process_single_language(
         return language, []
 
 
+@flush_metrics_on_return
 def lambda_handler(event, _):
     """Lambda handler to populate the S3 bucket with images from the MMID dataset."""
     global_seed = int(time.time() * 1000000) + hash(str(event)) % 1000000
@@ -18,6 +18,7 @@ import requests
 from aws_clients import (
     PERFORMANCE_TABLE,
     PerformanceMonitor,
+    decode_operations,
     performance_monitor,
     safe_dynamodb_call,
 )
@@ -246,7 +247,7 @@ def get_current_metrics() -> Dict[str, Any]:
 
         for item in items:
             func_name = item["function_name"]["S"]
-            operations = json.loads(item["operations"]["S"])
+            operations = decode_operations(item["operations"])
 
             logger.debug(
                 f"PerformanceHandler: Processing function {func_name} with operations: {operations}"
@@ -0,0 +1,95 @@
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+# Must match the runtime and architecture of the functions using the layer
+LAYER_PYTHON_VERSION = "3.11"
+LAYER_PLATFORM = "manylinux2014_x86_64"
+
+
+def main():
+    """
+    Prepares the orjson Lambda layer used by the functions that are zipped from
+    source alone. orjson is a compiled extension, so Linux wheels for the Lambda
+    runtime are installed regardless of the platform this script runs on.
+    This script is designed to be cross-platform.
+    """
+    lambda_dir = Path(__file__).parent.resolve()
+    build_dir = lambda_dir / "build" / "orjson_layer"
+    requirements_file = lambda_dir / "requirements.txt"
+
+    print(f"--- Preparing build directory: {build_dir} ---")
+
+    # 1. Safely remove existing directory
+    if build_dir.exists():
+        print(f"Removing existing directory: {build_dir}")
+        shutil.rmtree(build_dir)
+
+    # 2. Recreate the directory, layers are extracted to /opt and
+    # /opt/python is on the runtime's sys.path
+    print(f"Creating directory: {build_dir}")
+    (build_dir / "python").mkdir(parents=True, exist_ok=True)
+
+    # 3. Take the orjson requirement from requirements.txt
+    if not requirements_file.exists():
+        print(f"--- ERROR: requirements.txt not found at {requirements_file} ---")
+        sys.exit(1)
+    requirement = next(
+        (
+            line.strip()
+            for line in requirements_file.read_text().splitlines()
+            if line.strip().startswith("orjson")
+        ),
+        None,
+    )
+    if requirement is None:
+        print(f"--- ERROR: No orjson requirement in {requirements_file} ---")
+        sys.exit(1)
+
+    # 4. Install the Lambda platform wheel
+    print(f"Installing {requirement} for the Lambda runtime...")
+    try:
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "pip",
+                "install",
+                "--target",
+                str(build_dir / "python"),
+                "--platform",
+                LAYER_PLATFORM,
+                "--python-version",
+                LAYER_PYTHON_VERSION,
+                "--implementation",
+                "cp",
+                "--only-binary=:all:",
+                requirement,
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        print("Dependencies installed successfully.")
+        if result.stdout:
+            print("PIP STDOUT:", result.stdout)
+    except subprocess.CalledProcessError as e:
+        print("--- ERROR: Failed to install dependencies ---")
+        print(f"STDOUT:\n{e.stdout}")
+        print(f"STDERR:\n{e.stderr}")
+        sys.exit(1)
+
+    # 5. Create zip file
+    print("Creating zip file...")
+    # The archive will be created next to the other app-stack packages
+    shutil.make_archive(
+        str(lambda_dir.parent / "terraform" / "app-stack" / "orjson_layer"),
+        "zip",
+        root_dir=str(build_dir),
+    )
+    print("--- orjson layer is ready. ---")
+
+
+if __name__ == "__main__":
+    main()
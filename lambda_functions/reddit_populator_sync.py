@@ -15,7 +15,7 @@ from urllib.parse import urlparse
 
 import boto3
 import requests
-from aws_clients import get_s3_client, performance_monitor
+from aws_clients import flush_metrics_on_return, get_s3_client, performance_monitor
 from botocore.exceptions import ClientError
 from image_processor import detect_text_from_image
 from reddit_config import get_default_subreddit, get_subreddits_from_env
@@ -379,6 +379,7 @@ def process_single_subreddit(
     return successful_downloads
 
 
+@flush_metrics_on_return
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """AWS Lambda handler for Reddit image population."""
     real_time_mode = event.get("real_time_mode", False)
@@ -6,7 +6,7 @@ from functools import lru_cache
 from typing import Any, Dict
 
 import boto3
-from aws_clients import OPTIMIZED_CONFIG, performance_monitor
+from aws_clients import OPTIMIZED_CONFIG, flush_metrics_on_return, performance_monitor
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger()
@@ -599,6 +599,7 @@ def unlink_google_account(username: str, user_pool_id: str) -> Dict[str, Any]:
         }
 
 
+@flush_metrics_on_return
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for user management operations.
@@ -84,7 +84,11 @@ def main():
         (["isort", "."], "Sorting imports with isort"),
         (["black", "."], "Formatting Python code with black"),
         (
-            ["flake8", ".", "--exclude=your_deployment/cleanup_resources.py"],
+            [
+                "flake8",
+                ".",
+                "--exclude=your_deployment/cleanup_resources.py,.layers,.wheelhouse",
+            ],
             "Linting Python code with flake8",
         ),
         (["pytest"], "Running Python tests with pytest"),
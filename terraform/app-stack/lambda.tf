@@ -16,6 +16,33 @@ resource "null_resource" "prepare_reddit_populator_package" {
   }
 }
 
+# orjson Layer Package Preparation
+resource "null_resource" "prepare_orjson_layer" {
+  triggers = {
+    # Rebuilds the layer when the orjson requirement or the script changes
+    requirements_hash = filemd5("../../lambda_functions/requirements.txt")
+    prep_script_hash  = filemd5("../../lambda_functions/prepare_orjson_layer.py")
+  }
+
+  provisioner "local-exec" {
+    command = "python ../../lambda_functions/prepare_orjson_layer.py"
+  }
+}
+
+# orjson for the functions below, which are zipped from source alone;
+# aws_clients falls back to the stdlib json module without it
+resource "aws_lambda_layer_version" "orjson" {
+  filename            = "${path.module}/orjson_layer.zip"
+  layer_name          = "${var.project_name}-orjson-${var.environment}-${local.random_suffix}"
+  compatible_runtimes = ["python3.11"]
+  source_code_hash = base64sha256(format("%s%s",
+    null_resource.prepare_orjson_layer.triggers.requirements_hash,
+    null_resource.prepare_orjson_layer.triggers.prep_script_hash
+  ))
+
+  depends_on = [null_resource.prepare_orjson_layer]
+}
+
 # Lambda Function Packaging
 data "archive_file" "image_processor_zip" {
   type        = "zip"
@@ -172,6 +199,7 @@ resource "aws_lambda_function" "image_processor" {
   timeout          = 90
   memory_size      = 512
   source_code_hash = data.archive_file.image_processor_zip.output_base64sha256
+  layers           = [aws_lambda_layer_version.orjson.arn]
 
   environment {
     variables = {
@@ -193,6 +221,7 @@ resource "aws_lambda_function" "cognito_triggers" {
   runtime          = "python3.11"
   timeout          = 30
   source_code_hash = data.archive_file.cognito_triggers_zip.output_base64sha256
+  layers           = [aws_lambda_layer_version.orjson.arn]
 
   environment {
     variables = {
@@ -212,6 +241,7 @@ resource "aws_lambda_function" "gallery_lister" {
   timeout          = 30
   memory_size      = 256
   source_code_hash = data.archive_file.gallery_lister_zip.output_base64sha256
+  layers           = [aws_lambda_layer_version.orjson.arn]
 
   environment {
     variables = {
@@ -231,6 +261,7 @@ resource "aws_lambda_function" "mmid_populator" {
   timeout          = 600
   memory_size      = 2048
   source_code_hash = data.archive_file.mmid_populator_zip.output_base64sha256
+  layers           = [aws_lambda_layer_version.orjson.arn]
 
   environment {
     variables = {
@@ -252,6 +283,7 @@ resource "aws_lambda_function" "user_manager" {
   timeout          = 30
   memory_size      = 256
   source_code_hash = data.archive_file.user_manager_zip.output_base64sha256
+  layers           = [aws_lambda_layer_version.orjson.arn]
 
   environment {
     variables = {
@@ -271,6 +303,7 @@ resource "aws_lambda_function" "history_handler" {
   timeout          = 30
   memory_size      = 256
   source_code_hash = data.archive_file.history_handler_zip.output_base64sha256
+  layers           = [aws_lambda_layer_version.orjson.arn]
 
   environment {
     variables = {
@@ -291,6 +324,7 @@ resource "aws_lambda_function" "history_detail_handler" {
   timeout          = 30
   memory_size      = 256
   source_code_hash = data.archive_file.history_handler_zip.output_base64sha256
+  layers           = [aws_lambda_layer_version.orjson.arn]
 
   environment {
     variables = {
@@ -311,6 +345,7 @@ resource "aws_lambda_function" "performance_handler" {
   timeout          = 30
   memory_size      = 256
   source_code_hash = data.archive_file.performance_handler_zip.output_base64sha256
+  layers           = [aws_lambda_layer_version.orjson.arn]
 
   environment {
     variables = {
@@ -376,7 +411,7 @@ resource "aws_iam_policy" "image_processor_policy" {
       },
       {
         Effect   = "Allow"
-        Action   = ["comprehend:DetectDominantLanguage"]
+        Action   = ["comprehend:DetectDominantLanguage", "comprehend:BatchDetectDominantLanguage"]
         Resource = "*"
       },
       {
@@ -0,0 +1,163 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from lambda_functions import aws_clients
+
+
+def _metrics_item(function_name, operations):
+    return {
+        "function_name": {"S": function_name},
+        "ts_epoch": {"N": str(int(time.time()) - 60)},
+        "operations": aws_clients.encode_operations(aws_clients.json_dumps(operations)),
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_aggregate_cache():
+    aws_clients._aggregate_cache.clear()
+    yield
+    aws_clients._aggregate_cache.clear()
+
+
+@pytest.fixture
+def metrics_pages():
+    """Two query pages of metrics items for two functions"""
+    return [
+        {
+            "Items": [
+                _metrics_item(
+                    "image_processor",
+                    {
+                        "rekognition_detect_text": {
+                            "total_calls": 2,
+                            "total_duration": 1.0,
+                            "failures": 0,
+                        },
+                        "translate_text": {
+                            "total_calls": 2,
+                            "total_duration": 0.2,
+                            "failures": 1,
+                        },
+                    },
+                )
+            ]
+        },
+        {
+            "Items": [
+                _metrics_item(
+                    "gallery_lister",
+                    {
+                        "s3_list_objects": {
+                            "total_calls": 4,
+                            "total_duration": 0.4,
+                            "failures": 0,
+                        }
+                    },
+                )
+            ]
+        },
+    ]
+
+
+def test_service_breakdown_insights(metrics_pages):
+    """Service breakdown aggregates every page and reports insights"""
+    monitor = aws_clients.PerformanceMonitor("test")
+    with patch.object(
+        aws_clients.PerformanceMonitor,
+        "_iter_query_pages",
+        return_value=iter(metrics_pages),
+    ):
+        result = monitor.get_service_breakdown("1h")
+
+    assert "error" not in result
+    assert result["total_services"] == 3
+    assert result["services"]["translate"]["success_rate"] == 50.0
+    assert result["summary"]["most_used_service"]["name"] == "s3"
+    assert result["summary"]["slowest_service"] == {
+        "name": "rekognition",
+        "avg_response_time": 0.5,
+    }
+    assert result["summary"]["least_reliable_service"]["name"] == "translate"
+
+
+def test_function_comparison_insights(metrics_pages):
+    """Function comparison ranks functions by response time and activity"""
+    monitor = aws_clients.PerformanceMonitor("test")
+    with patch.object(
+        aws_clients.PerformanceMonitor,
+        "_iter_query_pages",
+        return_value=iter(metrics_pages),
+    ):
+        result = monitor.get_function_comparison("1h")
+
+    comparison = result["comparison"]
+    assert result["total_functions"] == 2
+    assert comparison["fastest_function"]["name"] == "gallery_lister"
+    assert comparison["slowest_function"]["name"] == "image_processor"
+    assert comparison["most_active_function"]["name"] == "image_processor"
+    assert comparison["least_reliable_function"]["name"] == "image_processor"
+
+
+def test_operations_round_trip_and_legacy_strings():
+    """Compressed and plain-string operations attributes both decode"""
+    operations = {"s3_upload": {"total_calls": 1, "total_duration": 0.1}}
+
+    encoded = aws_clients.encode_operations(aws_clients.json_dumps(operations))
+
+    assert "B" in encoded
+    assert aws_clients.decode_operations(encoded) == operations
+    assert aws_clients.decode_operations({"S": '{"a": {}}'}) == {"a": {}}
+
+
+def test_gather_calls_keeps_order_and_raises():
+    """gather_calls returns results in call order and surfaces failures"""
+    assert aws_clients.gather_calls(lambda: 1, lambda: 2, lambda: 3) == [1, 2, 3]
+
+    def failing():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        aws_clients.gather_calls(lambda: 1, failing)
+
+
+def test_persist_metrics_writes_one_batch_when_full():
+    """Snapshots are only queued until a full BatchWriteItem batch is pending"""
+    monitor = aws_clients.PerformanceMonitor("gallery_lister")
+    monitor.record_operation("s3_list_objects", 0.5)
+
+    with patch.object(aws_clients, "get_dynamodb_client") as mock_client:
+        mock_client.return_value.batch_write_item.return_value = {}
+        for _ in range(aws_clients.METRICS_FLUSH_BATCH_SIZE - 1):
+            assert monitor.persist_metrics() is True
+        mock_client.return_value.batch_write_item.assert_not_called()
+
+        assert monitor.persist_metrics() is True
+
+    (call,) = mock_client.return_value.batch_write_item.call_args_list
+    items = call.kwargs["RequestItems"][aws_clients.PERFORMANCE_TABLE]
+    assert len(items) == aws_clients.METRICS_FLUSH_BATCH_SIZE
+    assert items[0]["PutRequest"]["Item"]["function_name"] == {"S": "gallery_lister"}
+    assert monitor._pending == []
+
+
+def test_flush_metrics_on_return_writes_once_before_handler_returns():
+    """Decorated handlers write every snapshot they queued in one batch"""
+    batches = []
+
+    @aws_clients.flush_metrics_on_return
+    def handler(event, context):
+        aws_clients.performance_monitor.persist_metrics()
+        aws_clients.performance_monitor.persist_metrics()
+        assert batches == []
+        return {"statusCode": 200}
+
+    with patch.object(
+        aws_clients.PerformanceMonitor,
+        "batch_persist_metrics",
+        side_effect=lambda items: batches.append(items) or True,
+    ):
+        assert handler({}, None) == {"statusCode": 200}
+        assert [len(batch) for batch in batches] == [2]
+        assert aws_clients.performance_monitor._pending == []
@@ -0,0 +1,206 @@
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from lambda_functions import build_lambda
+
+
+@pytest.fixture
+def requirements_file(tmp_path):
+    path = tmp_path / "requirements.txt"
+    path.write_text("requests>=2.31.0\n")
+    return path
+
+
+def _write_stamp(wheelhouse, requirements_file, age=0.0):
+    wheelhouse.mkdir(parents=True, exist_ok=True)
+    stamp = wheelhouse / ".req.sha256"
+    req_hash = build_lambda._requirements_hash(requirements_file)
+    stamp.write_text(f"{req_hash}\nrequests-2.31.0-py3-none-any.whl")
+    mtime = time.time() - age
+    os.utime(stamp, (mtime, mtime))
+
+
+class TestWheelhouse:
+    """Tests for the cached wheelhouse"""
+
+    def test_wheelhouse_is_per_interpreter(self, tmp_path):
+        with patch.object(
+            build_lambda, "_probe_python", return_value=(0, ["3.11.9", "24.0", "tag"])
+        ):
+            wheelhouse = build_lambda._wheelhouse_dir(tmp_path, "python3.11")
+
+        assert wheelhouse == tmp_path / ".wheelhouse" / "tag"
+
+    def test_fresh_stamp_is_current(self, tmp_path, requirements_file):
+        wheelhouse = tmp_path / ".wheelhouse" / "tag"
+        _write_stamp(wheelhouse, requirements_file)
+
+        stamp = build_lambda._read_wheelhouse_stamp(wheelhouse, requirements_file)
+
+        assert stamp.endswith("requests-2.31.0-py3-none-any.whl")
+
+    def test_expired_stamp_is_stale(self, tmp_path, requirements_file):
+        wheelhouse = tmp_path / ".wheelhouse" / "tag"
+        _write_stamp(
+            wheelhouse, requirements_file, age=build_lambda.WHEELHOUSE_MAX_AGE + 1
+        )
+
+        assert (
+            build_lambda._read_wheelhouse_stamp(wheelhouse, requirements_file) is None
+        )
+
+    def test_changed_requirements_are_stale(self, tmp_path, requirements_file):
+        wheelhouse = tmp_path / ".wheelhouse" / "tag"
+        _write_stamp(wheelhouse, requirements_file)
+        requirements_file.write_text("requests>=2.32.0\n")
+
+        assert (
+            build_lambda._read_wheelhouse_stamp(wheelhouse, requirements_file) is None
+        )
+
+
+class TestLayerDir:
+    """Tests for the shared dependency layer key"""
+
+    def test_layer_is_per_interpreter_and_wheel_set(self, tmp_path, requirements_file):
+        tags = {"python3.11": "cpython-311-tag", "python3.12": "cpython-312-tag"}
+
+        def probe(cmd):
+            return 0, ["3", "24.0", tags[cmd]]
+
+        with patch.object(build_lambda, "_probe_python", side_effect=probe):
+            for cmd in tags:
+                _write_stamp(
+                    build_lambda._wheelhouse_dir(tmp_path, cmd), requirements_file
+                )
+            layer_311 = build_lambda._layer_dir(
+                tmp_path, requirements_file, "python3.11"
+            )
+            layer_312 = build_lambda._layer_dir(
+                tmp_path, requirements_file, "python3.12"
+            )
+
+            # A refreshed wheelhouse with other wheels gets its own layer
+            stamp = build_lambda._wheelhouse_dir(tmp_path, "python3.11") / ".req.sha256"
+            stamp.write_text(stamp.read_text() + "\ncertifi-2024.1.1-py3-none-any.whl")
+            refreshed = build_lambda._layer_dir(
+                tmp_path, requirements_file, "python3.11"
+            )
+
+        assert layer_311.parent == tmp_path / ".layers"
+        assert len({layer_311, layer_312, refreshed}) == 3
+
+
+class TestRemoveStaleFiles:
+    """Tests for pruning a reused incremental build directory"""
+
+    def test_removes_files_from_an_earlier_layer(self, tmp_path):
+        layer_dir = tmp_path / "layer"
+        (layer_dir / "requests").mkdir(parents=True)
+        (layer_dir / "requests" / "api.py").write_text("new layer")
+
+        build_dir = tmp_path / "build"
+        (build_dir / "requests").mkdir(parents=True)
+        (build_dir / "requests" / "api.py").write_text("new layer")
+        (build_dir / "urllib3").mkdir()
+        (build_dir / "urllib3" / "util.py").write_text("old layer")
+        (build_dir / "handler.py").write_text("source")
+        (build_dir / build_lambda.BUILD_LAYER_STAMP).write_text("layer")
+
+        removed = build_lambda._remove_stale_files(build_dir, ["handler.py"], layer_dir)
+
+        assert removed == 1
+        assert not (build_dir / "urllib3" / "util.py").exists()
+        assert (build_dir / "requests" / "api.py").exists()
+        assert (build_dir / "handler.py").exists()
+        assert (build_dir / build_lambda.BUILD_LAYER_STAMP).exists()
+
+
+class TestCopySourceFiles:
+    """Tests for staging sources into the build directory"""
+
+    @pytest.fixture
+    def dirs(self, tmp_path):
+        lambda_dir = tmp_path / "src"
+        build_dir = tmp_path / "build"
+        lambda_dir.mkdir()
+        build_dir.mkdir()
+        return lambda_dir, build_dir
+
+    def test_changed_source_never_writes_through_a_hardlink(self, tmp_path, dirs):
+        lambda_dir, build_dir = dirs
+        shared = tmp_path / "shared.py"
+        shared.write_text("old")
+        os.utime(shared, (0, 0))
+        os.link(shared, build_dir / "handler.py")
+        (lambda_dir / "handler.py").write_text("new source")
+
+        build_lambda.copy_source_files(
+            lambda_dir, build_dir, ["handler.py"], incremental=True
+        )
+
+        assert (build_dir / "handler.py").read_text() == "new source"
+        assert shared.read_text() == "old"
+
+    def test_unchanged_source_is_left_in_place(self, dirs):
+        lambda_dir, build_dir = dirs
+        (lambda_dir / "handler.py").write_text("source")
+        build_lambda.copy_source_files(
+            lambda_dir, build_dir, ["handler.py"], incremental=True
+        )
+        staged_inode = (build_dir / "handler.py").stat().st_ino
+
+        with patch.object(build_lambda, "_fast_copy") as mock_copy:
+            build_lambda.copy_source_files(
+                lambda_dir, build_dir, ["handler.py"], incremental=True
+            )
+
+        mock_copy.assert_not_called()
+        assert (build_dir / "handler.py").stat().st_ino == staged_inode
+
+    def test_fast_copy_falls_back_when_hardlinks_fail(self, dirs):
+        lambda_dir, build_dir = dirs
+        (lambda_dir / "handler.py").write_text("source")
+
+        with patch.object(build_lambda.os, "link", side_effect=OSError):
+            build_lambda._fast_copy(lambda_dir / "handler.py", build_dir / "handler.py")
+
+        assert (build_dir / "handler.py").read_text() == "source"
+        assert not os.path.samefile(lambda_dir / "handler.py", build_dir / "handler.py")
+
+
+class TestBuildFingerprint:
+    """Tests for skipping builds whose inputs did not change"""
+
+    @pytest.fixture
+    def zip_path(self, tmp_path):
+        path = tmp_path / "history_handler.zip"
+        with patch.object(build_lambda, "get_zip_path", return_value=path):
+            yield path
+
+    def test_unchanged_fingerprint_skips_rebuild(self, zip_path):
+        build_lambda.build_lambda_function("history_handler", python_cmd=sys.executable)
+        assert zip_path.exists()
+
+        with patch.object(build_lambda, "_zip_sources_direct") as mock_zip:
+            result = build_lambda.build_lambda_function(
+                "history_handler", python_cmd=sys.executable
+            )
+
+        assert result == zip_path
+        mock_zip.assert_not_called()
+
+    def test_changed_fingerprint_rebuilds(self, zip_path):
+        build_lambda.build_lambda_function("history_handler", python_cmd=sys.executable)
+        build_lambda._fingerprint_path(zip_path).write_text("outdated")
+
+        with patch.object(build_lambda, "_zip_sources_direct") as mock_zip:
+            build_lambda.build_lambda_function(
+                "history_handler", python_cmd=sys.executable
+            )
+
+        mock_zip.assert_called_once()
@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+import boto3
+import pytest
+from moto import mock_aws
+
+import full_cleanup
+
+
+@pytest.fixture
+def dynamodb(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("dynamodb")
+        for table_name in ("lenslate-untagged", "tagged-table", "other-table"):
+            client.create_table(
+                TableName=table_name,
+                KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+                AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+                BillingMode="PAY_PER_REQUEST",
+            )
+        yield client
+
+
+def test_tagged_tables_do_not_hide_untagged_project_tables(dynamodb):
+    tagged = {"dynamodb:table": ["tagged-table"], "lambda:function": []}
+
+    with patch.object(full_cleanup, "discover_tagged_resources", return_value=tagged):
+        assert full_cleanup.clean_all_dynamodb_tables()
+
+    assert dynamodb.list_tables()["TableNames"] == ["other-table"]
+
+
+def test_name_listing_runs_when_tag_query_fails(dynamodb):
+    with patch.object(full_cleanup, "discover_tagged_resources", return_value=None):
+        assert full_cleanup.clean_all_dynamodb_tables()
+
+    assert sorted(dynamodb.list_tables()["TableNames"]) == [
+        "other-table",
+        "tagged-table",
+    ]
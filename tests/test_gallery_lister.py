@@ -0,0 +1,151 @@
+import json
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlsplit
+
+import boto3
+import pytest
+from botocore.config import Config
+from botocore.credentials import ReadOnlyCredentials
+from moto import mock_aws
+
+from lambda_functions import gallery_lister
+
+FIXED_NOW = datetime(2024, 5, 1, 12, 0, 0)
+
+
+def _sigv4_client(region):
+    """S3 client that presigns with SigV4 against the default endpoint"""
+    return boto3.client(
+        "s3",
+        region_name=region,
+        aws_access_key_id="AKIDEXAMPLE",
+        aws_secret_access_key="wJalrXUtnFEMI/K7MDENG",
+        aws_session_token="session+token/=",
+        config=Config(signature_version="s3v4", s3={"addressing_style": "virtual"}),
+    )
+
+
+class TestSigV4Presigner:
+    """Tests for the local SigV4 URL presigner"""
+
+    @pytest.mark.parametrize("region", ["eu-west-1", "us-east-1"])
+    @pytest.mark.parametrize(
+        "key",
+        ["reddit/image.png", "mmid/a b+c/ü~(1).JPG", "reddit/x=y&z.png"],
+    )
+    def test_matches_botocore(self, region, key):
+        """Test that locally signed URLs are identical to botocore's"""
+        sigv4_client = _sigv4_client(region)
+        with patch("botocore.auth.get_current_datetime", return_value=FIXED_NOW):
+            expected = sigv4_client.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": "lenslate-image-storage", "Key": key},
+                ExpiresIn=gallery_lister.PRESIGNED_URL_EXPIRY,
+            )
+        credentials = ReadOnlyCredentials(
+            "AKIDEXAMPLE", "wJalrXUtnFEMI/K7MDENG", "session+token/="
+        )
+        # us-east-1 clients default to the global s3.amazonaws.com endpoint
+        endpoint_host = gallery_lister._standard_endpoint_host(
+            sigv4_client.meta.endpoint_url, region
+        )
+        presigner = gallery_lister.SigV4Presigner(
+            "lenslate-image-storage",
+            region,
+            credentials,
+            now=FIXED_NOW,
+            endpoint_host=endpoint_host,
+        )
+
+        actual = urlsplit(presigner.url(key))
+        expected = urlsplit(expected)
+        assert actual.netloc == expected.netloc
+        assert actual.path == expected.path
+        assert parse_qs(actual.query) == parse_qs(expected.query)
+
+
+class TestMakeUrlSigner:
+    """Tests for choosing between the local presigner and botocore"""
+
+    @patch("lambda_functions.gallery_lister.get_frozen_credentials")
+    def test_uses_local_presigner_for_standard_endpoint(self, mock_credentials):
+        mock_credentials.return_value = ReadOnlyCredentials("AKID", "secret", None)
+        client = MagicMock()
+        client.meta.region_name = "eu-west-1"
+        client.meta.endpoint_url = "https://s3.eu-west-1.amazonaws.com"
+        client.meta.config.s3 = None
+
+        url = gallery_lister.make_url_signer(client, "lenslate-image-storage")(
+            "reddit/a.png"
+        )
+
+        assert url.startswith(
+            "https://lenslate-image-storage.s3.eu-west-1.amazonaws.com/reddit/a.png?"
+        )
+        client.generate_presigned_url.assert_not_called()
+
+    @patch("lambda_functions.gallery_lister.get_frozen_credentials")
+    def test_uses_local_presigner_for_us_east_1_global_endpoint(self, mock_credentials):
+        mock_credentials.return_value = ReadOnlyCredentials("AKID", "secret", None)
+        client = MagicMock()
+        client.meta.region_name = "us-east-1"
+        client.meta.endpoint_url = "https://s3.amazonaws.com"
+        client.meta.config.s3 = None
+
+        url = gallery_lister.make_url_signer(client, "lenslate-image-storage")(
+            "reddit/a.png"
+        )
+
+        assert url.startswith(
+            "https://lenslate-image-storage.s3.amazonaws.com/reddit/a.png?"
+        )
+        assert "%2Fus-east-1%2Fs3%2Faws4_request" in url
+        client.generate_presigned_url.assert_not_called()
+
+    @patch("lambda_functions.gallery_lister.get_frozen_credentials")
+    def test_falls_back_to_botocore_for_custom_endpoint(self, mock_credentials):
+        mock_credentials.return_value = ReadOnlyCredentials("AKID", "secret", None)
+        client = MagicMock()
+        client.meta.region_name = "us-east-1"
+        client.meta.endpoint_url = "http://localhost:4566"
+        client.meta.config.s3 = None
+        client.generate_presigned_url.return_value = "http://localhost/signed"
+
+        url = gallery_lister.make_url_signer(client, "lenslate-image-storage")(
+            "reddit/a.png"
+        )
+
+        assert url == "http://localhost/signed"
+        client.generate_presigned_url.assert_called_once_with(
+            "get_object",
+            Params={"Bucket": "lenslate-image-storage", "Key": "reddit/a.png"},
+            ExpiresIn=gallery_lister.PRESIGNED_URL_EXPIRY,
+        )
+
+
+class TestLambdaHandler:
+    """Tests for the gallery lambda_handler"""
+
+    @mock_aws
+    @patch("lambda_functions.gallery_lister.performance_monitor")
+    def test_lists_images_from_all_prefixes(self, mock_monitor, monkeypatch):
+        """Test that both prefixes are listed and merged newest first"""
+        monkeypatch.setenv("S3_BUCKET", "test-gallery-bucket")
+        mock_monitor.get_metrics.return_value = {}
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="test-gallery-bucket")
+        for key in ["reddit/first.png", "mmid/second.JPG", "reddit/notes.txt"]:
+            s3.put_object(Bucket="test-gallery-bucket", Key=key, Body=b"data")
+
+        with patch("lambda_functions.gallery_lister.get_s3_client", return_value=s3):
+            result = gallery_lister.lambda_handler({}, None)
+
+        assert result["statusCode"] == 200
+        body = json.loads(result["body"])
+        assert body["count"] == 2
+        assert {image["key"] for image in body["images"]} == {
+            "reddit/first.png",
+            "mmid/second.JPG",
+        }
+        assert [image["id"] for image in body["images"]] == [1, 2]
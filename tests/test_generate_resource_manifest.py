@@ -0,0 +1,59 @@
+from unittest.mock import patch
+
+import pytest
+
+import generate_resource_manifest as manifest
+
+
+@pytest.fixture
+def aws_env(tmp_path, monkeypatch):
+    """Isolated AWS info cache file and a clean AWS environment"""
+    monkeypatch.setattr(manifest, "AWS_INFO_CACHE_FILE", tmp_path / "aws_info.json")
+    for name in (
+        "AWS_REGION",
+        "AWS_DEFAULT_REGION",
+        "AWS_ACCOUNT_ID",
+        "AWS_PROFILE",
+        "AWS_ACCESS_KEY_ID",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    return monkeypatch
+
+
+def test_env_region_overrides_cached_region(aws_env):
+    manifest._write_aws_info_cache("default", "111111111111", "us-east-1")
+    aws_env.setenv("AWS_REGION", "eu-west-1")
+
+    with patch.object(manifest, "_fetch_aws_info") as mock_fetch:
+        assert manifest._load_or_fetch_aws_info() == ("111111111111", "eu-west-1")
+
+    mock_fetch.assert_not_called()
+
+
+def test_env_credentials_do_not_reuse_profile_cache(aws_env):
+    manifest._write_aws_info_cache("default", "111111111111", "us-east-1")
+    aws_env.setenv("AWS_ACCESS_KEY_ID", "AKIAOTHERACCOUNT")
+
+    with patch.object(
+        manifest, "_fetch_aws_info", return_value=("222222222222", "us-east-1")
+    ) as mock_fetch:
+        assert manifest._load_or_fetch_aws_info() == ("222222222222", "us-east-1")
+        # The second lookup for the same key is served from the cache
+        assert manifest._load_or_fetch_aws_info() == ("222222222222", "us-east-1")
+
+    mock_fetch.assert_called_once()
+
+
+def test_writing_one_key_does_not_refresh_another(aws_env):
+    ttl = manifest.AWS_INFO_CACHE_TTL
+    with patch.object(manifest.time, "time", return_value=1_000_000.0):
+        manifest._write_aws_info_cache("profile-a", "111111111111", "us-east-1")
+
+    with patch.object(manifest.time, "time", return_value=1_000_000.0 + ttl + 1):
+        manifest._write_aws_info_cache("profile-b", "222222222222", "eu-west-1")
+
+        assert manifest._read_aws_info_cache("profile-a", ttl) is None
+        assert manifest._read_aws_info_cache("profile-b", ttl) == (
+            "222222222222",
+            "eu-west-1",
+        )
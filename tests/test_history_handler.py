@@ -176,6 +176,30 @@ class TestGetHistoryItem:
         assert body["t_lang"] == "en"
         assert body["t_text"] == "Hello World"
 
+    @patch("lambda_functions.history_handler.get_translations_table")
+    @patch("lambda_functions.history_handler.get_history_table")
+    def test_get_history_item_denormalized(
+        self,
+        mock_get_history_table,
+        mock_get_trans_table,
+        mock_event_with_history_id,
+        mock_history_item,
+    ):
+        """Test that texts stored on the history item skip the translations lookup"""
+        mock_history_table = MagicMock()
+        mock_get_history_table.return_value = mock_history_table
+        mock_history_item["Item"]["extracted_text"] = "Hallo Welt"
+        mock_history_item["Item"]["translated_text"] = "Hello World"
+        mock_history_table.get_item.return_value = mock_history_item
+
+        result = history_handler.get_history_item(mock_event_with_history_id, None)
+
+        assert result["statusCode"] == 200
+        body = json.loads(result["body"])
+        assert body["src_text"] == "Hallo Welt"
+        assert body["t_text"] == "Hello World"
+        mock_get_trans_table.assert_not_called()
+
     @patch("lambda_functions.history_handler.get_history_table")
     def test_get_history_item_unauthorized(
         self, mock_get_table, mock_event_unauthorized